@@ -1,7 +1,10 @@
 from django.contrib import admin
+from django.db import transaction
 from django.http import HttpRequest
+from django.utils import timezone
 
-from .models import UserAccount
+from .models import UserAccount, OutboxMail, OutboxMailStatus
+from .outbox import get_batch_progress, wake_outbox_workers
 
 
 @admin.register(UserAccount)
@@ -24,3 +27,53 @@ class UserAccountModelAdmin(admin.ModelAdmin):
     def has_module_permission(self, request: HttpRequest) -> bool:
         return request.user.is_superuser
 
+
+
+@admin.register(OutboxMail)
+class OutboxMailModelAdmin(admin.ModelAdmin):
+    """Read-only view of the mail outbox, with an action to retry failed mails."""
+
+    list_display = ["subject", "recipient", "status", "attempts", "created_at", "sent_at"]
+    list_filter = ["status"]
+    search_fields = ["recipient", "subject"]
+    readonly_fields = [
+        "subject",
+        "body",
+        "recipient",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "last_error",
+        "created_at",
+        "sent_at",
+    ]
+    actions = ["retry_mails"]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        batch = request.GET.get("batch")
+        if batch and request.method == "GET":
+            # Report the delivery progress of mails queued in bulk
+            progress = get_batch_progress(batch)
+            total = sum(progress.values())
+            self.message_user(
+                request,
+                f"{progress[OutboxMailStatus.SENT]} of {total} mail(s) sent, "
+                f"{progress[OutboxMailStatus.PENDING] + progress[OutboxMailStatus.SENDING]} "
+                f"pending, {progress[OutboxMailStatus.FAILED]} failed.",
+            )
+        return super().changelist_view(request, extra_context)
+
+    def has_module_permission(self, request: HttpRequest) -> bool:
+        return request.user.is_superuser
+
+    @admin.action(description="Retry selected failed mails")
+    def retry_mails(self, request, queryset):
+        retried = queryset.filter(status=OutboxMailStatus.FAILED).update(
+            status=OutboxMailStatus.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        transaction.on_commit(wake_outbox_workers)
+        self.message_user(request, f"{retried} mail(s) queued for retry.")
+        return None
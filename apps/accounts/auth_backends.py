@@ -2,6 +2,7 @@ from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 from django.utils.itercompat import is_iterable
 from apps.students.models import Student
+from .hashing import check_password
 
 
 UserModel = get_user_model()
@@ -9,7 +10,10 @@ UserModel = get_user_model()
 
 class StudentUserAuthenticationBackend(ModelBackend):
     """Custom authentication backend that aims to authenticate
-    users (students) by email and matriculation number."""
+    users (students) by email and matriculation number.
+
+    Passwords are checked on the bounded password hashing pool.
+    """
 
     email_credentials = ("email", "username")
     matriculation_number_credentials = ("matriculation_number", "mat_no")
@@ -57,11 +61,14 @@ class StudentUserAuthenticationBackend(ModelBackend):
     ):
         """Authenticate a student by email and matriculation number."""
         try:
-            student = Student.objects.get(
-                email__iexact=email, matriculation_number__iexact=matriculation_number
+            # The student's account is fetched in the same query
+            student = (
+                Student.objects.identified_by(email, matriculation_number)
+                .select_related("account")
+                .get()
             )
             account = student.account
-            if account and account.check_password(password):
+            if account and check_password(account, password):
                 return account
         
         except Student.DoesNotExist:
@@ -75,7 +82,7 @@ class StudentUserAuthenticationBackend(ModelBackend):
 
         try:
             user = UserModel.objects.get(email=email)
-            if user.check_password(password):
+            if check_password(user, password):
                 return user
         except UserModel.DoesNotExist:
             return None
@@ -0,0 +1,43 @@
+"""
+Password hashers with work factors set in the settings.
+
+Each hasher keeps the algorithm name of the Django hasher it extends, so
+passwords hashed with other work factors are still verified, and are
+rehashed with the configured ones when their owners next sign in.
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = getattr(
+        settings, "PASSWORD_HASHING_PBKDF2_ITERATIONS", hashers.PBKDF2PasswordHasher.iterations
+    )
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    work_factor = getattr(
+        settings, "PASSWORD_HASHING_SCRYPT_WORK_FACTOR", hashers.ScryptPasswordHasher.work_factor
+    )
+    block_size = getattr(
+        settings, "PASSWORD_HASHING_SCRYPT_BLOCK_SIZE", hashers.ScryptPasswordHasher.block_size
+    )
+    parallelism = getattr(
+        settings, "PASSWORD_HASHING_SCRYPT_PARALLELISM", hashers.ScryptPasswordHasher.parallelism
+    )
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Requires `argon2-cffi`."""
+
+    time_cost = getattr(
+        settings, "PASSWORD_HASHING_ARGON2_TIME_COST", hashers.Argon2PasswordHasher.time_cost
+    )
+    # In KiB
+    memory_cost = getattr(
+        settings, "PASSWORD_HASHING_ARGON2_MEMORY_COST", hashers.Argon2PasswordHasher.memory_cost
+    )
+    parallelism = getattr(
+        settings, "PASSWORD_HASHING_ARGON2_PARALLELISM", hashers.Argon2PasswordHasher.parallelism
+    )
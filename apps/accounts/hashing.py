@@ -0,0 +1,60 @@
+"""
+Password checks on a bounded pool of hashing threads.
+
+Password hashes are slow by design. When many users sign in at once, say as
+an election opens, hashing them all concurrently would take every core, and
+starve other requests, like votes, of CPU. Passwords are instead hashed by a
+fixed number of threads, and requests signing in wait for one to be free.
+The hash functions release the GIL, so other requests keep running meanwhile.
+"""
+
+import threading
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.base_user import AbstractBaseUser
+
+
+_executor: typing.Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PASSWORD_HASHING_WORKERS", 2),
+                thread_name_prefix="password-hashing",
+            )
+        return _executor
+
+
+def check_password(
+    user: AbstractBaseUser,
+    raw_password: str,
+    *,
+    executor: typing.Optional[ThreadPoolExecutor] = None,
+) -> bool:
+    """
+    Check the user's password, hashing it on the bounded hashing pool.
+
+    Like `AbstractBaseUser.check_password`, passwords hashed with another hasher,
+    or other work factors, than the preferred ones are rehashed and saved when correct.
+
+    :param user: The user whose password is checked.
+    :param raw_password: The password to check.
+    :param executor: Pool to hash on. Defaults to the shared hashing pool.
+    :return: Whether the password is correct.
+    """
+    executor = executor or get_hashing_executor()
+    is_correct, must_update = executor.submit(
+        hashers.verify_password, raw_password, user.password
+    ).result()
+
+    if is_correct and must_update:
+        user.password = executor.submit(hashers.make_password, raw_password).result()
+        user.save(update_fields=["password"])
+    return is_correct
@@ -12,9 +12,7 @@ def get_student(email: str, matriculation_number: str) -> typing.Optional[Studen
     :param matriculation_number: Matriculation number of the student
     :return: Student object if it exists, else None
     """
-    return Student.objects.filter(
-        email__iexact=email, matriculation_number__iexact=matriculation_number
-    ).first()
+    return Student.objects.identified_by(email, matriculation_number).first()
 
 
 def create_account_for_student(
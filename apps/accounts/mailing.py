@@ -1,11 +1,16 @@
 import numpy as np
 from django.conf import settings
-from helpers.mailing import send_smtp_mail
 
 from . import L_HOSTS
+from .outbox import enqueue_mail
 
 
 def send_otp(otp: str, *, recipient: str, subject: str = "One Time Password"):
+    """
+    Queue a mail of the OTP to the recipient in the mail outbox.
+
+    The mail is delivered in the background, once the current transaction commits.
+    """
     l_hosts = [f"@{host}" for host in L_HOSTS]
     if any(l_host in recipient for l_host in l_hosts):
         otp = np.random.choice(
@@ -22,4 +27,4 @@ def send_otp(otp: str, *, recipient: str, subject: str = "One Time Password"):
         )
 
     body = f"Your One-Time-Password is {otp}"
-    send_smtp_mail(subject=subject, message=body, to_email=recipient)
+    enqueue_mail(subject=subject, body=body, recipient=recipient)
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.accounts.auth_backends import StudentUserAuthenticationBackend
+from apps.accounts.hashing import check_password
+from apps.accounts.models import UserAccount
+from apps.students.models import Student
+from apps.students.management.benchmarking import create_benchmark_students
+from core.benchmarks import Stopwatch, summarize_latencies
+
+
+BENCHMARK_PASSWORD = "Benchmark-Password-1"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark student sign in with each password hashing profile. Reports sign ins "
+        "per second on one core, and how a burst of concurrent sign ins, checked on the "
+        "bounded hashing pool, delays other requests. Benchmark data is committed while "
+        "the benchmark runs and deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            default=",".join(settings.PASSWORD_HASHER_PROFILES),
+            help="Comma separated password hashing profiles to benchmark.",
+        )
+        parser.add_argument(
+            "--sign-ins", type=int, default=20, help="Sequential sign ins per profile."
+        )
+        parser.add_argument(
+            "--burst", type=int, default=40, help="Concurrent sign ins per profile."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.PASSWORD_HASHING_WORKERS,
+            help="Threads in the hashing pool during bursts.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = options["profiles"].split(",")
+        unknown = set(profiles) - set(settings.PASSWORD_HASHER_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}")
+
+        student = create_benchmark_students(1)[0]
+        account = UserAccount.objects.create(email=student.email, name=student.name)
+        Student.objects.filter(pk=student.pk).update(account=account)
+        self.stdout.write(
+            f"{os.cpu_count()} CPU(s), {options['workers']} hashing thread(s) during bursts"
+        )
+        try:
+            for profile in profiles:
+                hasher = settings.PASSWORD_HASHER_PROFILES[profile]
+                with override_settings(
+                    PASSWORD_HASHERS=[
+                        hasher,
+                        *(h for h in settings.PASSWORD_HASHERS if h != hasher),
+                    ]
+                ):
+                    self.benchmark_profile(profile, student, account, options)
+        finally:
+            account.delete()
+            student.delete()
+
+    def benchmark_profile(
+        self, profile: str, student: Student, account: UserAccount, options: typing.Dict
+    ) -> None:
+        self.stdout.write(f"\n{profile}")
+        try:
+            password = make_password(BENCHMARK_PASSWORD)
+        except ValueError as exc:
+            # The hasher's library is not installed
+            self.stdout.write(self.style.WARNING(f"  Skipped: {exc}"))
+            return None
+        UserAccount.objects.filter(pk=account.pk).update(password=password)
+
+        def sign_in(executor: ThreadPoolExecutor) -> float:
+            with Stopwatch() as stopwatch:
+                # Checked the same way as the backend does, on the given pool
+                user = Student.objects.select_related("account").get(pk=student.pk).account
+                is_correct = check_password(user, BENCHMARK_PASSWORD, executor=executor)
+            if not is_correct:
+                raise CommandError(f"Sign in failed with the {profile} profile")
+            return stopwatch.elapsed
+
+        # Sequential sign ins, hashed on one thread, so on one core
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            latencies = [sign_in(executor) for _ in range(options["sign_ins"])]
+        self.stdout.write(
+            f"  Sequential: {len(latencies) / sum(latencies):.1f} sign ins/sec per core "
+            f"({summarize_latencies(latencies)})"
+        )
+        # Signs in through the backend, as the sign in view does
+        if not StudentUserAuthenticationBackend().authenticate(
+            None,
+            email=student.email,
+            matriculation_number=student.matriculation_number,
+            password=BENCHMARK_PASSWORD,
+        ):
+            raise CommandError(f"Sign in through the backend failed with the {profile} profile")
+
+        self.burst(sign_in, options["burst"], options["workers"], label="Bounded burst")
+        self.burst(sign_in, options["burst"], options["burst"], label="Unbounded burst")
+        return None
+
+    def burst(
+        self,
+        sign_in: typing.Callable[[ThreadPoolExecutor], float],
+        count: int,
+        workers: int,
+        *,
+        label: str,
+    ) -> None:
+        """
+        Sign in `count` times concurrently, hashing on `workers` threads, while
+        timing a cheap query that stands in for other requests, like votes.
+        """
+        probe_latencies: typing.List[float] = []
+        done = threading.Event()
+
+        def probe() -> None:
+            try:
+                while not done.is_set():
+                    with Stopwatch() as stopwatch:
+                        Student.objects.filter(pk__isnull=False)[:1].exists()
+                    probe_latencies.append(stopwatch.elapsed)
+                    time.sleep(0.005)
+            finally:
+                connection.close()
+
+        def request(executor: ThreadPoolExecutor) -> float:
+            try:
+                return sign_in(executor)
+            finally:
+                connection.close()
+
+        probe_thread = threading.Thread(target=probe)
+        probe_thread.start()
+        with ThreadPoolExecutor(max_workers=workers) as executor, ThreadPoolExecutor(
+            max_workers=count
+        ) as requests:
+            with Stopwatch() as stopwatch:
+                latencies = list(requests.map(request, [executor] * count))
+        done.set()
+        probe_thread.join()
+
+        self.stdout.write(
+            f"  {label} ({workers} hashing threads): {count / stopwatch.elapsed:.1f} sign ins/sec, "
+            f"sign in {summarize_latencies(latencies)}"
+        )
+        self.stdout.write(f"    Other requests: {summarize_latencies(probe_latencies)}")
+        return None
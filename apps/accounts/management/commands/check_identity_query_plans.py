@@ -0,0 +1,153 @@
+import datetime
+import re
+import typing
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from apps.accounts.models import UserAccount
+from apps.students.models import Student
+from apps.students.management.benchmarking import create_benchmark_students
+from apps.tokens.models import IdentifierRelatedTOTP
+from core.benchmarks import Stopwatch
+
+
+def is_full_scan(plan: str, table: str) -> bool:
+    """Check if the query plan reads the whole table, instead of searching an index."""
+    if connection.vendor == "postgresql":
+        return f"Seq Scan on {table}" in plan
+    # SQLite reports index searches as `SEARCH <table> USING INDEX ...`, and reads
+    # of every row as `SCAN <table>`, even when they are read through an index
+    return re.search(rf"\bSCAN {table}\b", plan) is not None
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the lookups behind student sign in, registration and OTP "
+        "verification search indexes, rather than scanning their tables, as the "
+        "number of students grows. All data created is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,50000",
+            help="Comma separated numbers of students to check the query plans at.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=200, help="Times each lookup is timed."
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        failures = []
+        try:
+            with transaction.atomic():
+                created = 0
+                for size in sizes:
+                    self.grow(created, size - created)
+                    created = size
+                    failures.extend(self.check_lookups(size, options["repeat"]))
+                # Discard the benchmark data
+                raise Rollback()
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(
+                "Full table scans found in: " + ", ".join(sorted(set(failures)))
+            )
+        self.stdout.write(self.style.SUCCESS("All checked lookups search indexes."))
+
+    def grow(self, start: int, count: int) -> None:
+        """Add `count` students, with accounts and OTPs, numbered from `start`."""
+        students = create_benchmark_students(count, start=start)
+        UserAccount.objects.bulk_create(
+            [
+                # Unusable passwords, as hashing one per account would be slow
+                UserAccount(email=student.email, name=student.name, password="!")
+                for student in students
+            ],
+            batch_size=900,
+        )
+        expires_at = timezone.now() + datetime.timedelta(seconds=settings.OTP_VALIDITY_PERIOD)
+        IdentifierRelatedTOTP.objects.bulk_create(
+            [
+                IdentifierRelatedTOTP(identifier=str(student.id), expires_at=expires_at)
+                for student in students
+            ],
+            batch_size=900,
+        )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        return None
+
+    def get_lookups(
+        self, student: Student
+    ) -> typing.List[typing.Tuple[str, str, models.QuerySet, bool]]:
+        """Return the (name, table, queryset, enforced) of the lookups to check."""
+        # Details as a user may type them in
+        email = student.email.upper()
+        matriculation_number = student.matriculation_number.lower()
+        return [
+            (
+                "student by details",
+                Student._meta.db_table,
+                Student.objects.identified_by(email, matriculation_number),
+                True,
+            ),
+            (
+                "account by email, ignoring case",
+                UserAccount._meta.db_table,
+                UserAccount.objects.filter_by_email(email),
+                True,
+            ),
+            (
+                "account by email",
+                UserAccount._meta.db_table,
+                UserAccount.objects.filter(email=student.email),
+                True,
+            ),
+            (
+                "OTP by identifier",
+                IdentifierRelatedTOTP._meta.db_table,
+                IdentifierRelatedTOTP.objects.filter(identifier=str(student.id)),
+                True,
+            ),
+            # Kept for comparison. Not enforced.
+            (
+                "student by details, iexact",
+                Student._meta.db_table,
+                Student.objects.filter(
+                    email__iexact=email, matriculation_number__iexact=matriculation_number
+                ),
+                False,
+            ),
+        ]
+
+    def check_lookups(self, size: int, repeat: int) -> typing.List[str]:
+        self.stdout.write(f"\n{size} students")
+        student = Student.objects.order_by("?").first()
+        failures = []
+        for name, table, queryset, enforced in self.get_lookups(student):
+            plan = queryset.explain()
+            full_scan = is_full_scan(plan, table)
+            if full_scan and enforced:
+                failures.append(name)
+
+            with Stopwatch() as stopwatch:
+                for _ in range(repeat):
+                    list(queryset.all())
+            self.stdout.write(
+                f"  {name}: {'FULL SCAN' if full_scan else 'index'}, "
+                f"{stopwatch.elapsed / repeat * 1000:.3f}ms per lookup"
+            )
+            if full_scan and enforced:
+                self.stdout.write(self.style.ERROR("    " + plan.replace("\n", "\n    ")))
+        return failures
@@ -0,0 +1,64 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.outbox import OutboxWorkerPool, outbox_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a pool of workers delivering mails from the outbox. "
+        "Use with MAIL_OUTBOX_IN_PROCESS=false, so web processes only queue mails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=settings.MAIL_OUTBOX_WORKERS
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.MAIL_OUTBOX_POLL_INTERVAL,
+            help="Seconds idle workers wait before checking for due mails again.",
+        )
+        parser.add_argument(
+            "--rate-limit",
+            type=float,
+            default=settings.MAIL_OUTBOX_RATE_LIMIT,
+            help="Maximum mails sent per second by all workers. 0 means unlimited.",
+        )
+        parser.add_argument(
+            "--stats-interval",
+            type=float,
+            default=60,
+            help="Seconds between reports of the workers' metrics.",
+        )
+
+    def handle(self, *args, **options):
+        pool = OutboxWorkerPool(
+            options["workers"],
+            poll_interval=options["poll_interval"],
+            rate_limit=options["rate_limit"],
+        )
+        pool.start()
+        self.stdout.write(f"Started {options['workers']} outbox worker(s)")
+
+        try:
+            while True:
+                time.sleep(options["stats_interval"])
+                self.report_metrics()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping outbox workers...")
+        finally:
+            pool.stop(timeout=30)
+            self.report_metrics()
+
+    def report_metrics(self) -> None:
+        metrics = outbox_metrics.snapshot()
+        self.stdout.write(
+            ", ".join(
+                f"{name}={value:.1f}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in metrics.items()
+            )
+        )
+        return None
@@ -0,0 +1,118 @@
+import asyncio
+import random
+from django.core.management.base import BaseCommand
+
+
+class SMTPSink:
+    """
+    A minimal SMTP server that accepts and discards all mails.
+
+    Stands in for a real SMTP server when exercising mail delivery locally.
+    Responses can be delayed, and a share of mails rejected with a
+    temporary failure, to simulate a slow or unreliable server.
+    """
+
+    def __init__(self, *, delay: float = 0, failure_rate: float = 0, stdout=None) -> None:
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.stdout = stdout
+        self.connections = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    async def reply(self, writer: asyncio.StreamWriter, line: str) -> None:
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        recipients = []
+        try:
+            await self.reply(writer, "220 localhost SMTP sink ready")
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    await self.reply(writer, "250-localhost")
+                    await self.reply(writer, "250 8BITMIME")
+                elif verb in ("HELO", "NOOP"):
+                    await self.reply(writer, "250 OK")
+                elif verb in ("MAIL", "RSET"):
+                    recipients = []
+                    await self.reply(writer, "250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command.split(":", 1)[-1].strip())
+                    await self.reply(writer, "250 OK")
+                elif verb == "DATA":
+                    await self.reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    while await reader.readline() not in (b".\r\n", b""):
+                        pass
+                    await self.receive(writer, recipients)
+                    recipients = []
+                elif verb == "QUIT":
+                    await self.reply(writer, "221 Bye")
+                    break
+                else:
+                    await self.reply(writer, "502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def receive(self, writer: asyncio.StreamWriter, recipients) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        if random.random() < self.failure_rate:
+            self.rejected += 1
+            await self.reply(writer, "451 Temporary failure, try again later")
+            return
+
+        self.accepted += 1
+        if self.stdout:
+            self.stdout.write(f"Accepted mail #{self.accepted} to {', '.join(recipients)}")
+        await self.reply(writer, "250 OK: queued")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local SMTP server that accepts and discards mails, for exercising "
+        "mail delivery. Point EMAIL_HOST/EMAIL_PORT at it, with EMAIL_USE_TLS=false."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+        parser.add_argument(
+            "--delay", type=float, default=0, help="Seconds to wait before accepting each mail."
+        )
+        parser.add_argument(
+            "--failure-rate",
+            type=float,
+            default=0,
+            help="Share of mails, between 0 and 1, to reject with a temporary failure.",
+        )
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(
+            delay=options["delay"],
+            failure_rate=options["failure_rate"],
+            stdout=self.stdout,
+        )
+        try:
+            asyncio.run(self.serve(sink, options["host"], options["port"]))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            f"{sink.connections} connection(s), "
+            f"{sink.accepted} mail(s) accepted, {sink.rejected} rejected"
+        )
+
+    async def serve(self, sink: SMTPSink, host: str, port: int) -> None:
+        server = await asyncio.start_server(sink.handle_connection, host, port)
+        self.stdout.write(f"SMTP sink listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import BaseUserManager
+from django.db.models.functions import Lower
 
 
 class UserAccountManager(BaseUserManager):
@@ -6,6 +7,17 @@ class UserAccountManager(BaseUserManager):
 
     use_in_migrations = True
 
+    def filter_by_email(self, email: str):
+        """
+        Filter user accounts by email, ignoring case.
+
+        Matches `LOWER(email)`, which the accounts' email index is on,
+        unlike `iexact` lookups, which cannot use it.
+        """
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower=email.strip().lower()
+        )
+
     def create_user(self, email, password, save: bool = True, **extra_fields):
         if not email:
             raise ValueError("User must have an email!")
@@ -0,0 +1,28 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+from .user_cache import get_user
+
+
+def _get_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+async def _auser(request):
+    return await sync_to_async(_get_user)(request)
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    `AuthenticationMiddleware` that loads the signed in user
+    from the short-lived user cache, when possible.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: _get_user(request))
+        request.auser = lambda: _auser(request)
+        return None
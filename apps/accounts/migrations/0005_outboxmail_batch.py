@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_outboxmail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmail',
+            name='batch',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Identifies mails queued together in bulk.', max_length=32, null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:19
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_outboxmail_batch'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='useraccount',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='useraccount_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:57
+
+from django.db import migrations, models
+
+
+def clear_sent_mail_bodies(apps, schema_editor):
+    OutboxMail = apps.get_model("accounts", "OutboxMail")
+    OutboxMail.objects.filter(status="sent").exclude(body="").update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_useraccount_useraccount_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxmail',
+            name='body',
+            field=models.TextField(blank=True, help_text='Cleared once the mail is sent, as it may hold an OTP.'),
+        ),
+        migrations.RunPython(clear_sent_mail_bodies, migrations.RunPython.noop),
+    ]
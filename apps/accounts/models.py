@@ -1,6 +1,8 @@
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from timezone_field.fields import TimeZoneField
 
@@ -37,6 +39,63 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
         verbose_name = _("User account")
         verbose_name_plural = _("User accounts")
         ordering = ["-date_joined"]
+        indexes = [
+            # Supports case-insensitive lookups of accounts by email
+            models.Index(Lower("email"), name="useraccount_email_lower_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.get_username()
+
+
+class OutboxMailStatus(models.TextChoices):
+    PENDING = "pending", _("Pending")
+    SENDING = "sending", _("Sending")
+    SENT = "sent", _("Sent")
+    FAILED = "failed", _("Failed")
+
+
+class OutboxMail(models.Model):
+    """Model representing a mail queued for delivery by the outbox workers"""
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField(
+        blank=True, help_text=_("Cleared once the mail is sent, as it may hold an OTP.")
+    )
+    recipient = models.EmailField()
+    status = models.CharField(
+        max_length=20, choices=OutboxMailStatus.choices, default=OutboxMailStatus.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text=_(
+            "When the mail is next due for delivery. "
+            "For mails being sent, when the worker's claim on the mail expires."
+        ),
+    )
+    claim_token = models.CharField(max_length=32, null=True, blank=True, editable=False)
+    batch = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text=_("Identifies mails queued together in bulk."),
+    )
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Outbox mail")
+        verbose_name_plural = _("Outbox mails")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbox_mail_due_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} to {self.recipient} ({self.status})"
@@ -0,0 +1,471 @@
+"""
+Durable outbox for mails sent by the application.
+
+Mails are written to the `OutboxMail` table, in the caller's transaction,
+and delivered by a pool of background workers once that transaction commits.
+Each worker keeps one SMTP connection open across the mails it sends,
+and failed deliveries are retried with exponential backoff.
+
+The bodies of sent mails are cleared, as mails, like those of OTPs,
+may hold secrets that should not outlive their delivery.
+"""
+
+import datetime
+import logging
+import smtplib
+import threading
+import time
+import typing
+import uuid
+from django.conf import settings
+from django.core import mail
+from django.db import close_old_connections, connections, models, transaction
+from django.utils import timezone
+
+from .models import OutboxMail, OutboxMailStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+def _get_setting(name: str, default: typing.Any) -> typing.Any:
+    return getattr(settings, name, default)
+
+
+class OutboxMetrics:
+    """Thread-safe counters describing the outbox workers' activity."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.enqueued = 0
+            self.sent = 0
+            self.retried = 0
+            self.failed = 0
+            self.batches = 0
+            self.connections_opened = 0
+            self.send_seconds = 0.0
+            self.queue_seconds = 0.0
+
+    def increment(self, **counts: typing.Union[int, float]) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def snapshot(self) -> typing.Dict[str, typing.Union[int, float]]:
+        """Return a consistent copy of the metrics, with derived averages."""
+        with self._lock:
+            snapshot = {
+                "enqueued": self.enqueued,
+                "sent": self.sent,
+                "retried": self.retried,
+                "failed": self.failed,
+                "batches": self.batches,
+                "connections_opened": self.connections_opened,
+            }
+            snapshot["avg_send_ms"] = (
+                self.send_seconds / self.sent * 1000 if self.sent else 0.0
+            )
+            snapshot["avg_queue_ms"] = (
+                self.queue_seconds / self.sent * 1000 if self.sent else 0.0
+            )
+        return snapshot
+
+
+outbox_metrics = OutboxMetrics()
+
+
+def enqueue_mail(*, subject: str, body: str, recipient: str) -> OutboxMail:
+    """
+    Write a mail to the outbox. The outbox workers are woken up
+    to deliver it once the current transaction commits.
+
+    :param subject: The mail's subject.
+    :param body: The mail's plain text body.
+    :param recipient: Email address of the mail's recipient.
+    :return: The outbox mail.
+    """
+    outbox_mail = OutboxMail.objects.create(
+        subject=subject, body=body, recipient=recipient
+    )
+    outbox_metrics.increment(enqueued=1)
+    transaction.on_commit(wake_outbox_workers)
+    return outbox_mail
+
+
+def enqueue_bulk_mail(
+    messages: typing.Iterable[typing.Tuple[str, str]],
+    *,
+    subject: str,
+    chunk_size: int = 500,
+) -> typing.Tuple[str, int]:
+    """
+    Write many mails with the same subject to the outbox, in chunks,
+    without holding all of them in memory.
+
+    :param messages: Iterable of (recipient, body) pairs.
+    :param subject: The mails' subject.
+    :param chunk_size: Number of mails inserted per query.
+    :return: A tuple of the batch ID the mails are tagged with, and the number of mails queued.
+    """
+    batch = uuid.uuid4().hex
+    queued = 0
+    chunk: typing.List[OutboxMail] = []
+
+    with transaction.atomic():
+        for recipient, body in messages:
+            chunk.append(
+                OutboxMail(subject=subject, body=body, recipient=recipient, batch=batch)
+            )
+            if len(chunk) >= chunk_size:
+                OutboxMail.objects.bulk_create(chunk)
+                queued += len(chunk)
+                chunk = []
+        if chunk:
+            OutboxMail.objects.bulk_create(chunk)
+            queued += len(chunk)
+        transaction.on_commit(wake_outbox_workers)
+
+    outbox_metrics.increment(enqueued=queued)
+    return batch, queued
+
+
+def get_batch_progress(batch: str) -> typing.Dict[str, int]:
+    """Return the number of mails in the batch, per status."""
+    progress = {status: 0 for status in OutboxMailStatus.values}
+    counts = (
+        OutboxMail.objects.filter(batch=batch)
+        .values_list("status")
+        .annotate(count=models.Count("pk"))
+        .order_by()
+    )
+    progress.update(counts)
+    return progress
+
+
+def claim_due_mails(
+    limit: int, *, lease: typing.Optional[datetime.timedelta] = None
+) -> typing.List[OutboxMail]:
+    """
+    Claim up to `limit` mails that are due for delivery.
+
+    Mails are claimed with a conditional update, so concurrent workers,
+    in this or other processes, never claim the same mail. Mails claimed
+    by a worker that has not reported back before its lease expires are
+    claimed again.
+
+    :param limit: Maximum number of mails to claim.
+    :param lease: How long the claim is held before the mails are due again.
+    :return: The claimed mails.
+    """
+    if lease is None:
+        lease = datetime.timedelta(
+            seconds=_get_setting("MAIL_OUTBOX_LEASE", 5 * 60)
+        )
+    now = timezone.now()
+    due = models.Q(
+        status__in=[OutboxMailStatus.PENDING, OutboxMailStatus.SENDING],
+        next_attempt_at__lte=now,
+    )
+    mail_ids = list(
+        OutboxMail.objects.filter(due)
+        .order_by("next_attempt_at")
+        .values_list("pk", flat=True)[:limit]
+    )
+    if not mail_ids:
+        return []
+
+    claim_token = uuid.uuid4().hex
+    OutboxMail.objects.filter(due, pk__in=mail_ids).update(
+        status=OutboxMailStatus.SENDING,
+        claim_token=claim_token,
+        next_attempt_at=now + lease,
+    )
+    return list(OutboxMail.objects.filter(claim_token=claim_token))
+
+
+def get_retry_delay(attempts: int) -> datetime.timedelta:
+    """Return how long to wait before the next delivery attempt of a mail."""
+    backoff = _get_setting("MAIL_OUTBOX_RETRY_BACKOFF", 30)
+    return datetime.timedelta(seconds=backoff * 2 ** (attempts - 1))
+
+
+def mark_sent(outbox_mails: typing.List[OutboxMail]) -> None:
+    """Record the delivery of the mails, and clear their bodies, in one query."""
+    if not outbox_mails:
+        return None
+
+    now = timezone.now()
+    OutboxMail.objects.filter(
+        pk__in=[outbox_mail.pk for outbox_mail in outbox_mails],
+        # Mails whose claim expired may have been claimed by another worker
+        claim_token__in={outbox_mail.claim_token for outbox_mail in outbox_mails},
+    ).update(
+        status=OutboxMailStatus.SENT,
+        body="",
+        attempts=models.F("attempts") + 1,
+        claim_token=None,
+        last_error=None,
+        sent_at=now,
+    )
+    outbox_metrics.increment(
+        sent=len(outbox_mails),
+        queue_seconds=sum(
+            (now - outbox_mail.created_at).total_seconds() for outbox_mail in outbox_mails
+        ),
+    )
+    return None
+
+
+def mark_failed_attempt(outbox_mail: OutboxMail, error: str) -> None:
+    """
+    Record a failed delivery attempt of the mail. The mail is retried
+    after a backoff, or marked as failed once it runs out of attempts.
+    """
+    attempts = outbox_mail.attempts + 1
+    max_attempts = _get_setting("MAIL_OUTBOX_MAX_ATTEMPTS", 5)
+    if attempts >= max_attempts:
+        status = OutboxMailStatus.FAILED
+        next_attempt_at = timezone.now()
+        outbox_metrics.increment(failed=1)
+    else:
+        status = OutboxMailStatus.PENDING
+        next_attempt_at = timezone.now() + get_retry_delay(attempts)
+        outbox_metrics.increment(retried=1)
+
+    OutboxMail.objects.filter(
+        pk=outbox_mail.pk, claim_token=outbox_mail.claim_token
+    ).update(
+        status=status,
+        attempts=attempts,
+        claim_token=None,
+        last_error=error,
+        next_attempt_at=next_attempt_at,
+    )
+    return None
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how many mails are sent per second,
+    shared by all workers of a pool.
+    """
+
+    def __init__(self, rate: float, *, burst: typing.Optional[int] = None) -> None:
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a mail may be sent. Returns immediately if the rate is not limited."""
+        if self.rate <= 0:
+            return None
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return None
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class OutboxWorker(threading.Thread):
+    """
+    Delivers outbox mails over a single SMTP connection, which is
+    kept open between batches until it has been idle for a while.
+    """
+
+    def __init__(self, pool: "OutboxWorkerPool", name: str) -> None:
+        super().__init__(name=name, daemon=True)
+        self.pool = pool
+        self.connection = None
+        self.last_used_at = 0.0
+
+    def run(self) -> None:
+        try:
+            while not self.pool.stopping.is_set():
+                close_old_connections()
+                try:
+                    delivered = self.deliver_batch()
+                except Exception:
+                    logger.exception("Outbox worker %s failed to deliver a batch", self.name)
+                    delivered = 0
+
+                if not delivered:
+                    self.close_idle_connection()
+                    self.pool.wait_for_mails()
+        finally:
+            self.close_connection()
+            connections.close_all()
+
+    def get_connection(self):
+        if self.connection is None:
+            self.connection = mail.get_connection(fail_silently=False)
+            self.connection.open()
+            outbox_metrics.increment(connections_opened=1)
+        self.last_used_at = time.monotonic()
+        return self.connection
+
+    def close_connection(self) -> None:
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+        return None
+
+    def close_idle_connection(self) -> None:
+        idle_timeout = _get_setting("MAIL_OUTBOX_CONNECTION_IDLE_TIMEOUT", 30)
+        if time.monotonic() - self.last_used_at > idle_timeout:
+            self.close_connection()
+        return None
+
+    def deliver_batch(self) -> int:
+        """
+        Claim a batch of due mails and deliver them.
+
+        :return: The number of mails claimed.
+        """
+        outbox_mails = claim_due_mails(_get_setting("MAIL_OUTBOX_BATCH_SIZE", 20))
+        if not outbox_mails:
+            return 0
+
+        outbox_metrics.increment(batches=1)
+        sent = [
+            outbox_mail for outbox_mail in outbox_mails if self.deliver(outbox_mail)
+        ]
+        mark_sent(sent)
+        return len(outbox_mails)
+
+    def deliver(self, outbox_mail: OutboxMail) -> bool:
+        """
+        Send the mail over the worker's SMTP connection.
+
+        :return: Whether the mail was sent. Failed attempts are recorded immediately.
+        """
+        message = mail.EmailMessage(
+            subject=outbox_mail.subject,
+            body=outbox_mail.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[outbox_mail.recipient],
+        )
+        self.pool.rate_limiter.acquire()
+        started_at = time.perf_counter()
+        try:
+            self.get_connection().send_messages([message])
+        except (smtplib.SMTPException, OSError) as exc:
+            if not isinstance(exc, smtplib.SMTPResponseException):
+                # The connection may be unusable. A new one is opened for the next mail.
+                self.close_connection()
+            logger.warning(
+                "Delivery of outbox mail %s failed: %s", outbox_mail.pk, exc
+            )
+            mark_failed_attempt(outbox_mail, error=f"{type(exc).__name__}: {exc}")
+            return False
+
+        outbox_metrics.increment(send_seconds=time.perf_counter() - started_at)
+        return True
+
+
+class OutboxWorkerPool:
+    """A pool of threads delivering outbox mails."""
+
+    def __init__(self, size: int, *, poll_interval: float = 5, rate_limit: float = 0) -> None:
+        """
+        :param size: Number of worker threads.
+        :param poll_interval: Seconds idle workers wait before checking for due mails again.
+        :param rate_limit: Maximum mails sent per second by all workers. 0 means unlimited.
+        """
+        self.size = size
+        self.poll_interval = poll_interval
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.stopping = threading.Event()
+        self._wake = threading.Condition()
+        self._pending_wakes = 0
+        self._workers: typing.List[OutboxWorker] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return any(worker.is_alive() for worker in self._workers)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running:
+                return None
+            self.stopping.clear()
+            self._workers = [
+                OutboxWorker(self, name=f"outbox-worker-{index}")
+                for index in range(self.size)
+            ]
+            for worker in self._workers:
+                worker.start()
+        return None
+
+    def stop(self, timeout: typing.Optional[float] = None) -> None:
+        self.stopping.set()
+        self.wake()
+        for worker in self._workers:
+            worker.join(timeout)
+        return None
+
+    def wake(self) -> None:
+        """Wake up the workers to check for due mails."""
+        with self._wake:
+            self._pending_wakes = self.size
+            self._wake.notify_all()
+        return None
+
+    def wait_for_mails(self) -> None:
+        """Block the calling worker until it is woken up, or the poll interval elapses."""
+        with self._wake:
+            if not self._pending_wakes and not self.stopping.is_set():
+                self._wake.wait(self.poll_interval)
+            if self._pending_wakes:
+                self._pending_wakes -= 1
+        return None
+
+
+_worker_pool: typing.Optional[OutboxWorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_outbox_worker_pool() -> OutboxWorkerPool:
+    """Return this process' outbox worker pool, creating it if needed."""
+    global _worker_pool
+
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = OutboxWorkerPool(
+                _get_setting("MAIL_OUTBOX_WORKERS", 2),
+                poll_interval=_get_setting("MAIL_OUTBOX_POLL_INTERVAL", 5),
+                rate_limit=_get_setting("MAIL_OUTBOX_RATE_LIMIT", 0),
+            )
+        return _worker_pool
+
+
+def wake_outbox_workers() -> None:
+    """
+    Wake up this process' outbox workers. The workers are started
+    on first use, unless mails are delivered by a separate process
+    (see the `run_mail_outbox` command).
+    """
+    if not _get_setting("MAIL_OUTBOX_IN_PROCESS", True):
+        return None
+
+    pool = get_outbox_worker_pool()
+    pool.start()
+    pool.wake()
+    return None
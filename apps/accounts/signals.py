@@ -0,0 +1,20 @@
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import UserAccount
+from .user_cache import forget_user, invalidate_user
+
+
+@receiver(user_logged_out)
+def forget_user_on_logout(sender, request, **kwargs):
+    if request is not None:
+        forget_user(request)
+
+
+@receiver([post_save, post_delete], sender=UserAccount)
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    # Invalidate after commit, so that the user is not cached
+    # again from data that is yet to be committed
+    transaction.on_commit(lambda: invalidate_user(instance.pk))
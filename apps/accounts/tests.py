@@ -0,0 +1,70 @@
+import datetime
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.management.commands.check_identity_query_plans import is_full_scan
+from apps.accounts.models import OutboxMail, OutboxMailStatus, UserAccount
+from apps.accounts.outbox import claim_due_mails, enqueue_mail, mark_sent
+from apps.students.management.benchmarking import create_benchmark_students
+from apps.students.models import Student
+from apps.tokens.models import IdentifierRelatedTOTP
+
+
+class IdentityQueryPlanTests(TestCase):
+    """Students, accounts and OTPs are looked up by identity through indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        students = create_benchmark_students(200)
+        UserAccount.objects.bulk_create(
+            UserAccount(email=student.email, name=student.name, password="!")
+            for student in students
+        )
+        expires_at = timezone.now() + datetime.timedelta(seconds=settings.OTP_VALIDITY_PERIOD)
+        IdentifierRelatedTOTP.objects.bulk_create(
+            IdentifierRelatedTOTP(identifier=str(student.id), expires_at=expires_at)
+            for student in students
+        )
+        cls.student = students[len(students) // 2]
+
+    def assert_searches_index(self, queryset, table: str) -> None:
+        plan = queryset.explain()
+        self.assertFalse(is_full_scan(plan, table), f"Full scan of {table}:\n{plan}")
+
+    def test_student_by_details(self):
+        # Details as a user may type them in
+        queryset = Student.objects.identified_by(
+            self.student.email.upper(), self.student.matriculation_number.lower()
+        )
+        self.assertEqual(list(queryset), [self.student])
+        self.assert_searches_index(queryset, Student._meta.db_table)
+
+    def test_account_by_email(self):
+        queryset = UserAccount.objects.filter_by_email(self.student.email.upper())
+        self.assertEqual(queryset.count(), 1)
+        self.assert_searches_index(queryset, UserAccount._meta.db_table)
+
+    def test_otp_by_identifier(self):
+        queryset = IdentifierRelatedTOTP.objects.filter(identifier=str(self.student.id))
+        self.assertEqual(queryset.count(), 1)
+        self.assert_searches_index(queryset, IdentifierRelatedTOTP._meta.db_table)
+
+
+class OutboxTests(TestCase):
+    """Mails are delivered from the outbox, and forgotten once delivered."""
+
+    def test_sent_mail_body_is_cleared(self):
+        enqueue_mail(
+            subject="One Time Password",
+            body="Your One-Time-Password is 123456",
+            recipient="voter@example.com",
+        )
+        outbox_mails = claim_due_mails(10)
+        self.assertEqual(len(outbox_mails), 1)
+
+        mark_sent(outbox_mails)
+
+        outbox_mail = OutboxMail.objects.get()
+        self.assertEqual(outbox_mail.status, OutboxMailStatus.SENT)
+        self.assertEqual(outbox_mail.body, "")
@@ -0,0 +1,126 @@
+"""
+Short-lived cache of the signed in user of each session.
+
+Django loads the signed in user from the database on every request. The
+user's fields are instead cached, signed, for `AUTH_USER_CACHE_TTL` seconds,
+under the request's session key, so requests in quick succession, like
+votes, do not query the accounts table.
+
+Cached users are only used for sessions with the same user, backend and
+session hash they were cached with. Saving a user changes its cache version,
+so cached copies of it are not used once it changes, say, its password, or
+is deactivated.
+"""
+
+import hashlib
+import typing
+import uuid
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core import signing
+from django.core.cache import cache
+from django.db import router
+
+
+USER_CACHE_SALT = "accounts.user_cache"
+
+
+def _get_cache_key(session_key: str) -> str:
+    # Signed cookie session keys hold the whole session, so they are hashed
+    session_key_hash = hashlib.sha256(session_key.encode()).hexdigest()
+    return f"accounts:session-user:{session_key_hash}"
+
+
+def _get_version_key(user_id: str) -> str:
+    return f"accounts:user-version:{user_id}"
+
+
+def _get_ttl() -> int:
+    return getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+
+
+def _dump_user(user) -> typing.Dict[str, typing.Optional[str]]:
+    return {
+        field.attname: (
+            None if field.value_from_object(user) is None else field.value_to_string(user)
+        )
+        for field in user._meta.concrete_fields
+    }
+
+
+def _load_user(data: typing.Dict[str, typing.Optional[str]]):
+    UserModel = auth.get_user_model()
+    fields = UserModel._meta.concrete_fields
+    return UserModel.from_db(
+        router.db_for_read(UserModel),
+        [field.attname for field in fields],
+        [
+            None if data[field.attname] is None else field.to_python(data[field.attname])
+            for field in fields
+        ],
+    )
+
+
+def get_user(request):
+    """
+    Return the user signed in to the request's session, from the
+    cache when possible, or the database otherwise.
+    """
+    session = request.session
+    session_key = session.session_key
+    ttl = _get_ttl()
+    if not (ttl and session_key and SESSION_KEY in session):
+        return auth.get_user(request)
+
+    cache_key = _get_cache_key(session_key)
+    version_key = _get_version_key(session[SESSION_KEY])
+    cached = cache.get_many([cache_key, version_key])
+    version = cached.get(version_key)
+    if cached.get(cache_key) and version:
+        try:
+            data = signing.loads(cached[cache_key], salt=USER_CACHE_SALT, max_age=ttl)
+        except signing.BadSignature:
+            data = None
+        if data and (
+            data["version"] == version
+            and data["user_id"] == session[SESSION_KEY]
+            and data["backend"] == session.get(BACKEND_SESSION_KEY)
+            and data["session_hash"] == session.get(HASH_SESSION_KEY)
+        ):
+            user = _load_user(data["user"])
+            user.backend = data["backend"]
+            return user
+
+    if not version:
+        cache.add(version_key, uuid.uuid4().hex, None)
+        version = cache.get(version_key)
+
+    user = auth.get_user(request)
+    if user.is_authenticated and version:
+        signed_data = signing.dumps(
+            {
+                "version": version,
+                "user_id": session[SESSION_KEY],
+                "backend": session.get(BACKEND_SESSION_KEY),
+                "session_hash": session.get(HASH_SESSION_KEY),
+                "user": _dump_user(user),
+            },
+            salt=USER_CACHE_SALT,
+        )
+        cache.set(cache_key, signed_data, ttl)
+    return user
+
+
+def invalidate_user(user_id) -> None:
+    """Stop using the cached copies of the user, in every session."""
+    cache.delete(_get_version_key(str(user_id)))
+    return None
+
+
+def forget_user(request) -> None:
+    """Remove the cached user of the request's session."""
+    session_key = request.session.session_key
+    if session_key:
+        cache.delete(_get_cache_key(session_key))
+    return None
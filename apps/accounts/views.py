@@ -25,6 +25,7 @@ from .forms import (
 )
 from .helpers import get_student, create_account_for_student
 from .mailing import send_otp
+from apps.tokens.throttling import otp_verification_throttle
 from apps.tokens.totp import (
     InvalidToken,
     generate_totp_for_identifier,
@@ -35,6 +36,20 @@ from apps.tokens.totp import (
 )
 
 
+def get_throttled_response(retry_after: int) -> JsonResponse:
+    """Return the response to OTP verifications rejected after too many failures."""
+    minutes = max(round(retry_after / 60), 1)
+    response = JsonResponse(
+        data={
+            "status": "error",
+            "detail": f"Too many incorrect attempts. Please try again in {minutes} minute(s).",
+        },
+        status=429,
+    )
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
 class SignInView(generic.TemplateView):
     """View for user sign in"""
 
@@ -187,8 +202,14 @@ class RegistrationOTPVerificationView(generic.View):
 
         form_data = form.cleaned_data.copy()
         otp = form_data.pop("otp")
+        throttle_key = f"registration:{form_data['email'].lower()}"
+        retry_after = otp_verification_throttle.get_retry_after(throttle_key)
+        if retry_after:
+            return get_throttled_response(retry_after)
+
         student = get_student(**form_data)
         if not student:
+            otp_verification_throttle.record_failure(throttle_key)
             return JsonResponse(
                 data={
                     "status": "error",
@@ -201,6 +222,7 @@ class RegistrationOTPVerificationView(generic.View):
             is_valid = verify_identifier_totp_token(token=otp, identifier=student.id)
             # is_valid = dummy_verify_totp_token(token=otp, identifier=student.id)
             if not is_valid:
+                otp_verification_throttle.record_failure(throttle_key)
                 return JsonResponse(
                     data={
                         "status": "error",
@@ -208,6 +230,7 @@ class RegistrationOTPVerificationView(generic.View):
                     },
                     status=400,
                 )
+            otp_verification_throttle.reset(throttle_key)
 
             password_set_token = exchange_data_for_token(
                 data={
@@ -323,9 +346,7 @@ class PasswordResetInitiationView(generic.View):
                 status=400,
             )
 
-        account = UserAccount.objects.filter(
-            email__iexact=form.cleaned_data["email"]
-        ).first()
+        account = UserAccount.objects.filter_by_email(form.cleaned_data["email"]).first()
         if not account:
             return JsonResponse(
                 data={
@@ -372,8 +393,14 @@ class PasswordResetOTPVerificationView(generic.View):
 
         form_data = form.cleaned_data.copy()
         otp = form_data.pop("otp")
-        account = UserAccount.objects.filter(email__iexact=form_data["email"]).first()
+        throttle_key = f"password-reset:{form_data['email'].lower()}"
+        retry_after = otp_verification_throttle.get_retry_after(throttle_key)
+        if retry_after:
+            return get_throttled_response(retry_after)
+
+        account = UserAccount.objects.filter_by_email(form_data["email"]).first()
         if not account:
+            otp_verification_throttle.record_failure(throttle_key)
             return JsonResponse(
                 data={
                     "status": "error",
@@ -386,6 +413,7 @@ class PasswordResetOTPVerificationView(generic.View):
             is_valid = verify_identifier_totp_token(token=otp, identifier=account.id)
             # is_valid = dummy_verify_totp_token(token=otp, identifier=student.id)
             if not is_valid:
+                otp_verification_throttle.record_failure(throttle_key)
                 return JsonResponse(
                     data={
                         "status": "error",
@@ -393,6 +421,7 @@ class PasswordResetOTPVerificationView(generic.View):
                     },
                     status=400,
                 )
+            otp_verification_throttle.reset(throttle_key)
 
             password_reset_token = exchange_data_for_token(
                 data={
@@ -106,9 +106,6 @@ class CandidateAdmin(admin.ModelAdmin):
     save_on_top = True
     save_as = True
     form = CandidateForm
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).with_votes_count()
 
     def has_add_permission(self, request):
         # Only allow superusers or election managers to add candidates
@@ -5,3 +5,5 @@ class ElectionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.elections'
 
+    def ready(self):
+        from . import signals  # noqa: F401
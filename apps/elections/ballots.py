@@ -0,0 +1,79 @@
+import typing
+import uuid
+from django.core.cache import cache
+from django.db import models
+from django.shortcuts import get_object_or_404
+
+from .models import Candidate, Election, Vote, VoteLock
+
+
+# Bounds how stale ballots can get in processes that
+# did not see the change, when the cache is not shared.
+BALLOT_CACHE_TIMEOUT = 60 * 5
+
+BALLOTS_VERSION_CACHE_KEY = "elections:ballots-version"
+
+
+def get_ballots_version() -> str:
+    """Return the current content version of all ballots."""
+    version = cache.get(BALLOTS_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(BALLOTS_VERSION_CACHE_KEY, version, timeout=None):
+            version = cache.get(BALLOTS_VERSION_CACHE_KEY, version)
+    return version
+
+
+def invalidate_ballots() -> None:
+    """Invalidate all cached ballots by moving to a new content version."""
+    cache.set(BALLOTS_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    return None
+
+
+def get_ballot(election_slug: str) -> Election:
+    """
+    Return the election with the given slug, with its offices and their qualified
+    candidates prefetched. Ballots are cached by election slug and content version.
+
+    :raises Http404: If no election with the given slug exists.
+    """
+    cache_key = f"elections:ballot:{election_slug}:{get_ballots_version()}"
+    election = cache.get(cache_key)
+    if election is None:
+        election = get_object_or_404(
+            Election.objects.with_ballot(Candidate.objects.qualified()),
+            slug=election_slug,
+        )
+        cache.set(cache_key, election, BALLOT_CACHE_TIMEOUT)
+    return election
+
+
+def get_voter_ballot_state(
+    election: Election, voter
+) -> typing.Tuple[typing.Dict[int, int], bool]:
+    """
+    Return the voter's current selections in the election, as a mapping
+    of office IDs to candidate IDs, and whether the voter has locked in
+    their votes. Both are fetched in a single query.
+    """
+    votes = Vote.objects.filter(office__election=election, voter=voter).values_list(
+        "office", "candidate"
+    )
+    # The voter's vote lock, if any, is fetched with the votes, as a row without an office
+    vote_lock = (
+        VoteLock.objects.filter(election=election, voter=voter)
+        .annotate(
+            office=models.Value(None, output_field=models.IntegerField()),
+            candidate=models.Value(None, output_field=models.IntegerField()),
+        )
+        .values_list("office", "candidate")
+    )
+
+    selections = {}
+    vote_locked = False
+    for office_id, candidate_id in votes.union(vote_lock, all=True):
+        if office_id is None:
+            vote_locked = True
+        else:
+            selections[office_id] = candidate_id
+    return selections, vote_locked
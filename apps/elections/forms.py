@@ -1,8 +1,10 @@
 from django import forms
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .models import Election, Office, Candidate, Vote, VoteLock
+from .votes import adjust_votes_counts
 
 
 class ElectionForm(forms.ModelForm):
@@ -100,12 +102,18 @@ class VoteForm(forms.ModelForm):
         existing_vote_for_office = Vote.objects.filter(
             candidate__office=candidate.office, voter=voter
         ).first()
+        previous_candidate_id = None
         if existing_vote_for_office:
+            previous_candidate_id = existing_vote_for_office.candidate_id
             existing_vote_for_office.candidate = candidate
             vote = existing_vote_for_office
         else:
             vote = super().save(commit=False)
 
         if commit:
-            vote.save()
+            with transaction.atomic():
+                vote.save()
+                adjust_votes_counts(
+                    increment=candidate.pk, decrement=previous_candidate_id
+                )
         return vote
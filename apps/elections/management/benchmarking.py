@@ -0,0 +1,52 @@
+"""Synthetic data used by the elections benchmark commands."""
+
+import datetime
+import typing
+import uuid
+from django.utils import timezone
+
+from apps.accounts.models import AccountType, UserAccount
+from apps.elections.models import Candidate, Election, Office
+
+
+def create_benchmark_election(
+    *, offices: int = 5, candidates: int = 3
+) -> Election:
+    """Create an ongoing election with the given number of offices and candidates per office."""
+    now = timezone.now()
+    election = Election.objects.create(
+        name=f"Benchmark {uuid.uuid4().hex[:8]}",
+        start_date=now - datetime.timedelta(hours=1),
+        end_date=now + datetime.timedelta(hours=1),
+    )
+    created_offices = Office.objects.bulk_create(
+        [Office(name=f"Office {i}", election=election) for i in range(offices)]
+    )
+    Candidate.objects.bulk_create(
+        [
+            Candidate(name=f"Candidate {i}-{j}", office=office)
+            for i, office in enumerate(created_offices)
+            for j in range(candidates)
+        ]
+    )
+    return election
+
+
+def create_benchmark_voters(count: int) -> typing.List[UserAccount]:
+    """
+    Create `count` student accounts.
+
+    Passwords are left unusable so that password hashing
+    does not dominate the setup time.
+    """
+    prefix = uuid.uuid4().hex[:8]
+    voters = []
+    for i in range(count):
+        voter = UserAccount(
+            email=f"voter-{prefix}-{i}@benchmark.invalid",
+            name=f"Voter {i}",
+            account_type=AccountType.STUDENT,
+        )
+        voter.set_unusable_password()
+        voters.append(voter)
+    return UserAccount.objects.bulk_create(voters, batch_size=500)
@@ -0,0 +1,132 @@
+import collections
+import json
+import typing
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from apps.accounts.models import UserAccount
+from apps.elections.management.benchmarking import (
+    create_benchmark_election,
+    create_benchmark_voters,
+)
+from core.benchmarks import Stopwatch, summarize_latencies
+
+
+SESSION_STORES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+
+
+def classify_session_query(sql: str) -> typing.Optional[str]:
+    """Return whether the query reads or writes sessions, if it touches them at all."""
+    if "django_session" not in sql:
+        return None
+    return "reads" if sql.lstrip().upper().startswith("SELECT") else "writes"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the session queries made on the voting path with each session store. "
+        "Each voter signs in, opens the ballot and switches their votes back and forth. "
+        "Benchmark data is committed while the benchmark runs and deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stores",
+            default=",".join(SESSION_STORES),
+            help="Comma separated session stores to benchmark.",
+        )
+        parser.add_argument("--voters", type=int, default=20)
+        parser.add_argument("--votes", type=int, default=20, help="Votes per voter.")
+
+    def handle(self, *args, **options):
+        stores = options["stores"].split(",")
+        unknown = set(stores) - set(SESSION_STORES)
+        if unknown:
+            raise CommandError(f"Unknown session stores: {', '.join(sorted(unknown))}")
+
+        election = create_benchmark_election(offices=1, candidates=2)
+        office = election.offices.get()
+        candidate_ids = list(office.candidates.values_list("pk", flat=True))
+        voters = create_benchmark_voters(options["voters"] * len(stores))
+        self.stdout.write(
+            f"Database: {connection.vendor}, cache: {settings.CACHES['default']['BACKEND']}"
+        )
+        try:
+            for index, store in enumerate(stores):
+                store_voters = voters[index :: len(stores)]
+                with override_settings(SESSION_ENGINE=SESSION_STORES[store]):
+                    self.benchmark_store(
+                        store, election, office.pk, candidate_ids, store_voters, options
+                    )
+        finally:
+            election.delete()
+            UserAccount.objects.filter(pk__in=[voter.pk for voter in voters]).delete()
+
+    def benchmark_store(
+        self,
+        store: str,
+        election,
+        office_id: int,
+        candidate_ids: typing.List[int],
+        voters: typing.List[UserAccount],
+        options: typing.Dict,
+    ) -> None:
+        vote_url = reverse("elections:vote", args=[election.slug, office_id])
+        ballot_url = reverse("elections:voting", args=[election.slug])
+        session_queries: typing.Counter[str] = collections.Counter()
+        sign_in_session_queries: typing.Counter[str] = collections.Counter()
+        statuses: typing.Counter[int] = collections.Counter()
+        latencies: typing.List[float] = []
+        total_queries = 0
+
+        for voter in voters:
+            client = Client()
+            with CaptureQueriesContext(connection) as queries:
+                client.force_login(voter)
+                client.get(ballot_url)
+            sign_in_session_queries.update(self.count_session_queries(queries))
+
+            for vote in range(options["votes"]):
+                data = json.dumps({"candidate": candidate_ids[vote % len(candidate_ids)]})
+                with CaptureQueriesContext(connection) as queries, Stopwatch() as stopwatch:
+                    response = client.post(vote_url, data, content_type="application/json")
+                latencies.append(stopwatch.elapsed)
+                statuses[response.status_code] += 1
+                total_queries += len(queries)
+                session_queries.update(self.count_session_queries(queries))
+
+        votes = len(latencies)
+        self.stdout.write(f"\n{store} ({SESSION_STORES[store]})")
+        self.stdout.write(
+            f"  Per vote: {total_queries / votes:.2f} queries, "
+            f"{session_queries['reads'] / votes:.2f} session reads, "
+            f"{session_queries['writes'] / votes:.2f} session writes"
+        )
+        self.stdout.write(
+            f"  Per sign in and ballot: "
+            f"{sign_in_session_queries['reads'] / len(voters):.2f} session reads, "
+            f"{sign_in_session_queries['writes'] / len(voters):.2f} session writes"
+        )
+        self.stdout.write(f"  Vote latency: {summarize_latencies(latencies)}")
+        self.stdout.write(
+            "  Responses: "
+            + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+        )
+        return None
+
+    @staticmethod
+    def count_session_queries(queries: CaptureQueriesContext) -> typing.Counter[str]:
+        return collections.Counter(
+            kind
+            for query in queries
+            if (kind := classify_session_query(query["sql"])) is not None
+        )
@@ -0,0 +1,88 @@
+import typing
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.shortcuts import get_object_or_404
+from django.test.utils import CaptureQueriesContext
+
+from apps.elections.forms import VoteForm
+from apps.elections.models import Election
+from apps.elections.votes import cast_vote
+from apps.elections.management.benchmarking import (
+    create_benchmark_election,
+    create_benchmark_voters,
+)
+from core.benchmarks import Stopwatch, summarize_latencies
+
+
+def cast_vote_with_form(voter, *, election_slug, office_id, candidate_id):
+    """The form based vote registration path, kept for comparison."""
+    election = get_object_or_404(
+        Election.objects.prefetch_related("offices__candidates"), slug=election_slug
+    )
+    office = get_object_or_404(
+        election.offices.prefetch_related("candidates"), pk=office_id
+    )
+    candidate = get_object_or_404(office.candidates, pk=candidate_id)
+    form = VoteForm(data={"candidate": candidate, "voter": voter})
+    if form.is_valid():
+        form.save()
+    return candidate
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the query count and latency of casting votes. "
+        "All benchmark data is rolled back afterwards."
+    )
+
+    casting_paths: typing.Dict[str, typing.Callable] = {
+        "form": cast_vote_with_form,
+        "service": cast_vote,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--voters", type=int, default=200)
+        parser.add_argument("--offices", type=int, default=5)
+        parser.add_argument("--candidates", type=int, default=3)
+
+    def handle(self, *args, **options):
+        if options["candidates"] < 2:
+            raise CommandError("At least 2 candidates per office are needed to switch votes.")
+
+        with transaction.atomic():
+            election = create_benchmark_election(
+                offices=options["offices"], candidates=options["candidates"]
+            )
+            ballot = [
+                (office.pk, list(office.candidates.values_list("pk", flat=True)))
+                for office in election.offices.all()
+            ]
+
+            for name, cast in self.casting_paths.items():
+                voters = create_benchmark_voters(options["voters"])
+                query_counts, latencies = [], []
+
+                # First pass registers new votes, second pass switches them
+                for choice in (0, -1):
+                    for voter in voters:
+                        for office_id, candidate_ids in ballot:
+                            # Keep the query log from hitting its size limit
+                            connection.queries_log.clear()
+                            with CaptureQueriesContext(connection) as queries:
+                                with Stopwatch() as stopwatch:
+                                    cast(
+                                        voter,
+                                        election_slug=election.slug,
+                                        office_id=office_id,
+                                        candidate_id=candidate_ids[choice],
+                                    )
+                            query_counts.append(len(queries))
+                            latencies.append(stopwatch.elapsed)
+
+                self.stdout.write(
+                    f"{name}: {len(latencies)} casts, "
+                    f"{sum(query_counts) / len(query_counts):.1f} queries/cast, "
+                    f"{summarize_latencies(latencies)}"
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,128 @@
+import asyncio
+import ssl
+import time
+import typing
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import summarize_latencies
+
+
+class WatcherStats:
+    def __init__(self) -> None:
+        self.connected = False
+        self.events = 0
+        self.first_event_after: typing.Optional[float] = None
+        self.error: typing.Optional[str] = None
+
+
+async def watch_results_stream(
+    url: str, *, cookie: str, duration: float, stats: WatcherStats
+) -> None:
+    """Open the results stream at `url` and count the events received within `duration` seconds."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    started_at = time.perf_counter()
+
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=ssl.create_default_context() if secure else None
+    )
+    try:
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            "Accept: text/event-stream\r\n"
+            f"Cookie: {cookie}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        writer.write(request.encode())
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if b" 200 " not in status_line:
+            stats.error = status_line.decode().strip() or "No response"
+            return
+        stats.connected = True
+
+        deadline = started_at + duration
+        while (remaining := deadline - time.perf_counter()) > 0:
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            if line.strip() == b"event: results":
+                stats.events += 1
+                if stats.first_event_after is None:
+                    stats.first_event_after = time.perf_counter() - started_at
+    finally:
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test an election's results stream with many concurrent watchers. "
+        "Run against a server started with an ASGI server, e.g. "
+        "`uvicorn core.asgi:application`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "url",
+            help="Full URL of the results stream, e.g. http://127.0.0.1:8000/elections/<slug>/results/stream/",
+        )
+        parser.add_argument("--watchers", type=int, default=300)
+        parser.add_argument(
+            "--duration", type=float, default=30, help="Seconds each watcher stays connected."
+        )
+        parser.add_argument(
+            "--cookie",
+            default="",
+            help="Cookie header to send, e.g. `sessionid=<session key>` of a signed in user.",
+        )
+
+    def handle(self, *args, **options):
+        watchers = [WatcherStats() for _ in range(options["watchers"])]
+        asyncio.run(self.run_watchers(watchers, options))
+
+        connected = [stats for stats in watchers if stats.connected]
+        errors = {}
+        for stats in watchers:
+            if stats.error:
+                errors[stats.error] = errors.get(stats.error, 0) + 1
+
+        self.stdout.write(f"{len(connected)}/{len(watchers)} watchers connected")
+        self.stdout.write(
+            f"{sum(stats.events for stats in connected)} results events received"
+        )
+        self.stdout.write(
+            "Time to first event: "
+            + summarize_latencies(
+                [
+                    stats.first_event_after
+                    for stats in connected
+                    if stats.first_event_after is not None
+                ]
+            )
+        )
+        for error, count in errors.items():
+            self.stdout.write(self.style.ERROR(f"{count} watcher(s) failed: {error}"))
+
+    async def run_watchers(
+        self, watchers: typing.List[WatcherStats], options: typing.Dict
+    ) -> None:
+        async def watch(stats: WatcherStats) -> None:
+            try:
+                await watch_results_stream(
+                    options["url"],
+                    cookie=options["cookie"],
+                    duration=options["duration"],
+                    stats=stats,
+                )
+            except OSError as exc:
+                stats.error = str(exc)
+
+        await asyncio.gather(*(watch(stats) for stats in watchers))
@@ -0,0 +1,108 @@
+import collections
+import json
+import threading
+import time
+import typing
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.accounts.models import UserAccount
+from apps.elections.views import vote_registration_view
+from apps.elections.management.benchmarking import (
+    create_benchmark_election,
+    create_benchmark_voters,
+)
+from core.benchmarks import summarize_latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the vote registration view from concurrent threads and report "
+        "the throughput. Run once per database backend (see DB_ENGINE) to compare them. "
+        "Benchmark data is committed while the test runs and deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--voters", type=int, default=200)
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--offices", type=int, default=5)
+        parser.add_argument("--candidates", type=int, default=3)
+
+    def handle(self, *args, **options):
+        election = create_benchmark_election(
+            offices=options["offices"], candidates=options["candidates"]
+        )
+        voters = create_benchmark_voters(options["voters"])
+        ballot = [
+            (office.pk, list(office.candidates.values_list("pk", flat=True)))
+            for office in election.offices.all()
+        ]
+
+        latencies: typing.List[float] = []
+        outcomes: typing.Counter[str] = collections.Counter()
+        lock = threading.Lock()
+        factory = RequestFactory()
+
+        def vote(assigned_voters: typing.List[UserAccount]) -> None:
+            try:
+                for index, voter in enumerate(assigned_voters):
+                    for office_id, candidate_ids in ballot:
+                        candidate_id = candidate_ids[index % len(candidate_ids)]
+                        request = factory.post(
+                            reverse("elections:vote", args=[election.slug, office_id]),
+                            data=json.dumps({"candidate": candidate_id}),
+                            content_type="application/json",
+                        )
+                        request.user = voter
+
+                        started_at = time.perf_counter()
+                        try:
+                            response = vote_registration_view(
+                                request, slug=election.slug, office_id=office_id
+                            )
+                            outcome = str(response.status_code)
+                        except Exception as exc:
+                            outcome = type(exc).__name__
+                        latency = time.perf_counter() - started_at
+
+                        with lock:
+                            latencies.append(latency)
+                            outcomes[outcome] += 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=vote, args=(voters[i :: options["threads"]],))
+            for i in range(options["threads"])
+        ]
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started_at
+
+        try:
+            self.stdout.write(
+                f"Backend: {connection.vendor} ({connections['default'].settings_dict['ENGINE']})"
+            )
+            if connection.vendor == "sqlite":
+                with connection.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    journal_mode = cursor.fetchone()[0]
+                self.stdout.write(
+                    f"SQLite profile: {settings.SQLITE_PROFILE} (journal mode {journal_mode})"
+                )
+            self.stdout.write(
+                f"{len(latencies)} ballots from {options['threads']} threads in {elapsed:.2f}s "
+                f"({len(latencies) / elapsed:.1f} ballots/sec)"
+            )
+            self.stdout.write(f"Latency: {summarize_latencies(latencies)}")
+            for outcome, count in sorted(outcomes.items()):
+                self.stdout.write(f"  {outcome}: {count}")
+        finally:
+            election.delete()
+            UserAccount.objects.filter(pk__in=[voter.pk for voter in voters]).delete()
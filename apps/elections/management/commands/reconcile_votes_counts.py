@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from apps.elections.models import Candidate
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile the maintained votes count of candidates "
+        "against the votes registered for them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--election",
+            help="Slug of the election whose candidates should be reconciled. Defaults to all elections.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report mismatched votes counts without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        candidates = Candidate.objects.all()
+        if options["election"]:
+            candidates = candidates.filter(office__election__slug=options["election"])
+
+        with transaction.atomic():
+            mismatched = list(
+                candidates.select_for_update(of=("self",))
+                .with_actual_votes_count()
+                .exclude(votes_count=models.F("actual_votes_count"))
+            )
+            for candidate in mismatched:
+                self.stdout.write(
+                    f"{candidate} ({candidate.pk}): "
+                    f"{candidate.votes_count} maintained, {candidate.actual_votes_count} actual"
+                )
+                candidate.votes_count = candidate.actual_votes_count
+
+            if not options["dry_run"]:
+                Candidate.objects.bulk_update(mismatched, ["votes_count"], batch_size=500)
+
+        action = "found" if options["dry_run"] else "reconciled"
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(mismatched)} mismatched votes count(s) {action}.")
+        )
@@ -1,3 +1,4 @@
+import typing
 from django.db import models
 from django.utils import timezone
 
@@ -25,6 +26,30 @@ class ElectionQuerySet(models.QuerySet):
             ),
         )
 
+    def with_ballot(self, candidates: typing.Optional[models.QuerySet] = None):
+        """
+        Prefetch the offices of the elections, annotated with their candidates count,
+        and the given candidates of each office as `office.ballot_candidates`.
+
+        Loads whole ballots in three queries, regardless of the number of offices.
+
+        :param candidates: Candidates to prefetch. Defaults to all candidates.
+        """
+        from .models import Candidate, Office
+
+        if candidates is None:
+            candidates = Candidate.objects.all()
+        return self.prefetch_related(
+            models.Prefetch(
+                "offices",
+                queryset=Office.objects.with_candidates_count().prefetch_related(
+                    models.Prefetch(
+                        "candidates", queryset=candidates, to_attr="ballot_candidates"
+                    )
+                ),
+            )
+        )
+
 
 class ElectionManager(models.Manager.from_queryset(ElectionQuerySet)):
     pass
@@ -37,16 +62,15 @@ class CandidateQuerySet(models.QuerySet):
     def disqualified(self):
         return self.filter(disqualified=True)
 
-    def with_votes_count(self):
+    def ordered_by_votes_count(self):
+        return self.order_by("-votes_count", "name")
+
+    def with_actual_votes_count(self):
+        """Annotate the number of votes registered for each candidate, counted from the votes."""
         return self.annotate(
-            votes_count=models.Count(
-                "votes", distinct=True
-            )
+            actual_votes_count=models.Count("votes", distinct=True)
         )
 
-    def ordered_by_votes_count(self):
-        return self.with_votes_count().order_by("-votes_count")
-
 
 class CandidateManager(models.Manager.from_queryset(CandidateQuerySet)):
     pass
@@ -69,8 +93,7 @@ class OfficeQuerySet(models.QuerySet):
                 queryset=Candidate.objects.filter(
                     office=models.OuterRef("pk"), disqualified=False
                 )
-                .with_votes_count()
-                .order_by("-votes_count")
+                .order_by("-votes_count", "name")
                 .values("name")[:1]
             )
         )
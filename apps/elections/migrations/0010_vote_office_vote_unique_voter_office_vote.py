@@ -0,0 +1,36 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_vote_office(apps, schema_editor):
+    Vote = apps.get_model("elections", "Vote")
+    Candidate = apps.get_model("elections", "Candidate")
+    Vote.objects.filter(office__isnull=True).update(
+        office=models.Subquery(
+            Candidate.objects.filter(pk=models.OuterRef("candidate")).values("office")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0009_votelock'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='office',
+            field=models.ForeignKey(editable=False, help_text='Office the vote was cast for.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='elections.office'),
+        ),
+        migrations.RunPython(populate_vote_office, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('voter', 'office'), name='unique_voter_office_vote'),
+        ),
+    ]
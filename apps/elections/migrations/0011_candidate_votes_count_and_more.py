@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:46
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_votes_count(apps, schema_editor):
+    Candidate = apps.get_model("elections", "Candidate")
+    Vote = apps.get_model("elections", "Vote")
+    Candidate.objects.update(
+        votes_count=Coalesce(
+            models.Subquery(
+                Vote.objects.filter(candidate=models.OuterRef("pk"))
+                .values("candidate")
+                .annotate(count=models.Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0010_vote_office_vote_unique_voter_office_vote'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='votes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of votes registered for the candidate. Maintained as votes are registered, switched and withdrawn.'),
+        ),
+        migrations.RunPython(populate_votes_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['office', '-votes_count'], name='candidate_office_votes_idx'),
+        ),
+    ]
@@ -119,6 +119,14 @@ class Candidate(models.Model):
     disqualified = models.BooleanField(
         default=False, help_text=_("Is the candidate disqualified?")
     )
+    votes_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text=_(
+            "Number of votes registered for the candidate. "
+            "Maintained as votes are registered, switched and withdrawn."
+        ),
+    )
 
     added_at = models.DateTimeField(auto_now_add=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -128,6 +136,11 @@ class Candidate(models.Model):
     class Meta:
         verbose_name_plural = _("Candidates")
         ordering = ("name",)
+        indexes = [
+            models.Index(
+                fields=["office", "-votes_count"], name="candidate_office_votes_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -144,6 +157,14 @@ class Vote(models.Model):
         related_name="votes",
         db_index=True,
     )
+    office = models.ForeignKey(
+        Office,
+        on_delete=models.CASCADE,
+        help_text=_("Office the vote was cast for."),
+        related_name="votes",
+        null=True,
+        editable=False,
+    )
     voter = models.ForeignKey(
         "accounts.UserAccount",
         on_delete=models.CASCADE,
@@ -158,10 +179,22 @@ class Vote(models.Model):
         verbose_name_plural = _("Votes")
         # Ensures a voter can only vote for a candidate once
         unique_together = ("candidate", "voter")
+        constraints = [
+            # Ensures a voter can only have one vote per office.
+            # Also serves as the conflict target for vote upserts.
+            models.UniqueConstraint(
+                fields=["voter", "office"], name="unique_voter_office_vote"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.voter} voted for {self.candidate}"
 
+    def save(self, *args, **kwargs):
+        if not self.office_id:
+            self.office_id = self.candidate.office_id
+        super().save(*args, **kwargs)
+
 
 class VoteLock(models.Model):
     """Model for election vote locks."""
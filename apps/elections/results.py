@@ -0,0 +1,82 @@
+import hashlib
+import json
+import threading
+import typing
+from cachetools import TTLCache
+from django.db import models
+
+from .models import Candidate, Election, Office
+
+
+# Snapshots are invalidated as soon as votes change in this process.
+# The TTL bounds how stale they can get when votes are registered by
+# other processes.
+RESULTS_CACHE_TTL = 5
+
+_results_cache = TTLCache(maxsize=256, ttl=RESULTS_CACHE_TTL)
+_results_cache_lock = threading.Lock()
+
+
+def build_results_snapshot(election: Election) -> typing.Dict[str, typing.Any]:
+    """
+    Build a JSON serializable snapshot of the election's results.
+
+    The snapshot's version is derived from its content, so it is
+    the same across processes for the same results.
+    """
+    offices = Office.objects.filter(election=election).prefetch_related(
+        models.Prefetch(
+            "candidates",
+            queryset=Candidate.objects.ordered_by_votes_count(),
+        )
+    )
+    results = [
+        {
+            "id": office.pk,
+            "name": office.name,
+            "candidates": [
+                {
+                    "id": candidate.pk,
+                    "name": candidate.name,
+                    "votes_count": candidate.votes_count,
+                    "disqualified": candidate.disqualified,
+                }
+                for candidate in office.candidates.all()
+            ],
+        }
+        for office in offices
+    ]
+    version = hashlib.blake2b(
+        json.dumps(results, sort_keys=True).encode(), digest_size=8
+    ).hexdigest()
+    return {
+        "election": election.slug,
+        "version": version,
+        "has_ended": election.has_ended,
+        "offices": results,
+    }
+
+
+def peek_results_snapshot(
+    election: Election,
+) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Return the cached results snapshot of the election, if any. Does not hit the database."""
+    with _results_cache_lock:
+        return _results_cache.get(election.pk)
+
+
+def get_results_snapshot(election: Election) -> typing.Dict[str, typing.Any]:
+    """Return the cached results snapshot of the election, building it if needed."""
+    snapshot = peek_results_snapshot(election)
+    if snapshot is None:
+        snapshot = build_results_snapshot(election)
+        with _results_cache_lock:
+            _results_cache[election.pk] = snapshot
+    return snapshot
+
+
+def invalidate_results(election_id: int) -> None:
+    """Discard the cached results snapshot of the election."""
+    with _results_cache_lock:
+        _results_cache.pop(election_id, None)
+    return None
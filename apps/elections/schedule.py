@@ -0,0 +1,104 @@
+import datetime
+import threading
+import typing
+from django.utils import timezone
+
+from .models import Election
+
+
+# Upper bound on how long the computed state is trusted. Covers processes
+# that do not receive the signals of elections changed elsewhere.
+ELECTION_STATE_MAX_AGE = datetime.timedelta(minutes=1)
+
+
+class ElectionScheduleCache:
+    """
+    Answers whether any election is ongoing, or whether an election has ended,
+    from memory, until the next election starts or ends, or until the cache
+    is invalidated.
+    """
+
+    def __init__(self, max_age: datetime.timedelta = ELECTION_STATE_MAX_AGE) -> None:
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._ongoing = False
+        self._end_dates: typing.Dict[int, datetime.datetime] = {}
+        self._valid_until: typing.Optional[datetime.datetime] = None
+
+    def _get_state(
+        self, now: datetime.datetime
+    ) -> typing.Tuple[bool, typing.Dict[int, datetime.datetime]]:
+        with self._lock:
+            if self._valid_until is not None and now < self._valid_until:
+                return self._ongoing, self._end_dates
+            generation = self._generation
+
+        ongoing, end_dates, valid_until = self.compute_state(now)
+        with self._lock:
+            # Do not overwrite an invalidation that happened while computing
+            if generation == self._generation:
+                self._ongoing = ongoing
+                self._end_dates = end_dates
+                self._valid_until = valid_until
+        return ongoing, end_dates
+
+    def is_any_ongoing(self) -> bool:
+        """Check if there is at least one ongoing election."""
+        ongoing, _ = self._get_state(timezone.now())
+        return ongoing
+
+    def has_ended(self, election_id: int) -> bool:
+        """Check if the election has ended."""
+        now = timezone.now()
+        # Elections that had ended when the state was computed are not kept
+        _, end_dates = self._get_state(now)
+        end_date = end_dates.get(election_id)
+        return end_date is None or now > end_date
+
+    def peek_has_ended(self, election_id: int) -> typing.Optional[bool]:
+        """
+        Check if the election has ended, if the state is cached.
+        Does not hit the database.
+        """
+        now = timezone.now()
+        with self._lock:
+            if self._valid_until is None or now >= self._valid_until:
+                return None
+            end_date = self._end_dates.get(election_id)
+        return end_date is None or now > end_date
+
+    def compute_state(
+        self, now: datetime.datetime
+    ) -> typing.Tuple[bool, typing.Dict[int, datetime.datetime], datetime.datetime]:
+        """
+        Compute whether any election is ongoing at `now`, the end dates
+        of the elections that have not ended, and the instant until which
+        that remains true.
+        """
+        ongoing = False
+        end_dates = {}
+        valid_until = now + self.max_age
+        windows = Election.objects.filter(end_date__gte=now).values_list(
+            "pk", "start_date", "end_date"
+        )
+        for election_id, start_date, end_date in windows:
+            end_dates[election_id] = end_date
+            if start_date <= now:
+                ongoing = True
+                # Elections are still ongoing at their end date
+                transition = end_date + datetime.timedelta(microseconds=1)
+            else:
+                transition = start_date
+            valid_until = min(valid_until, transition)
+        return ongoing, end_dates, valid_until
+
+    def invalidate(self) -> None:
+        """Discard the cached state, so it is recomputed on the next check."""
+        with self._lock:
+            self._generation += 1
+            self._valid_until = None
+        return None
+
+
+election_schedule = ElectionScheduleCache()
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Candidate, Election, Office
+from .ballots import invalidate_ballots
+from .schedule import election_schedule
+from .votes import delete_votes
+
+
+@receiver([post_save, post_delete], sender=Election)
+@receiver([post_save, post_delete], sender=Office)
+@receiver([post_save, post_delete], sender=Candidate)
+def invalidate_ballots_on_change(sender, **kwargs):
+    # Invalidate after commit, so that ballots are not
+    # rebuilt from data that is yet to be committed
+    transaction.on_commit(invalidate_ballots)
+
+
+@receiver([post_save, post_delete], sender=Election)
+def invalidate_election_schedule_on_change(sender, **kwargs):
+    transaction.on_commit(election_schedule.invalidate)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def delete_votes_of_deleted_voter(sender, instance, **kwargs):
+    # Deleted through the votes service, before the account's deletion
+    # cascades to them, so that the candidates' votes counts are adjusted
+    delete_votes(instance)
@@ -0,0 +1,22 @@
+const resultsSection = document.querySelector('[data-results-stream-url]');
+
+
+if (resultsSection && window.EventSource) {
+    const resultsStream = new EventSource(resultsSection.dataset.resultsStreamUrl);
+
+    resultsStream.addEventListener('results', (event) => {
+        const snapshot = JSON.parse(event.data);
+
+        snapshot.offices.forEach(office => {
+            office.candidates.forEach(candidate => {
+                const votesCount = resultsSection.querySelector(`.votes-count[data-candidate-id="${candidate.id}"]`);
+                if (!votesCount) return;
+
+                votesCount.textContent = `${candidate.votes_count} vote${candidate.votes_count === 1 ? '' : 's'}`;
+            });
+        });
+    });
+
+    // The stream ends once the election has ended
+    resultsStream.addEventListener('end', () => resultsStream.close());
+}
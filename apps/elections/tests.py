@@ -0,0 +1,97 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.elections.ballots import get_voter_ballot_state
+from apps.elections.management.benchmarking import (
+    create_benchmark_election,
+    create_benchmark_voters,
+)
+from apps.elections.models import VoteLock
+from apps.elections.votes import cast_vote
+
+
+class BallotQueryCountTests(TestCase):
+    """The election detail and voting pages make as many queries for any number of offices."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.voter = create_benchmark_voters(1)[0]
+
+    def create_election(self, offices: int):
+        election = create_benchmark_election(offices=offices, candidates=3)
+        # Votes for some of the offices, so the voter's selections are shown
+        for office in election.offices.all()[:2]:
+            cast_vote(
+                self.voter,
+                election_slug=election.slug,
+                office_id=office.pk,
+                candidate_id=office.candidates.first().pk,
+            )
+        return election
+
+    def sign_in(self) -> None:
+        # Clears cached users, so both renders load the user the same way
+        for cache in caches.all():
+            cache.clear()
+        self.client.force_login(self.voter)
+
+    def count_queries(self, url_name: str, election) -> int:
+        self.sign_in()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name, args=[election.slug]))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assert_constant_query_count(self, url_name: str) -> None:
+        small_election = self.create_election(offices=2)
+        large_election = self.create_election(offices=10)
+
+        expected_queries = self.count_queries(url_name, small_election)
+        self.sign_in()
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(reverse(url_name, args=[large_election.slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["election"].offices.all()), 10)
+
+    def test_election_detail_query_count(self):
+        self.assert_constant_query_count("elections:election_detail")
+
+    def test_voting_query_count(self):
+        self.assert_constant_query_count("elections:voting")
+
+
+class VoterBallotStateTests(TestCase):
+    """The voter's selections and vote lock are fetched together, for any ballot."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.voter = create_benchmark_voters(1)[0]
+
+    def test_votes_and_vote_lock(self):
+        election = create_benchmark_election(offices=3, candidates=2)
+        office = election.offices.first()
+        candidate = office.candidates.first()
+        cast_vote(
+            self.voter,
+            election_slug=election.slug,
+            office_id=office.pk,
+            candidate_id=candidate.pk,
+        )
+        self.assertEqual(
+            get_voter_ballot_state(election, self.voter), ({office.pk: candidate.pk}, False)
+        )
+
+        VoteLock.objects.create(election=election, voter=self.voter)
+        with self.assertNumQueries(1):
+            state = get_voter_ballot_state(election, self.voter)
+        self.assertEqual(state, ({office.pk: candidate.pk}, True))
+
+    def test_vote_lock_without_offices(self):
+        election = create_benchmark_election(offices=1, candidates=1)
+        election.offices.all().delete()
+        VoteLock.objects.create(election=election, voter=self.voter)
+
+        self.assertEqual(get_voter_ballot_state(election, self.voter), ({}, True))
@@ -10,6 +10,16 @@ urlpatterns = [
     path("", views.index_view, name="index"),
     path("elections/", views.election_list_view, name="election_list"),
     path("elections/<slug:slug>/", views.election_detail_view, name="election_detail"),
+    path(
+        "elections/<slug:slug>/results/",
+        views.election_results_view,
+        name="election_results",
+    ),
+    path(
+        "elections/<slug:slug>/results/stream/",
+        views.election_results_stream_view,
+        name="election_results_stream",
+    ),
     path("elections/<slug:slug>/vote/", views.voting_view, name="voting"),
     path(
         "elections/<slug:slug>/vote/<int:office_id>/",
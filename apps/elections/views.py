@@ -1,14 +1,20 @@
+import asyncio
 import json
 import typing
+from asgiref.sync import sync_to_async
 from django.db import models
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect
 from django.urls import reverse
 from django.views import generic
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
 
-from .models import Candidate, Election, Office, VoteLock, Vote
-from .forms import VoteForm
+from .models import Candidate, Election
+from .votes import InvalidVote, cast_vote, lock_in_votes, withdraw_vote
+from .results import get_results_snapshot, peek_results_snapshot
+from .ballots import get_ballot, get_voter_ballot_state
+from .schedule import election_schedule
 from helpers.exceptions import capture
 
 
@@ -44,21 +50,105 @@ class ElectionDetailView(LoginRequiredMixin, generic.DetailView):
     """View for election details."""
 
     template_name = "elections/election_detail.html"
-    queryset = election_qs
+    queryset = Election.objects.with_ballot(Candidate.objects.ordered_by_votes_count())
     context_object_name = "election"
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
 
+class ElectionResultsView(LoginRequiredMixin, generic.View):
+    """View for the current results of an election, as JSON."""
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        election = get_object_or_404(Election, slug=self.kwargs["slug"])
+        return JsonResponse(data=get_results_snapshot(election), status=200)
+
+
+class ElectionResultsStreamView(generic.View):
+    """
+    View for streaming the results of an election as Server-Sent Events.
+
+    A `results` event is sent whenever the results change, and an `end`
+    event once the election has ended. Must be served over ASGI, as each
+    watcher holds its connection open. Streams are closed after `max_duration`
+    seconds, and reopened by the watchers' `EventSource`, so connections
+    do not outlive the workers serving them.
+    """
+
+    http_method_names = ["get"]
+    poll_interval = 1
+    keepalive_interval = 15
+    max_duration = 5 * 60
+
+    async def get(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+
+        election = await aget_object_or_404(Election, slug=self.kwargs["slug"])
+        response = StreamingHttpResponse(
+            # Results the watcher already has, before it reconnected, are not sent again
+            self.stream_results(election, last_version=request.headers.get("Last-Event-ID")),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Prevent reverse proxies from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def get_results_snapshot(self, election: Election) -> typing.Dict:
+        # Cached snapshots are served without leaving the event loop
+        snapshot = peek_results_snapshot(election)
+        if snapshot is None:
+            snapshot = await sync_to_async(get_results_snapshot)(election)
+        return snapshot
+
+    async def has_ended(self, election: Election) -> bool:
+        # The end date is read from the schedule cache, as it may be changed while streaming
+        has_ended = election_schedule.peek_has_ended(election.pk)
+        if has_ended is None:
+            has_ended = await sync_to_async(election_schedule.has_ended)(election.pk)
+        return has_ended
+
+    async def stream_results(
+        self, election: Election, *, last_version: typing.Optional[str] = None
+    ) -> typing.AsyncIterator[str]:
+        idle_for = 0
+        streamed_for = 0
+        while streamed_for < self.max_duration:
+            snapshot = await self.get_results_snapshot(election)
+            if snapshot["version"] != last_version:
+                last_version = snapshot["version"]
+                idle_for = 0
+                yield f"id: {last_version}\nevent: results\ndata: {json.dumps(snapshot)}\n\n"
+            elif idle_for >= self.keepalive_interval:
+                idle_for = 0
+                yield ": keep-alive\n\n"
+
+            if await self.has_ended(election):
+                yield "event: end\ndata: {}\n\n"
+                return
+
+            await asyncio.sleep(self.poll_interval)
+            idle_for += self.poll_interval
+            streamed_for += self.poll_interval
+
+
 class VotingView(LoginRequiredMixin, generic.TemplateView):
     template_name = "elections/voting.html"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["election"] = get_object_or_404(election_qs, slug=self.kwargs["slug"])
-        context["vote_locked"] = VoteLock.objects.filter(
-            election=context["election"], voter=self.request.user
-        ).exists()
+        election = get_ballot(self.kwargs["slug"])
+        selections, vote_locked = get_voter_ballot_state(election, self.request.user)
+
+        context["election"] = election
+        context["vote_locked"] = vote_locked
+        context["ballot"] = [
+            (office, selections.get(office.pk)) for office in election.offices.all()
+        ]
         return context
 
 
@@ -68,14 +158,6 @@ class VoteRegistrationView(LoginRequiredMixin, generic.View):
     """View for registering votes."""
 
     http_method_names = ["post"]
-    form_class = VoteForm
-
-    def get_object(self) -> Office:
-        election = get_object_or_404(election_qs, slug=self.kwargs["slug"])
-        office = get_object_or_404(
-            election.offices.prefetch_related("candidates"), pk=self.kwargs["office_id"]
-        )
-        return office
 
     def post(self, request, *args, **kwargs):
         # Prevent admin from participating in voting exercises
@@ -90,57 +172,52 @@ class VoteRegistrationView(LoginRequiredMixin, generic.View):
 
         data: typing.Dict = json.loads(request.body)
         voter = self.request.user
-        office = self.get_object()
-        candidate_pk: str = data.get("candidate")
-
-        if office.election.has_ended:
-            return JsonResponse(
-                data={
-                    "status": "error",
-                    "detail": "Invalid vote. Voting has ended!",
-                },
-                status=400,
-            )
+        candidate_pk = str(data.get("candidate"))
+
+        try:
+            if candidate_pk.lower() in ["null", "undefined", "nil", "none"]:
+                # If the user has already voted, remove the vote for the office
+                office, withdrawn = withdraw_vote(
+                    voter,
+                    election_slug=self.kwargs["slug"],
+                    office_id=self.kwargs["office_id"],
+                )
+                if withdrawn:
+                    return JsonResponse(
+                        data={
+                            "status": "success",
+                            "detail": f"Your vote for {office.name.upper()} has been withdrawn!",
+                        },
+                        status=200,
+                    )
 
-        if candidate_pk.lower() in ["null", "undefined", "nil", "none"]:
-            # If the user has already voted, remove the vote for the office
-            votes = Vote.objects.filter(voter=voter, candidate__office=office)
-            if votes.exists():
-                votes.delete()
                 return JsonResponse(
                     data={
                         "status": "success",
-                        "detail": f"Your vote for {office.name.upper()} has been withdrawn!",
+                        "detail": "Your response has been recorded.",
                     },
                     status=200,
                 )
 
-            return JsonResponse(
-                data={
-                    "status": "success",
-                    "detail": "Your response has been recorded.",
-                },
-                status=200,
+            candidate = cast_vote(
+                voter,
+                election_slug=self.kwargs["slug"],
+                office_id=self.kwargs["office_id"],
+                candidate_id=candidate_pk,
             )
-
-        candidate: Candidate = get_object_or_404(office.candidates, pk=candidate_pk)
-        form = self.form_class(data={"candidate": candidate, "voter": voter})
-
-        if not form.is_valid():
+        except InvalidVote as exc:
             return JsonResponse(
                 data={
                     "status": "error",
-                    "detail": "An error occurred",
-                    "errors": form.errors,
+                    "detail": str(exc),
                 },
                 status=400,
             )
 
-        form.save()
         return JsonResponse(
             data={
                 "status": "success",
-                "detail": f"You voted {candidate.name.title()} for {office.name.upper()}!",
+                "detail": f"You voted {candidate.name.title()} for {candidate.office.name.upper()}!",
             },
             status=200,
         )
@@ -160,8 +237,7 @@ class VoteLockInView(LoginRequiredMixin, generic.View):
         election = self.get_object()
         voter = self.request.user
 
-        if not VoteLock.objects.filter(election=election, voter=voter).exists():
-            VoteLock.objects.create(election=election, voter=voter)
+        lock_in_votes(voter, election)
 
         return redirect("elections:voting", slug=election.slug)
 
@@ -169,6 +245,8 @@ class VoteLockInView(LoginRequiredMixin, generic.View):
 index_view = IndexView.as_view()
 election_list_view = ElectionListView.as_view()
 election_detail_view = ElectionDetailView.as_view()
+election_results_view = ElectionResultsView.as_view()
+election_results_stream_view = ElectionResultsStreamView.as_view()
 voting_view = VotingView.as_view()
 vote_registration_view = VoteRegistrationView.as_view()
 vote_lock_in_view = VoteLockInView.as_view()
@@ -0,0 +1,233 @@
+import functools
+import typing
+from django.db import IntegrityError, models, transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from .models import Candidate, Election, Office, Vote, VoteLock
+from .results import invalidate_results
+from core.db import retry_on_database_busy
+
+
+class InvalidVote(ValueError):
+    pass
+
+
+CONCURRENT_VOTE_MESSAGE = "Your vote changed while it was being registered. Please try again."
+
+
+def _vote_locked(voter, election_ref: str) -> models.Exists:
+    return models.Exists(
+        VoteLock.objects.filter(election=models.OuterRef(election_ref), voter=voter)
+    )
+
+
+def _current_candidate_id(voter, office_ref: str) -> models.Subquery:
+    return models.Subquery(
+        Vote.objects.filter(office=models.OuterRef(office_ref), voter=voter).values(
+            "candidate"
+        )[:1]
+    )
+
+
+def adjust_votes_counts(
+    *, increment: typing.Optional[int] = None, decrement: typing.Optional[int] = None
+) -> None:
+    """
+    Adjust the maintained votes count of candidates in one statement.
+
+    :param increment: ID of the candidate whose votes count should be incremented.
+    :param decrement: ID of the candidate whose votes count should be decremented.
+    """
+    whens = []
+    if increment:
+        whens.append(
+            models.When(pk=increment, then=models.F("votes_count") + 1)
+        )
+    if decrement:
+        whens.append(
+            models.When(pk=decrement, then=models.F("votes_count") - 1)
+        )
+    if not whens:
+        return None
+
+    Candidate.objects.filter(pk__in=[increment, decrement]).update(
+        votes_count=models.Case(
+            *whens,
+            default=models.F("votes_count"),
+            output_field=models.PositiveIntegerField(),
+        )
+    )
+    return None
+
+
+def delete_votes(voter) -> int:
+    """
+    Delete all the voter's votes, decrementing the votes counts of the
+    candidates voted for, say, before the voter's account is deleted.
+
+    :param voter: The user account whose votes are deleted.
+    :return: The number of votes deleted.
+    """
+    with transaction.atomic():
+        votes = Vote.objects.filter(voter=voter)
+        counts = list(
+            votes.values_list("candidate", "candidate__office__election")
+            .annotate(count=models.Count("pk"))
+            .order_by()
+        )
+        if not counts:
+            return 0
+
+        deleted, _ = votes.delete()
+        Candidate.objects.filter(
+            pk__in=[candidate_id for candidate_id, _, _ in counts]
+        ).update(
+            votes_count=models.Case(
+                *(
+                    models.When(pk=candidate_id, then=models.F("votes_count") - count)
+                    for candidate_id, _, count in counts
+                ),
+                default=models.F("votes_count"),
+                output_field=models.PositiveIntegerField(),
+            )
+        )
+        for election_id in {election_id for _, election_id, _ in counts}:
+            transaction.on_commit(functools.partial(invalidate_results, election_id))
+    return deleted
+
+
+def check_can_vote(election, *, vote_locked: bool) -> None:
+    """
+    Check that votes can be registered or withdrawn in the election.
+
+    :param election: The election the vote is for.
+    :param vote_locked: Whether the voter has locked in their votes for the election.
+    :raises InvalidVote: If votes cannot be registered or withdrawn.
+    """
+    if election.has_ended:
+        raise InvalidVote("Invalid vote. Voting has ended!")
+
+    if election.is_upcoming:
+        raise InvalidVote("Invalid vote. Voting has not started!")
+
+    if vote_locked:
+        raise InvalidVote(
+            f"You can no longer vote. You have already locked in your vote for {election}."
+        )
+    return None
+
+
+@retry_on_database_busy
+def cast_vote(
+    voter, *, election_slug: str, office_id: int, candidate_id: typing.Any
+) -> Candidate:
+    """
+    Register the voter's vote for the candidate, replacing any
+    vote the voter has already registered for the candidate's office.
+
+    The candidate, office, election and the voter's vote lock and existing
+    vote are all fetched in one query. The vote is then inserted, or switched
+    with a conditional update, and the candidates' votes counts adjusted.
+
+    :param voter: The user account casting the vote.
+    :param election_slug: Slug of the election the vote is for.
+    :param office_id: ID of the office the vote is for.
+    :param candidate_id: ID of the candidate being voted for.
+    :return: The candidate voted for.
+    :raises InvalidVote: If the vote cannot be registered.
+    """
+    candidates = Candidate.objects.select_related("office__election").annotate(
+        vote_locked=_vote_locked(voter, "office__election"),
+        current_candidate_id=_current_candidate_id(voter, "office"),
+    )
+
+    with transaction.atomic():
+        candidate: Candidate = get_object_or_404(
+            candidates,
+            pk=candidate_id,
+            office_id=office_id,
+            office__election__slug=election_slug,
+        )
+        check_can_vote(candidate.office.election, vote_locked=candidate.vote_locked)
+
+        previous_candidate_id = candidate.current_candidate_id
+        if previous_candidate_id == candidate.pk:
+            raise InvalidVote(
+                f"You have already registered a vote for {candidate.name.title()}."
+            )
+
+        if previous_candidate_id is None:
+            try:
+                with transaction.atomic():
+                    Vote.objects.create(
+                        candidate=candidate, office_id=candidate.office_id, voter=voter
+                    )
+            except IntegrityError:
+                # A vote for the office was registered concurrently
+                raise InvalidVote(CONCURRENT_VOTE_MESSAGE)
+        else:
+            # Only switch the vote if it has not changed since it was read
+            switched = Vote.objects.filter(
+                voter=voter,
+                office_id=candidate.office_id,
+                candidate_id=previous_candidate_id,
+            ).update(candidate=candidate, updated_at=timezone.now())
+            if not switched:
+                raise InvalidVote(CONCURRENT_VOTE_MESSAGE)
+
+        adjust_votes_counts(increment=candidate.pk, decrement=previous_candidate_id)
+        transaction.on_commit(
+            functools.partial(invalidate_results, candidate.office.election_id)
+        )
+    return candidate
+
+
+@retry_on_database_busy
+def withdraw_vote(
+    voter, *, election_slug: str, office_id: int
+) -> typing.Tuple[Office, bool]:
+    """
+    Withdraw the voter's vote for the office, if any.
+
+    :param voter: The user account withdrawing the vote.
+    :param election_slug: Slug of the election the vote is for.
+    :param office_id: ID of the office the vote is for.
+    :return: A tuple of the office and whether a vote was withdrawn.
+    :raises InvalidVote: If the vote cannot be withdrawn.
+    """
+    offices = Office.objects.select_related("election").annotate(
+        vote_locked=_vote_locked(voter, "election"),
+        current_candidate_id=_current_candidate_id(voter, "pk"),
+    )
+
+    with transaction.atomic():
+        office: Office = get_object_or_404(
+            offices, pk=office_id, election__slug=election_slug
+        )
+        check_can_vote(office.election, vote_locked=office.vote_locked)
+        if office.current_candidate_id is None:
+            return office, False
+
+        deleted, _ = Vote.objects.filter(
+            voter=voter, office=office, candidate_id=office.current_candidate_id
+        ).delete()
+        if not deleted:
+            raise InvalidVote(CONCURRENT_VOTE_MESSAGE)
+
+        adjust_votes_counts(decrement=office.current_candidate_id)
+        transaction.on_commit(functools.partial(invalidate_results, office.election_id))
+    return office, True
+
+
+@retry_on_database_busy
+def lock_in_votes(voter, election: Election) -> VoteLock:
+    """
+    Lock in the voter's votes for the election, so they can no longer be changed.
+
+    :param voter: The user account locking in their votes.
+    :param election: The election the votes are for.
+    :return: The voter's vote lock for the election.
+    """
+    vote_lock, _ = VoteLock.objects.get_or_create(election=election, voter=voter)
+    return vote_lock
@@ -1,6 +1,12 @@
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.html import format_html
 
-from .models import Student
+from .models import Student, StudentImportJob, StudentImportJobFile
+from .forms import StudentMailForm
+from apps.accounts.outbox import enqueue_bulk_mail
 
 
 @admin.register(Student)
@@ -33,12 +39,92 @@ class StudentModelAdmin(admin.ModelAdmin):
         return obj.matriculation_number.upper()
 
     def send_email_to_students(self, request, queryset):
-        """Send an email to the selected students."""
-        selected_students = queryset.values_list("name", "email")
-        for student in selected_students:
-            name, email = student
-            # Send email to the student
-            print(f"Sending email to {name} at {email}")
-        self.message_user(request, "Email sent successfully.")
-    
+        """
+        Queue a mail to the selected students in the mail outbox.
+
+        Shows a form for composing the mail first. The mails are
+        delivered in the background by the outbox workers.
+        """
+        if "apply" in request.POST:
+            form = StudentMailForm(request.POST)
+        else:
+            form = StudentMailForm()
+
+        if form.is_valid():
+            message: str = form.cleaned_data["message"]
+            recipients = queryset.order_by().values_list(
+                "name", "matriculation_number", "email"
+            )
+            batch, queued = enqueue_bulk_mail(
+                (
+                    (
+                        email,
+                        message.format(
+                            name=name, matriculation_number=matriculation_number.upper()
+                        ),
+                    )
+                    for name, matriculation_number, email in recipients.iterator(
+                        chunk_size=2000
+                    )
+                ),
+                subject=form.cleaned_data["subject"],
+            )
+            progress_url = (
+                reverse("admin:accounts_outboxmail_changelist") + f"?batch={batch}"
+            )
+            self.message_user(
+                request,
+                format_html(
+                    'Mail queued for {} student(s). <a href="{}">Track its delivery</a>.',
+                    queued,
+                    progress_url,
+                ),
+            )
+            return None
+
+        return TemplateResponse(
+            request,
+            "students/admin/send_email.html",
+            {
+                **self.admin_site.each_context(request),
+                "title": "Send email to students",
+                "opts": self.model._meta,
+                "form": form,
+                "recipients_count": queryset.count(),
+                "selected_ids": request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+                "select_across": request.POST.get("select_across") == "1",
+                "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
+
     send_email_to_students.short_description = "Send email to selected students"
+
+
+class StudentImportJobFileInline(admin.TabularInline):
+    model = StudentImportJobFile
+    fields = ["file_name", "file"]
+    readonly_fields = ["file_name", "file"]
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StudentImportJob)
+class StudentImportJobModelAdmin(admin.ModelAdmin):
+    """Read-only admin class for the StudentImportJob model."""
+    list_display = ["file_name", "status", "created_by", "created_at", "finished_at"]
+    list_filter = ["status"]
+    inlines = [StudentImportJobFileInline]
+    readonly_fields = [
+        "id", "file_name", "status", "report", "error",
+        "cancel_requested", "attempt", "created_by", "created_at", "updated_at",
+        "started_at", "finished_at",
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -45,3 +45,24 @@ class StudentForm(forms.ModelForm):
         return department.strip().title()
     
 
+
+
+class StudentMailForm(forms.Form):
+    """Form for composing a mail to students, from the admin."""
+
+    subject = forms.CharField(max_length=255)
+    message = forms.CharField(
+        widget=forms.Textarea(attrs={"rows": 10, "cols": 80}),
+        help_text="Use {name} and {matriculation_number} to personalize the message.",
+    )
+
+    def clean_message(self) -> str:
+        message: str = self.cleaned_data["message"]
+        try:
+            message.format(name="", matriculation_number="")
+        except (KeyError, IndexError, ValueError) as exc:
+            raise forms.ValidationError(
+                f"Invalid placeholder in message: {exc}. Only {{name}} and "
+                "{matriculation_number} are supported. Use {{ and }} for literal braces."
+            )
+        return message
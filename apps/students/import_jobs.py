@@ -0,0 +1,294 @@
+"""
+Background student import jobs.
+
+Uploaded student details files are saved with a `StudentImportJob` and
+imported by a pool of worker threads, outside the request.
+
+A single CSV file is streamed, and the job's progress is saved in the same
+transaction as each chunk of imported rows, so a job that is cancelled,
+or that crashes partway, can be resumed after its last imported chunk.
+
+Several files, zip archives and Excel workbooks are parsed in a pool of
+processes and imported in one transaction, with a report per file. Their
+jobs either import every file or none, so resuming them starts over.
+
+Each run of a job claims it by incrementing its `attempt`. A run only saves
+the job's progress, or finishes it, while its attempt is the job's latest,
+so a run that was assumed lost, and resumed, stops at its next save.
+"""
+
+import datetime
+import functools
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import close_old_connections, connection, models, transaction
+from django.utils import timezone
+
+from .models import StudentImportJob, StudentImportJobFile, StudentImportJobStatus
+from .students_upload import (
+    ImportReport,
+    import_students_from_file,
+    import_students_from_files,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+class ImportSuperseded(Exception):
+    """The import job was resumed, by another run, while this run was importing it."""
+
+    pass
+
+
+_executor: typing.Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "STUDENT_IMPORT_WORKERS", 2),
+                thread_name_prefix="student-import",
+            )
+        return _executor
+
+
+def _stalled_before() -> datetime.datetime:
+    stale_after = getattr(settings, "STUDENT_IMPORT_JOB_STALE_AFTER", 120)
+    return timezone.now() - datetime.timedelta(seconds=stale_after)
+
+
+def _resumable() -> models.Q:
+    # Pending and running jobs whose progress has not been saved for a while
+    # are assumed to have been lost with the process running them.
+    stalled = models.Q(
+        status__in=[StudentImportJobStatus.PENDING, StudentImportJobStatus.RUNNING],
+        updated_at__lt=_stalled_before(),
+    )
+    return stalled | models.Q(
+        status__in=[StudentImportJobStatus.FAILED, StudentImportJobStatus.CANCELLED]
+    )
+
+
+def can_resume(job: StudentImportJob) -> bool:
+    """Check if the import job was interrupted and can be resumed."""
+    if job.status in (StudentImportJobStatus.FAILED, StudentImportJobStatus.CANCELLED):
+        return True
+    return not job.is_finished and job.updated_at < _stalled_before()
+
+
+def submit_import_job(job: StudentImportJob) -> None:
+    """Run the import job in the background, once the current transaction commits."""
+    transaction.on_commit(
+        functools.partial(_get_executor().submit, run_import_job, job.pk)
+    )
+    return None
+
+
+def create_import_job(
+    students_files: typing.Sequence[UploadedFile], *, created_by=None
+) -> StudentImportJob:
+    """
+    Save the uploaded student details files and queue their import.
+
+    :param students_files: The uploaded CSV or Excel files, or zip archives of them.
+    :param created_by: The user account that uploaded the files.
+    :return: The import job.
+    """
+    with transaction.atomic():
+        job = StudentImportJob.objects.create(
+            file_name=", ".join(students_file.name for students_file in students_files)[:255],
+            created_by=created_by,
+        )
+        for students_file in students_files:
+            job_file = StudentImportJobFile(job=job, file_name=students_file.name)
+            job_file.file.save(students_file.name, students_file, save=False)
+            job_file.save()
+        submit_import_job(job)
+    return job
+
+
+def is_streamed(job_files: typing.Sequence[StudentImportJobFile]) -> bool:
+    """Check if the job's files are imported as a single, streamed, CSV file."""
+    return len(job_files) == 1 and job_files[0].file_name.lower().endswith(".csv")
+
+
+def cancel_import_job(job: StudentImportJob) -> None:
+    """
+    Cancel the import job. Pending jobs are cancelled immediately. Running jobs
+    stop, and are marked as cancelled, before their next chunk of rows is saved.
+    """
+    StudentImportJob.objects.filter(
+        pk=job.pk, status=StudentImportJobStatus.PENDING
+    ).update(
+        status=StudentImportJobStatus.CANCELLED,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    StudentImportJob.objects.filter(
+        pk=job.pk, status=StudentImportJobStatus.RUNNING
+    ).update(cancel_requested=True, updated_at=timezone.now())
+    job.refresh_from_db()
+    return None
+
+
+def resume_import_job(job: StudentImportJob) -> bool:
+    """
+    Queue an interrupted import job to continue after its last imported chunk,
+    or, for imports of several files, to start over.
+
+    :return: Whether the job was queued. Jobs that are still running,
+        or that completed, are not.
+    """
+    resumed = StudentImportJob.objects.filter(_resumable(), pk=job.pk).update(
+        status=StudentImportJobStatus.PENDING,
+        # Supersedes the run assumed lost, if it is still importing
+        attempt=models.F("attempt") + 1,
+        cancel_requested=False,
+        error=None,
+        finished_at=None,
+        updated_at=timezone.now(),
+    )
+    job.refresh_from_db()
+    if resumed:
+        submit_import_job(job)
+    return bool(resumed)
+
+
+def _update_run(job: StudentImportJob, **fields) -> None:
+    """
+    Update the job, and when it was last updated, unless
+    it was asked to stop, or this run was superseded.
+    """
+    updated = StudentImportJob.objects.filter(
+        pk=job.pk, attempt=job.attempt, cancel_requested=False
+    ).update(updated_at=timezone.now(), **fields)
+    if updated:
+        return None
+    if StudentImportJob.objects.filter(pk=job.pk, attempt=job.attempt).exists():
+        raise ImportCancelled()
+    raise ImportSuperseded()
+
+
+def _save_progress(job: StudentImportJob, report: ImportReport) -> None:
+    """Save the job's progress, unless it was asked to stop, or this run was superseded."""
+    _update_run(job, report=report.to_dict())
+    return None
+
+
+def _save_file_parsed(job: StudentImportJob, name: str) -> None:
+    """Record that the run is still going, as each of the job's files is parsed."""
+    _update_run(job)
+    return None
+
+
+def _save_files_progress(
+    job: StudentImportJob, reports: typing.List[typing.Tuple[str, ImportReport]]
+) -> None:
+    """Save the reports of the job's files, unless it was asked to stop."""
+    _update_run(job, report=get_files_report(reports))
+    return None
+
+
+def get_files_report(
+    reports: typing.List[typing.Tuple[str, ImportReport]]
+) -> typing.Dict[str, typing.Any]:
+    """Return the report of an import of several files, as saved on its job."""
+    data = ImportReport.combine(report for _, report in reports).to_dict()
+    data["files"] = [{"name": name, **report.to_dict()} for name, report in reports]
+    return data
+
+
+def _import_files(job: StudentImportJob, job_files: typing.List[StudentImportJobFile]) -> None:
+    # Files are copied locally, as parsing processes read them by path
+    with tempfile.TemporaryDirectory() as directory:
+        files = []
+        for index, job_file in enumerate(job_files):
+            _, extension = os.path.splitext(job_file.file_name)
+            path = os.path.join(directory, f"{index}{extension.lower()}")
+            with job_file.file.open("rb") as source, open(path, "wb") as target:
+                shutil.copyfileobj(source, target)
+            files.append((job_file.file_name, path))
+
+        import_students_from_files(
+            files,
+            max_processes=getattr(settings, "STUDENT_IMPORT_PARSE_PROCESSES", None),
+            progress=functools.partial(_save_files_progress, job),
+            parsed=functools.partial(_save_file_parsed, job),
+        )
+    return None
+
+
+def _finish(job: StudentImportJob, status: str, error: typing.Optional[str] = None) -> None:
+    StudentImportJob.objects.filter(pk=job.pk, attempt=job.attempt).update(
+        status=status,
+        error=error,
+        cancel_requested=False,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    return None
+
+
+def run_import_job(job_id) -> None:
+    """Run the import job, if it is still pending."""
+    close_old_connections()
+    try:
+        job = StudentImportJob.objects.filter(
+            pk=job_id, status=StudentImportJobStatus.PENDING
+        ).first()
+        if job is None:
+            return None
+        # Only one run claims each attempt, even if the job was queued more than once
+        claimed = StudentImportJob.objects.filter(
+            pk=job_id, status=StudentImportJobStatus.PENDING, attempt=job.attempt
+        ).update(
+            status=StudentImportJobStatus.RUNNING,
+            attempt=job.attempt + 1,
+            started_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        if not claimed:
+            return None
+
+        job.attempt += 1
+        job_files = list(job.files.all())
+        try:
+            if is_streamed(job_files):
+                with job_files[0].file.open("rb") as students_file:
+                    import_students_from_file(
+                        students_file,
+                        progress=functools.partial(_save_progress, job),
+                        report=ImportReport.from_dict(job.report),
+                    )
+            else:
+                _import_files(job, job_files)
+        except ImportSuperseded:
+            logger.info("Student import job %s was resumed by another run", job_id)
+        except ImportCancelled:
+            _finish(job, StudentImportJobStatus.CANCELLED)
+        except ValueError as exc:
+            _finish(job, StudentImportJobStatus.FAILED, error=str(exc))
+        except Exception as exc:
+            logger.exception("Student import job %s failed", job_id)
+            _finish(job, StudentImportJobStatus.FAILED, error=f"{type(exc).__name__}: {exc}")
+        else:
+            _finish(job, StudentImportJobStatus.COMPLETED)
+    finally:
+        connection.close()
+    return None
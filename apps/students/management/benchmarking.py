@@ -0,0 +1,127 @@
+"""Synthetic data, and baselines, used by the students benchmark commands."""
+
+import csv
+import io
+import random
+import re
+import typing
+import uuid
+
+from apps.students.forms import MATRICULATION_NUMBER_PATTERN
+from apps.students.models import AcademicLevel, Student
+
+
+CSV_HEADER = ("Timestamp", "Name", "Email", "Matriculation Number", "Level", "Department")
+
+
+def normalize_row(row: typing.Dict[str, str]) -> typing.Dict[str, typing.Any]:
+    """
+    Normalize the student details in the row, one value at a time,
+    as the importer did before rows were normalized column by column.
+
+    :raises ValueError: If the details are incomplete or invalid.
+    """
+    name = (row.get("name") or "").strip().title()
+    email = (row.get("email") or "").strip().lower()
+    matriculation_number = (
+        (row.get("matriculation_number") or "")
+        .strip()
+        .upper()
+        .replace("\\", "/")
+        .replace(" ", "")
+    )
+    if not (name and email and matriculation_number):
+        raise ValueError("Missing name, email or matriculation number")
+
+    # Remove all non-numeric characters from the level
+    level = re.sub(r"\D", "", row.get("level") or "")
+    try:
+        level = AcademicLevel(level)
+    except ValueError:
+        raise ValueError("Invalid level")
+
+    if not MATRICULATION_NUMBER_PATTERN.match(matriculation_number):
+        raise ValueError("Invalid matriculation number")
+
+    student_data = {
+        "name": name,
+        "email": email,
+        "matriculation_number": matriculation_number,
+        "level": level,
+    }
+    department = (row.get("department") or "").strip().title()
+    if department:
+        student_data["department"] = department
+    return student_data
+
+
+def generate_students_csv(
+    rows: int,
+    *,
+    existing: typing.Sequence[Student] = (),
+    duplicate_rate: float = 0.02,
+    invalid_rate: float = 0.01,
+) -> bytes:
+    """
+    Generate a student details CSV file shaped like the registry exports in `resources/`.
+
+    :param rows: Number of rows to generate.
+    :param existing: Existing students, whose details are repeated on
+        `duplicate_rate` of the rows.
+    :param duplicate_rate: Share of rows repeating the details of an earlier row,
+        and share of rows repeating the details of an existing student.
+    :param invalid_rate: Share of rows with an invalid level.
+    """
+    prefix = uuid.uuid4().hex[:6]
+    levels = [level.value for level in AcademicLevel]
+    output = io.StringIO()
+    writer = csv.writer(output, quoting=csv.QUOTE_ALL)
+    writer.writerow(CSV_HEADER)
+
+    written = []
+    for i in range(rows):
+        if written and random.random() < duplicate_rate:
+            writer.writerow(random.choice(written))
+            continue
+        if existing and random.random() < duplicate_rate:
+            student = random.choice(existing)
+            writer.writerow(
+                ("", student.name, student.email, student.matriculation_number, "100", "")
+            )
+            continue
+
+        level = "N/A" if random.random() < invalid_rate else f"{random.choice(levels)}lvl "
+        row = (
+            "2024/09/13 2:04:56 PM GMT+1",
+            f" student {prefix} {i} ",
+            f"Student.{prefix}.{i}@Benchmark.invalid ",
+            f"coet\\{i:07d}\\2024 ",
+            level,
+            "Chemical engineering ",
+        )
+        writer.writerow(row)
+        if len(written) < 1000:
+            written.append(row)
+    return output.getvalue().encode("utf-8")
+
+
+def create_benchmark_students(count: int, *, start: int = 0) -> typing.List[Student]:
+    """
+    Create `count` students.
+
+    :param start: Number of the first student. Students created in several
+        calls should be numbered apart, as their matriculation numbers must be unique.
+    """
+    prefix = uuid.uuid4().hex[:6]
+    return Student.objects.bulk_create(
+        [
+            Student(
+                name=f"Existing {i}",
+                email=f"existing.{prefix}.{i}@benchmark.invalid",
+                matriculation_number=f"COET/{i:07d}/1999",
+                level=AcademicLevel._100_LEVEL,
+            )
+            for i in range(start, start + count)
+        ],
+        batch_size=900,
+    )
@@ -0,0 +1,112 @@
+import csv
+import io
+import tracemalloc
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.test.utils import override_settings
+
+from apps.students.models import Student
+from apps.students.students_upload import (
+    _clean_field_name,
+    import_students_from_file,
+)
+from apps.students.management.benchmarking import (
+    create_benchmark_students,
+    generate_students_csv,
+    normalize_row,
+)
+from core.benchmarks import Stopwatch
+
+
+def probe_duplicates_per_row(content: bytes) -> int:
+    """The per-row duplicate probing the importer used to do, kept for comparison."""
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8")), skipinitialspace=True)
+    reader.fieldnames = [_clean_field_name(field) for field in reader.fieldnames]
+    duplicates = 0
+    for row in reader:
+        try:
+            student_data = normalize_row(row)
+        except ValueError:
+            continue
+        duplicates += Student.objects.filter(
+            models.Q(email=student_data["email"])
+            | models.Q(matriculation_number=student_data["matriculation_number"])
+        ).exists()
+    return duplicates
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries, without keeping them in memory."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark importing a synthetic student details CSV file. "
+        "All benchmark data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50_000)
+        parser.add_argument(
+            "--existing",
+            type=int,
+            default=5_000,
+            help="Number of students to create before importing.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--skip-per-row",
+            action="store_true",
+            help="Skip timing the per-row duplicate probing, which is slow on large files.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            existing = create_benchmark_students(options["existing"])
+            content = generate_students_csv(options["rows"], existing=existing)
+            self.stdout.write(
+                f"Generated {options['rows']} rows ({len(content) / 1024 / 1024:.1f} MiB)"
+            )
+
+            if not options["skip_per_row"]:
+                connection.queries_log.clear()
+                with Stopwatch() as stopwatch:
+                    probe_duplicates_per_row(content)
+                self.stdout.write(
+                    f"per-row probing: {stopwatch.elapsed:.2f}s (duplicate detection only)"
+                )
+
+            students_file = SimpleUploadedFile("students.csv", content)
+            query_counter = QueryCounter()
+            # Queries are not logged, so the log does not count towards memory use
+            with override_settings(DEBUG=False):
+                with transaction.atomic():
+                    with connection.execute_wrapper(query_counter), Stopwatch() as stopwatch:
+                        report = import_students_from_file(
+                            students_file, chunk_size=options["chunk_size"]
+                        )
+                    transaction.set_rollback(True)
+
+                # Import again to measure memory use, as tracing slows the import down
+                tracemalloc.start()
+                import_students_from_file(students_file, chunk_size=options["chunk_size"])
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            self.stdout.write(
+                f"chunked import: {stopwatch.elapsed:.2f}s, {query_counter.count} queries, "
+                f"{report.created} created, {report.skipped_count} skipped, "
+                f"peak memory {peak_memory / 1024 / 1024:.1f} MiB"
+            )
+            for reason, count in report.skipped_reasons().items():
+                self.stdout.write(f"  {reason}: {count}")
+
+            transaction.set_rollback(True)
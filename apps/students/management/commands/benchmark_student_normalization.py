@@ -0,0 +1,56 @@
+import csv
+import io
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.students.students_upload import _clean_field_name, _normalize_chunk
+from apps.students.management.benchmarking import generate_students_csv, normalize_row
+from core.benchmarks import Stopwatch
+
+
+def normalize_rows(fieldnames, rows):
+    """The row by row normalization, kept for comparison."""
+    valid_rows, invalid_rows = [], []
+    for line, values in rows:
+        try:
+            valid_rows.append((line, normalize_row(dict(zip(fieldnames, values)))))
+        except ValueError as exc:
+            invalid_rows.append((line, str(exc)))
+    return valid_rows, invalid_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark normalizing the rows of a synthetic student details CSV file, "
+        "row by row and column by column. Does not touch the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        content = generate_students_csv(options["rows"], invalid_rate=0.05)
+        reader = csv.reader(io.StringIO(content.decode("utf-8")), skipinitialspace=True)
+        fieldnames = [_clean_field_name(field) for field in next(reader)]
+        rows = [(reader.line_num, values) for values in reader]
+        chunk_size = options["chunk_size"]
+        chunks = [rows[start : start + chunk_size] for start in range(0, len(rows), chunk_size)]
+
+        results = {}
+        for name, normalize in (("row loop", normalize_rows), ("columnar", _normalize_chunk)):
+            valid_rows, invalid_rows = [], []
+            with Stopwatch() as stopwatch:
+                for chunk in chunks:
+                    valid, invalid = normalize(fieldnames, chunk)
+                    valid_rows.extend(valid)
+                    invalid_rows.extend(invalid)
+            results[name] = (stopwatch.elapsed, valid_rows, sorted(invalid_rows))
+            self.stdout.write(
+                f"{name}: {stopwatch.elapsed:.3f}s, "
+                f"{len(valid_rows)} valid, {len(invalid_rows)} invalid rows"
+            )
+
+        row_loop, columnar = results["row loop"], results["columnar"]
+        if row_loop[1:] != columnar[1:]:
+            raise CommandError("The normalizations disagree!")
+        self.stdout.write(f"Speedup: {row_loop[0] / columnar[0]:.2f}x")
@@ -0,0 +1,79 @@
+import typing
+from django.db import models
+from django.db.models.functions import Lower, Upper
+
+
+def _prefix_range(field: str, prefix: str) -> models.Q:
+    """
+    Match values of the field that start with `prefix`.
+
+    The prefix is also matched as a range of values, `prefix <= value < next prefix`,
+    which the field's index can be scanned on. `LIKE` lookups alone cannot use
+    the index on SQLite, where `LIKE` is case-insensitive.
+    """
+    next_prefix = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return models.Q(
+        **{
+            f"{field}__gte": prefix,
+            f"{field}__lt": next_prefix,
+            f"{field}__startswith": prefix,
+        }
+    )
+
+
+class StudentQuerySet(models.QuerySet):
+    def identified_by(self, email: str, matriculation_number: str):
+        """
+        Filter students by email and matriculation number, ignoring case.
+
+        Matches `LOWER(email)` and `UPPER(matriculation_number)`, which the
+        students' identity index is on, unlike `iexact` lookups, which cannot use it.
+        """
+        return self.alias(
+            email_lower=Lower("email"),
+            matriculation_number_upper=Upper("matriculation_number"),
+        ).filter(
+            email_lower=email.strip().lower(),
+            matriculation_number_upper=matriculation_number.strip().upper(),
+        )
+
+    def search(self, query: str):
+        """
+        Filter students whose name, email or matriculation number starts with the query.
+
+        The query is normalized like the details of imported students are,
+        so the search is case-insensitive.
+        """
+        query = query.strip()
+        if not query:
+            return self
+        return self.filter(
+            _prefix_range("name", query.title())
+            | _prefix_range("email", query.lower())
+            | _prefix_range(
+                "matriculation_number", query.upper().replace("\\", "/").replace(" ", "")
+            )
+        )
+
+    def seek(self, after: typing.Optional[typing.Tuple[str, typing.Any]] = None):
+        """
+        Order students by name and ID, starting after the given (name, ID), if any.
+
+        Pages of students are read off the (name, ID) index this way, unlike
+        with offsets, whose cost grows with the number of students skipped.
+
+        :param after: The (name, ID) of the last student of the previous page.
+        """
+        queryset = self.order_by("name", "id")
+        if after is None:
+            return queryset
+        name, student_id = after
+        # `name >= ?` is redundant, but lets the index be searched from the page's start
+        return queryset.filter(
+            models.Q(name__gt=name) | models.Q(name=name, id__gt=student_id),
+            name__gte=name,
+        )
+
+
+class StudentManager(models.Manager.from_queryset(StudentQuerySet)):
+    pass
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_job_files(apps, schema_editor):
+    StudentImportJob = apps.get_model("students", "StudentImportJob")
+    StudentImportJobFile = apps.get_model("students", "StudentImportJobFile")
+    StudentImportJobFile.objects.bulk_create(
+        StudentImportJobFile(job=job, file=job.file, file_name=job.file_name)
+        for job in StudentImportJob.objects.exclude(file="").iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0007_studentimportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentimportjob',
+            name='file_name',
+            field=models.CharField(help_text='Name of the imported file, or files.', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='studentimportjob',
+            name='report',
+            field=models.JSONField(blank=True, default=dict, help_text='Progress of the import, as of the last imported chunk of rows. Imports of several files also have the report of each file, under `files`.'),
+        ),
+        migrations.CreateModel(
+            name='StudentImportJobFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='student_imports/')),
+                ('file_name', models.CharField(max_length=255)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='students.studentimportjob')),
+            ],
+            options={
+                'verbose_name': 'Student import job file',
+                'verbose_name_plural': 'Student import job files',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(copy_job_files, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='studentimportjob',
+            name='file',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0008_studentimportjobfile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='student',
+            options={'ordering': ['name', 'id'], 'verbose_name': 'Student', 'verbose_name_plural': 'Students'},
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['name', 'id'], name='student_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['level', 'name', 'id'], name='student_level_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['department', 'name', 'id'], name='student_dept_name_id_idx'),
+        ),
+    ]
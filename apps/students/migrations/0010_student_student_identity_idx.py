@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:19
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0009_student_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(django.db.models.functions.text.Lower('email'), django.db.models.functions.text.Upper('matriculation_number'), name='student_identity_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0010_student_student_identity_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentimportjob',
+            name='attempt',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented each time the import is started, or resumed. Only the run of the latest attempt saves its progress.'),
+        ),
+    ]
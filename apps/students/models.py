@@ -1,7 +1,10 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Lower, Upper
 from django.utils.translation import gettext_lazy as _
 
+from .managers import StudentManager
+
 
 class AcademicLevel(models.TextChoices):
     """Model representing academic levels."""
@@ -32,11 +35,107 @@ class Student(models.Model):
     added_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = StudentManager()
+
     class Meta:
-        ordering = ["name", "email", "-level", "-added_at"]
+        ordering = ["name", "id"]
         verbose_name = _("Student")
         verbose_name_plural = _("Students")
         unique_together = ["email", "matriculation_number"]
+        indexes = [
+            # Supports the default ordering, and paging through students by it
+            models.Index(fields=["name", "id"], name="student_name_id_idx"),
+            models.Index(fields=["level", "name", "id"], name="student_level_name_id_idx"),
+            models.Index(
+                fields=["department", "name", "id"], name="student_dept_name_id_idx"
+            ),
+            # Supports case-insensitive lookups of students by their details
+            models.Index(
+                Lower("email"), Upper("matriculation_number"), name="student_identity_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.matriculation_number})"
+
+
+class StudentImportJobStatus(models.TextChoices):
+    PENDING = "pending", _("Pending")
+    RUNNING = "running", _("Running")
+    COMPLETED = "completed", _("Completed")
+    FAILED = "failed", _("Failed")
+    CANCELLED = "cancelled", _("Cancelled")
+
+
+class StudentImportJob(models.Model):
+    """Model representing the import of student details files, run in the background."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file_name = models.CharField(
+        max_length=255, help_text=_("Name of the imported file, or files.")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=StudentImportJobStatus.choices,
+        default=StudentImportJobStatus.PENDING,
+    )
+    report = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=_(
+            "Progress of the import, as of the last imported chunk of rows. "
+            "Imports of several files also have the report of each file, under `files`."
+        ),
+    )
+    error = models.TextField(null=True, blank=True)
+    cancel_requested = models.BooleanField(default=False)
+    attempt = models.PositiveIntegerField(
+        default=0,
+        help_text=_(
+            "Incremented each time the import is started, or resumed. "
+            "Only the run of the latest attempt saves its progress."
+        ),
+    )
+    created_by = models.ForeignKey(
+        "accounts.UserAccount", on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="+"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = _("Student import job")
+        verbose_name_plural = _("Student import jobs")
+
+    def __str__(self) -> str:
+        return f"Import of {self.file_name} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (
+            StudentImportJobStatus.COMPLETED,
+            StudentImportJobStatus.FAILED,
+            StudentImportJobStatus.CANCELLED,
+        )
+
+
+class StudentImportJobFile(models.Model):
+    """Model representing a file uploaded for a student import job."""
+
+    job = models.ForeignKey(
+        StudentImportJob, on_delete=models.CASCADE, related_name="files"
+    )
+    file = models.FileField(upload_to="student_imports/")
+    file_name = models.CharField(max_length=255)
+
+    class Meta:
+        ordering = ["id"]
+        verbose_name = _("Student import job file")
+        verbose_name_plural = _("Student import job files")
+
+    def __str__(self) -> str:
+        return self.file_name
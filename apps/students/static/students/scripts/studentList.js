@@ -0,0 +1,129 @@
+const studentListFilters = document.querySelector("#student-list-filters");
+const studentListTableBody = document.querySelector("#student-list-table tbody");
+const loadMoreStudentsButton = document.querySelector("#load-more-students-btn");
+
+const STUDENT_SEARCH_DELAY = 300;
+let studentSearchTimeout = null;
+// Discards responses of requests made before the filters last changed
+let studentListRequestId = 0;
+
+
+/**
+ * Creates a table cell with the given text.
+ */
+function createStudentCell(text) {
+    const cell = document.createElement("td");
+    cell.textContent = text;
+    return cell;
+};
+
+
+/**
+ * Appends rows for the given students to the students table.
+ */
+function appendStudentRows(students) {
+    let count = studentListTableBody.querySelectorAll("tr:not(.student-list-empty)").length;
+
+    students.forEach((student) => {
+        count += 1;
+        const row = document.createElement("tr");
+        row.append(
+            createStudentCell(count),
+            createStudentCell(student.matriculation_number),
+            createStudentCell(student.name),
+            createStudentCell(student.email),
+            createStudentCell(student.department),
+            createStudentCell(student.level),
+        );
+
+        const deleteLink = document.createElement("a");
+        deleteLink.href = student.delete_url;
+        deleteLink.title = `Delete ${student.name} (${student.matriculation_number})`;
+        deleteLink.className = "student-delete-btn";
+        deleteLink.style = "color: red; display: flex; align-items: center; justify-content: center;";
+        deleteLink.innerHTML = `
+            <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" style="fill: currentColor;">
+                <path d="M5 20a2 2 0 0 0 2 2h10a2 2 0 0 0 2-2V8h2V6h-4V4a2 2 0 0 0-2-2H9a2 2 0 0 0-2 2v2H3v2h2zM9 4h6v2H9zM8 8h9v12H7V8z"></path>
+                <path d="M9 10h2v8H9zm4 0h2v8h-2z"></path>
+            </svg>
+        `;
+        const actionsCell = document.createElement("td");
+        actionsCell.append(deleteLink);
+        row.append(actionsCell);
+        studentListTableBody.append(row);
+    });
+};
+
+
+/**
+ * Fetches a page of students matching the filters, and adds it to the table.
+ * The table is cleared first, unless a cursor is given.
+ */
+function loadStudents(cursor = null) {
+    const params = new URLSearchParams(new FormData(studentListFilters));
+    if (cursor) params.set("cursor", cursor);
+    const requestId = ++studentListRequestId;
+    loadMoreStudentsButton.disabled = true;
+
+    fetch(`${studentListFilters.dataset.url}?${params}`, { mode: 'same-origin' }).then((response) => {
+        return response.json().then((data) => {
+            if (!response.ok) throw new Error(data.detail ?? 'An error occurred!');
+            return data;
+        });
+    }).then((data) => {
+        if (requestId !== studentListRequestId) return;
+
+        if (!cursor) {
+            studentListTableBody.replaceChildren();
+            // Keep the filters in the page's URL, so they survive reloads
+            params.delete("cursor");
+            window.history.replaceState(null, "", `${studentListFilters.action}?${params}`);
+        };
+        appendStudentRows(data.students);
+        if (!studentListTableBody.children.length) {
+            const row = document.createElement("tr");
+            row.className = "student-list-empty";
+            const cell = createStudentCell("No students found.");
+            cell.colSpan = 7;
+            row.append(cell);
+            studentListTableBody.append(row);
+        };
+
+        loadMoreStudentsButton.dataset.cursor = data.next_cursor ?? "";
+        loadMoreStudentsButton.hidden = !data.next_cursor;
+        loadMoreStudentsButton.disabled = false;
+    }).catch((error) => {
+        loadMoreStudentsButton.disabled = false;
+        pushNotification("error", error.message ?? 'An error occurred!');
+    });
+};
+
+
+studentListFilters.addEventListener("input", (e) => {
+    clearTimeout(studentSearchTimeout);
+    const delay = e.target.type === "search" ? STUDENT_SEARCH_DELAY : 0;
+    studentSearchTimeout = setTimeout(() => loadStudents(), delay);
+});
+
+studentListFilters.addEventListener("submit", (e) => {
+    e.preventDefault();
+    clearTimeout(studentSearchTimeout);
+    loadStudents();
+});
+
+loadMoreStudentsButton.addEventListener("click", () => {
+    loadStudents(loadMoreStudentsButton.dataset.cursor);
+});
+
+
+// Add confirmation dialog to student delete buttons, including those of rows loaded later
+studentListTableBody.addEventListener("click", (e) => {
+    const deleteButton = e.target.closest(".student-delete-btn");
+    if (!deleteButton) return;
+
+    e.preventDefault();
+    let confirmDelete = confirm(`Are you sure you want to delete this student?`);
+    if (confirmDelete) {
+        window.location.href = deleteButton.href;
+    }
+});
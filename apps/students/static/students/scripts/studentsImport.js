@@ -73,13 +73,9 @@ studentsImportForm.onsubmit = function(e) {
 
             response.json().then((data) => {
                 pushNotification("success", data.detail ?? data.message ?? 'Request successful!');
-
-                const redirectURL  = data.redirect_url ?? null
-                if(!redirectURL) return;
-
-                setTimeout(() => {
-                    window.location.href = redirectURL;
-                }, 2000);
+                if (data.job) {
+                    pollImportJob(data.job);
+                };
             });
         }
     }).catch((error) => {
@@ -88,3 +84,53 @@ studentsImportForm.onsubmit = function(e) {
     });
 };
 
+
+
+const IMPORT_JOB_POLL_INTERVAL = 1000;
+
+/**
+ * Shows the progress of a student import job on the import button,
+ * polling the job's status until it finishes.
+ */
+function pollImportJob(job) {
+    studentsImportButton.textContent = `Imported ${job.rows} rows (${job.created} new, ${job.skipped} skipped)...`;
+
+    if (job.is_finished) {
+        studentsImportButton.textContent = "Import";
+        if (job.status === "completed") {
+            let detail = `${job.created} new students were found and imported!`;
+            if (job.skipped) detail += ` ${job.skipped} rows were skipped.`;
+            if (job.failed) detail += ` ${job.failed} rows could not be saved.`;
+            pushNotification("success", detail);
+            if (job.files.length > 1) {
+                job.files.forEach((file) => {
+                    if (file.error) {
+                        pushNotification("error", `${file.name}: ${file.error}`);
+                    } else {
+                        pushNotification("info", `${file.name}: ${file.created} new, ${file.skipped} skipped.`);
+                    };
+                });
+            };
+            setTimeout(() => {
+                window.location.href = job.redirect_url;
+            }, 2000);
+        } else {
+            studentsImportButton.disabled = false;
+            pushNotification("error", job.error ?? `Import ${job.status} after ${job.rows} rows.`);
+        };
+        return;
+    };
+
+    setTimeout(() => {
+        fetch(job.status_url, { mode: 'same-origin' }).then((response) => {
+            if (!response.ok) throw new Error("Could not check the import's progress");
+            return response.json();
+        }).then((data) => {
+            pollImportJob(data.job);
+        }).catch((error) => {
+            studentsImportButton.textContent = "Import";
+            studentsImportButton.disabled = false;
+            pushNotification("error", error.message ?? 'An error occurred!');
+        });
+    }, IMPORT_JOB_POLL_INTERVAL);
+};
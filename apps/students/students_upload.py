@@ -1,11 +1,21 @@
 import csv
 import io
+import itertools
+import multiprocessing
+import os
 import re
+import shutil
+import tempfile
 import typing
+import zipfile
+import django
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from django.core.files import File
-from django.db import models
+from django.db import IntegrityError, transaction
 
 from .models import Student, AcademicLevel
+from .forms import MATRICULATION_NUMBER_PATTERN
 
 EXPECTED_DETAIL_COLUMNS = (
     "name",
@@ -14,6 +24,105 @@ EXPECTED_DETAIL_COLUMNS = (
     "level",
 )
 
+# Keeps the number of parameters per query under SQLite's limit
+EXISTING_DETAILS_QUERY_CHUNK_SIZE = 900
+
+STUDENT_FILE_EXTENSIONS = (".csv", ".xlsx")
+
+# Total uncompressed size of the student details files a zip archive may contain
+MAX_ARCHIVE_SIZE = 200 * 1024 * 1024
+
+# (line number, values) of rows of a student details file
+Rows = typing.List[typing.Tuple[int, typing.List[str]]]
+
+
+class SkippedRow(typing.NamedTuple):
+    """A row of the student details file that was not imported."""
+
+    line: int
+    reason: str
+
+
+class ImportReport:
+    """
+    Outcome of importing a student details file.
+
+    Only the first `max_skipped_rows` skipped rows are kept,
+    so the report's size does not grow with the file's.
+    """
+
+    max_skipped_rows = 1000
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.error: typing.Optional[str] = None
+        self.skipped: typing.List[SkippedRow] = []
+        self.skipped_count = 0
+        self._skipped_reasons: typing.Dict[str, int] = {}
+
+    def skip(self, line: int, reason: str) -> None:
+        self.skipped_count += 1
+        self._skipped_reasons[reason] = self._skipped_reasons.get(reason, 0) + 1
+        self._add_skipped_row(line, reason)
+        return None
+
+    def fail(self, line: int, reason: str) -> None:
+        """Record a valid row that could not be saved."""
+        self.failed += 1
+        self._add_skipped_row(line, reason)
+        return None
+
+    def _add_skipped_row(self, line: int, reason: str) -> None:
+        if len(self.skipped) < self.max_skipped_rows:
+            self.skipped.append(SkippedRow(line, reason))
+        return None
+
+    def skipped_reasons(self) -> typing.Dict[str, int]:
+        """Return the number of skipped rows per reason."""
+        return dict(self._skipped_reasons)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "skipped": self.skipped_count,
+            "failed": self.failed,
+            "error": self.error,
+            "skipped_reasons": self.skipped_reasons(),
+            "skipped_rows": [skipped_row._asdict() for skipped_row in self.skipped],
+        }
+
+    @classmethod
+    def combine(cls, reports: typing.Iterable["ImportReport"]) -> "ImportReport":
+        """Return a report totalling the given reports. Their skipped rows are not kept."""
+        combined = cls()
+        for report in reports:
+            combined.rows += report.rows
+            combined.created += report.created
+            combined.failed += report.failed
+            combined.skipped_count += report.skipped_count
+            for reason, count in report._skipped_reasons.items():
+                combined._skipped_reasons[reason] = (
+                    combined._skipped_reasons.get(reason, 0) + count
+                )
+        return combined
+
+    @classmethod
+    def from_dict(cls, data: typing.Dict[str, typing.Any]) -> "ImportReport":
+        report = cls()
+        report.rows = data.get("rows", 0)
+        report.created = data.get("created", 0)
+        report.skipped_count = data.get("skipped", 0)
+        report.failed = data.get("failed", 0)
+        report.error = data.get("error")
+        report._skipped_reasons = dict(data.get("skipped_reasons", {}))
+        report.skipped = [
+            SkippedRow(**skipped_row) for skipped_row in data.get("skipped_rows", [])
+        ]
+        return report
+
 
 def _clean_field_name(name: str) -> str:
     # Strip leading/trailing spaces and replace spaces with underscores
@@ -26,54 +135,602 @@ def _clean_field_name(name: str) -> str:
     return name.rstrip("_")
 
 
-def import_students_from_file(students_file: File) -> typing.List[Student]:
+_match_matriculation_number = np.frompyfunc(
+    lambda value: MATRICULATION_NUMBER_PATTERN.match(value) is not None, 1, 1
+)
+
+
+def _to_array(
+    values: typing.Sequence[str], case: typing.Optional[str] = None
+) -> np.ndarray:
     """
-    Import student details from a CSV file.
+    Return the stripped values as an array.
 
-    Use details to create students
+    :param case: Name of the `np.strings` function, "title", "lower" or "upper",
+        used to convert the values' case.
     """
-    string_io = io.StringIO(students_file.read().decode("utf-8"))
-    reader = csv.DictReader(string_io, skipinitialspace=True)
-    reader.fieldnames = [_clean_field_name(field) for field in reader.fieldnames]
-    print(reader.fieldnames)
+    array = np.strings.strip(np.array(values, dtype=np.str_))
+    return getattr(np.strings, case)(array) if case else array
 
-    # Ensure all expected columns are present in the DataFrame
-    missing_columns = set(EXPECTED_DETAIL_COLUMNS) - set(reader.fieldnames)
-    if missing_columns:
-        raise ValueError(
-            f"Missing columns in student details file: {', '.join(missing_columns)}"
-        )
 
-    new_students = []
-    for row in reader:
-        data = {col: row[col] for col in EXPECTED_DETAIL_COLUMNS}
+def _contains_nul(columns: typing.Iterable[typing.Sequence[str]], size: int) -> np.ndarray:
+    """Return whether each row has a value containing a NUL character."""
+    contains_nul = np.zeros(size, dtype=bool)
+    for column in columns:
+        # Checked on the strings, as NumPy drops trailing NUL characters
+        if "\0" in "".join(column):
+            contains_nul |= np.array(["\0" in value for value in column], dtype=bool)
+    return contains_nul
+
+
+def _normalize_chunk(
+    fieldnames: typing.Sequence[str], rows: Rows
+) -> typing.Tuple[
+    typing.List[typing.Tuple[int, typing.Dict[str, typing.Any]]],
+    typing.List[typing.Tuple[int, str]],
+]:
+    """
+    Normalize the student details in a chunk of rows, column by column.
+
+    Values are stripped. Names and departments are title cased, emails lower
+    cased, and matriculation numbers upper cased, with backslashes replaced by
+    slashes and spaces removed. Non-numeric characters are removed from levels.
 
-        name: str = data["name"]
-        email: str = data["email"]
-        matriculation_number: str = data["matriculation_number"]
-        level: str = data["level"]
-        # Remove all non-numeric characters from the level
-        level = re.sub(r"\D", "", level)
-        department: typing.Optional[str] = data.get("department", None)
+    Rows with a value containing a NUL character, missing a name, email or
+    matriculation number, or with an invalid level or matriculation number are
+    invalid. The cleaning and validation run over whole columns, as NumPy array
+    operations.
 
+    :param fieldnames: Names of the rows' columns.
+    :param rows: (line, values) of the rows. Each row has a value for every column.
+    :return: A tuple of the (line, student data) of valid rows,
+        and the (line, reason) of invalid rows.
+    """
+    if not rows:
+        return [], []
+
+    lines, records = zip(*rows)
+    empty = ("",) * len(rows)
+    columns = dict(zip(fieldnames, zip(*records)))
+
+    names = _to_array(columns["name"], case="title")
+    emails = _to_array(columns["email"], case="lower")
+    matriculation_numbers = np.strings.replace(
+        np.strings.replace(
+            _to_array(columns["matriculation_number"], case="upper"), "\\", "/"
+        ),
+        " ",
+        "",
+    )
+    departments = _to_array(columns.get("department", empty), case="title")
+
+    # Level columns hold a handful of distinct spellings ("100", "100lvl", "100 Level"...),
+    # so non-numeric characters are removed from the distinct values only
+    distinct_levels, level_indices = np.unique(
+        np.array(columns["level"], dtype=np.str_), return_inverse=True
+    )
+    levels = np.array(
+        [re.sub(r"\D", "", level) for level in distinct_levels.tolist()], dtype=np.str_
+    )[level_indices]
+
+    missing = (
+        (np.strings.str_len(names) == 0)
+        | (np.strings.str_len(emails) == 0)
+        | (np.strings.str_len(matriculation_numbers) == 0)
+    )
+    # The csv module allows NUL characters, which some databases cannot store
+    invalid_value = _contains_nul(columns.values(), len(rows))
+    invalid_level = ~np.isin(levels, AcademicLevel.values)
+    invalid_matriculation_number = ~_match_matriculation_number(
+        matriculation_numbers
+    ).astype(bool)
+    invalid = invalid_value | missing | invalid_level | invalid_matriculation_number
+
+    invalid_rows = []
+    for index in np.flatnonzero(invalid).tolist():
+        if invalid_value[index]:
+            reason = "Invalid value"
+        elif missing[index]:
+            reason = "Missing name, email or matriculation number"
+        elif invalid_level[index]:
+            reason = "Invalid level"
+        else:
+            reason = "Invalid matriculation number"
+        invalid_rows.append((lines[index], reason))
+
+    valid_rows = []
+    valid_indices = np.flatnonzero(~invalid)
+    valid_columns = zip(
+        valid_indices.tolist(),
+        names[valid_indices].tolist(),
+        emails[valid_indices].tolist(),
+        matriculation_numbers[valid_indices].tolist(),
+        levels[valid_indices].tolist(),
+        departments[valid_indices].tolist(),
+    )
+    for index, name, email, matriculation_number, level, department in valid_columns:
         student_data = {
-            "name": name.strip().title(),
-            "email": email.strip().lower(),
-            "matriculation_number": matriculation_number.strip()
-            .upper()
-            .replace("\\", "/"),
-            "level": AcademicLevel(str(level).strip()),
+            "name": name,
+            "email": email,
+            "matriculation_number": matriculation_number,
+            "level": level,
         }
         if department:
-            student_data["department"] = department.strip().title()
+            student_data["department"] = department
+        valid_rows.append((lines[index], student_data))
+    return valid_rows, invalid_rows
+
+
+def _find_existing(field: str, values: typing.Collection[str]) -> typing.Set[str]:
+    """Return the values of the given `Student` field that already exist, probed in chunks."""
+    values = list(values)
+    existing = set()
+    for start in range(0, len(values), EXISTING_DETAILS_QUERY_CHUNK_SIZE):
+        chunk = values[start : start + EXISTING_DETAILS_QUERY_CHUNK_SIZE]
+        existing.update(
+            Student.objects.filter(**{f"{field}__in": chunk}).values_list(
+                field, flat=True
+            )
+        )
+    return existing
+
+
+def _iter_lines(students_file: File, encoding: str = "utf-8-sig") -> typing.Iterator[str]:
+    """
+    Lazily decode the file into lines, keeping line endings.
+
+    Lines are split on newlines only, leaving the rest,
+    like newlines in quoted values, to the csv module.
+    """
+    students_file.seek(0)
+    lines = io.TextIOWrapper(students_file, encoding=encoding, newline="")
+    try:
+        # Not `yield from`, which would close the wrapper, and so the file, if closed early
+        for line in lines:
+            yield line
+    finally:
+        # So that the file is not closed along with the wrapper
+        lines.detach()
+
 
+def _import_chunk(
+    fieldnames: typing.Sequence[str],
+    rows: Rows,
+    report: ImportReport,
+    progress: typing.Optional[typing.Callable[[ImportReport], None]] = None,
+) -> None:
+    """
+    Validate, dedupe and create the students in a chunk of rows, in one transaction.
+
+    `progress` is called within the transaction, so progress it records
+    is committed, or rolled back, with the chunk.
+    """
+    valid_rows: typing.List[typing.Tuple[int, typing.Dict[str, typing.Any]]] = []
+    emails = set()
+    matriculation_numbers = set()
+    normalized_rows, invalid_rows = _normalize_chunk(fieldnames, rows)
+    for line, reason in invalid_rows:
+        report.skip(line, reason)
+
+    for line, student_data in normalized_rows:
+        # Skip students whose email or matriculation number appeared earlier in the chunk.
+        # Those that appeared in earlier chunks are found in the database below.
+        if student_data["email"] in emails:
+            report.skip(line, "Duplicate email in file")
+            continue
+        if student_data["matriculation_number"] in matriculation_numbers:
+            report.skip(line, "Duplicate matriculation number in file")
+            continue
+
+        emails.add(student_data["email"])
+        matriculation_numbers.add(student_data["matriculation_number"])
+        valid_rows.append((line, student_data))
+
+    with transaction.atomic():
         # Skip students whose email or matriculation number already exists
-        if Student.objects.filter(
-            models.Q(email=email) | models.Q(matriculation_number=matriculation_number)
-        ).exists():
+        existing_emails = _find_existing("email", emails)
+        existing_matriculation_numbers = _find_existing(
+            "matriculation_number", matriculation_numbers
+        )
+
+        new_students = []
+        student_lines = {}
+        for line, student_data in valid_rows:
+            if student_data["email"] in existing_emails:
+                report.skip(line, "Email already exists")
+            elif student_data["matriculation_number"] in existing_matriculation_numbers:
+                report.skip(line, "Matriculation number already exists")
+            else:
+                new_students.append(Student(**student_data))
+                student_lines[student_data["email"]] = line
+
+        try:
+            with transaction.atomic():
+                Student.objects.bulk_create(new_students, batch_size=998)
+        except IntegrityError as exc:
+            # Students with the same details were created concurrently
+            for student in new_students:
+                report.fail(student_lines[student.email], f"Could not be saved: {exc}")
+        else:
+            report.created += len(new_students)
+
+        if progress:
+            progress(report)
+    return None
+
+
+def _check_columns(raw_fieldnames: typing.Iterable[typing.Any]) -> typing.List[str]:
+    """
+    Clean the header of a student details file.
+
+    :raises ValueError: If any expected column is missing.
+    """
+    fieldnames = [_clean_field_name(str(field or "")) for field in raw_fieldnames]
+
+    # Ensure all expected columns are present in the file
+    missing_columns = set(EXPECTED_DETAIL_COLUMNS) - set(fieldnames)
+    if missing_columns:
+        raise ValueError(
+            f"Missing columns in student details file: {', '.join(sorted(missing_columns))}"
+        )
+    return fieldnames
+
+
+def _iter_rows(
+    records: typing.Iterable[typing.Tuple[int, typing.List[str]]], columns_count: int
+) -> typing.Iterator[typing.Tuple[int, typing.List[str]]]:
+    """Yield the non-empty records, padded or trimmed to `columns_count` values."""
+    for line, values in records:
+        if not any(values):
             continue
-        
-        student = Student(**student_data)
-        new_students.append(student)
+        if len(values) != columns_count:
+            # Pad short rows, and trim long ones, to the header's columns
+            values = (values + [""] * columns_count)[:columns_count]
+        yield line, values
+
+
+def _read_csv(
+    students_file: File,
+) -> typing.Tuple[typing.List[str], typing.Iterator[typing.Tuple[int, typing.List[str]]]]:
+    """
+    Lazily read the rows of a CSV student details file.
+
+    :return: A tuple of the file's cleaned column names, and an iterator of its (line, values).
+    :raises ValueError: If any expected column is missing.
+    """
+    reader = csv.reader(_iter_lines(students_file), skipinitialspace=True)
+    fieldnames = _check_columns(next(reader, []))
+    records = ((reader.line_num, values) for values in reader)
+    return fieldnames, _iter_rows(records, len(fieldnames))
+
+
+def _cell_to_str(value: typing.Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Numeric cells, like levels, are read as floats, e.g. 100.0
+        return str(int(value))
+    return str(value)
+
+
+def _read_xlsx(
+    path: str,
+) -> typing.Iterator[
+    typing.Tuple[str, typing.List[str], typing.Iterator[typing.Tuple[int, typing.List[str]]]]
+]:
+    """
+    Lazily read the rows of each sheet of an Excel student details workbook.
+
+    :return: An iterator of the sheets' (title, cleaned column names, rows iterator).
+        Sheets with missing columns are yielded with the `ValueError` raised
+        for them, in place of their column names.
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        raise ValueError("Excel files cannot be imported. Install `openpyxl` to enable them.")
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            try:
+                fieldnames = _check_columns(next(rows, ()))
+            except ValueError as exc:
+                yield sheet.title, exc, iter(())
+                continue
+
+            records = (
+                (line, [_cell_to_str(value) for value in values])
+                for line, values in enumerate(rows, start=2)
+            )
+            yield sheet.title, fieldnames, _iter_rows(records, len(fieldnames))
+    finally:
+        workbook.close()
+
+
+def _chunked(
+    iterable: typing.Iterable[typing.Any], size: int
+) -> typing.Iterator[typing.List[typing.Any]]:
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_students_from_file(
+    students_file: File,
+    *,
+    chunk_size: int = 1000,
+    progress: typing.Optional[typing.Callable[[ImportReport], None]] = None,
+    report: typing.Optional[ImportReport] = None,
+) -> ImportReport:
+    """
+    Import student details from a CSV file.
+
+    Use details to create students. The file is streamed and its rows are
+    imported in chunks of `chunk_size`, each in its own transaction,
+    so memory use does not grow with the file's size.
+
+    Rows with invalid details, or whose email or matriculation number already
+    exists, in the database or on an earlier row of the file, are skipped and reported.
+
+    :param students_file: The CSV file to import.
+    :param chunk_size: Number of rows imported per transaction.
+    :param progress: Called with the import report in each chunk's transaction,
+        after the chunk's students are created. Exceptions it raises roll back the
+        chunk and stop the import.
+    :param report: Report of an earlier, interrupted import of the same file.
+        The import resumes after the rows it covers.
+    :return: The import report.
+    """
+    fieldnames, rows = _read_csv(students_file)
+    report = report or ImportReport()
+    # Skip the rows imported before the import was interrupted
+    rows = itertools.islice(rows, report.rows, None)
+
+    for chunk in _chunked(rows, chunk_size):
+        report.rows += len(chunk)
+        _import_chunk(fieldnames, chunk, report, progress)
+    return report
+
+
+class ParsedFile(typing.NamedTuple):
+    """Normalized rows of a student details file, or of a sheet of a workbook."""
+
+    name: str
+    report: ImportReport
+    rows: typing.List[typing.Tuple[int, typing.Dict[str, typing.Any]]]
+
+
+def _parse_rows(
+    parsed_file: ParsedFile,
+    fieldnames: typing.Sequence[str],
+    rows: typing.Iterable[typing.Tuple[int, typing.List[str]]],
+    chunk_size: int,
+) -> None:
+    report = parsed_file.report
+    for chunk in _chunked(rows, chunk_size):
+        report.rows += len(chunk)
+        valid_rows, invalid_rows = _normalize_chunk(fieldnames, chunk)
+        for line, reason in invalid_rows:
+            report.skip(line, reason)
+        parsed_file.rows.extend(valid_rows)
+    return None
+
+
+def parse_students_file(
+    name: str, path: str, *, chunk_size: int = 1000
+) -> typing.List[ParsedFile]:
+    """
+    Read and normalize the rows of a CSV file, or of each sheet of an Excel workbook.
+    Does not touch the database, so it can run in another process.
+
+    Files, or sheets, that cannot be read are returned with an `error` in their report.
+
+    :param name: Name the file is reported under.
+    :param path: Path of the file.
+    :param chunk_size: Number of rows normalized at a time.
+    :return: The parsed file, or the parsed sheets of the workbook.
+    """
+    parsed_files = []
+    try:
+        if name.lower().endswith(".xlsx"):
+            for title, fieldnames, rows in _read_xlsx(path):
+                parsed_file = ParsedFile(f"{name} ({title})", ImportReport(), [])
+                parsed_files.append(parsed_file)
+                if isinstance(fieldnames, ValueError):
+                    parsed_file.report.error = str(fieldnames)
+                else:
+                    _parse_rows(parsed_file, fieldnames, rows, chunk_size)
+        else:
+            parsed_file = ParsedFile(name, ImportReport(), [])
+            parsed_files.append(parsed_file)
+            with File(open(path, "rb")) as students_file:
+                fieldnames, rows = _read_csv(students_file)
+                _parse_rows(parsed_file, fieldnames, rows, chunk_size)
+    except Exception as exc:
+        if not parsed_files:
+            parsed_files.append(ParsedFile(name, ImportReport(), []))
+        parsed_file = parsed_files[-1]
+        parsed_file.report.error = (
+            str(exc) if isinstance(exc, ValueError) else f"Could not be read: {exc}"
+        )
+        parsed_file.rows.clear()
+    return parsed_files
+
+
+def _extract_archive(path: str, name: str, directory: str) -> typing.List[typing.Tuple[str, str]]:
+    """
+    Extract the CSV and Excel files in a zip archive into `directory`.
+
+    :return: The (name, path) of the extracted files.
+    :raises ValueError: If the archive is invalid or too large.
+    """
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile:
+        raise ValueError(f"{name} is not a valid zip file")
+
+    with archive:
+        members = [
+            member
+            for member in archive.infolist()
+            if not member.is_dir()
+            and not member.filename.startswith("__MACOSX/")
+            and member.filename.lower().endswith(STUDENT_FILE_EXTENSIONS)
+        ]
+        if not members:
+            raise ValueError(f"{name} does not contain any CSV or Excel files")
+        if sum(member.file_size for member in members) > MAX_ARCHIVE_SIZE:
+            raise ValueError(f"{name} is too large to import")
+
+        extracted = []
+        for index, member in enumerate(members):
+            # Members are extracted under generated names, so their paths cannot escape `directory`
+            _, extension = os.path.splitext(member.filename)
+            member_path = os.path.join(directory, f"{index}{extension.lower()}")
+            with archive.open(member) as source, open(member_path, "wb") as target:
+                shutil.copyfileobj(source, target)
+            extracted.append((f"{name}/{member.filename}", member_path))
+    return extracted
+
+
+def import_students_from_files(
+    files: typing.Sequence[typing.Tuple[str, str]],
+    *,
+    max_processes: typing.Optional[int] = None,
+    progress: typing.Optional[
+        typing.Callable[[typing.List[typing.Tuple[str, ImportReport]]], None]
+    ] = None,
+    parsed: typing.Optional[typing.Callable[[str], None]] = None,
+) -> typing.List[typing.Tuple[str, ImportReport]]:
+    """
+    Import student details from several CSV or Excel files, or zip archives of them.
+
+    The files are parsed in parallel, in a pool of processes. Their rows are then
+    merged, deduped across files, and the new students created in one transaction.
+
+    :param files: The (name, path) of the files.
+    :param max_processes: Maximum number of processes parsing files.
+    :param progress: Called with the files' reports in the transaction the students
+        are created in. Exceptions it raises roll back the import.
+    :param parsed: Called with the name of each file, as soon as it is parsed.
+        Exceptions it raises stop the import, before any student is created.
+    :return: The (name, report) of each file, and of each sheet of Excel files.
+        Files that could not be read have a report with an `error`.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        expanded: typing.List[typing.Union[typing.Tuple[str, str], ParsedFile]] = []
+        for name, path in files:
+            if not name.lower().endswith(".zip"):
+                expanded.append((name, path))
+                continue
+            try:
+                expanded.extend(_extract_archive(path, name, directory))
+            except ValueError as exc:
+                report = ImportReport()
+                report.error = str(exc)
+                expanded.append(ParsedFile(name, report, []))
+
+        to_parse = [item for item in expanded if not isinstance(item, ParsedFile)]
+        processes = min(len(to_parse), max_processes or os.cpu_count() or 1)
+        if processes > 1:
+            # Processes are spawned, rather than forked from a process that runs threads.
+            # Django is set up before this module, which imports models, is loaded in them.
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            ) as executor:
+                futures = {
+                    executor.submit(parse_students_file, name, path): index
+                    for index, (name, path) in enumerate(to_parse)
+                }
+                results: typing.List[typing.List[ParsedFile]] = [[]] * len(to_parse)
+                try:
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        results[index] = future.result()
+                        if parsed:
+                            parsed(to_parse[index][0])
+                except BaseException:
+                    # Skip the files whose parsing has not started yet
+                    for future in futures:
+                        future.cancel()
+                    raise
+        else:
+            results = []
+            for name, path in to_parse:
+                results.append(parse_students_file(name, path))
+                if parsed:
+                    parsed(name)
+
+    parsed_files: typing.List[ParsedFile] = []
+    parsed_iter = iter(results)
+    for item in expanded:
+        if isinstance(item, ParsedFile):
+            parsed_files.append(item)
+        else:
+            parsed_files.extend(next(parsed_iter))
+
+    # Skip students whose email or matriculation number appeared
+    # earlier in the same file, or in an earlier file
+    emails: typing.Dict[str, ImportReport] = {}
+    matriculation_numbers: typing.Dict[str, ImportReport] = {}
+    merged_rows = []
+    for parsed_file in parsed_files:
+        report = parsed_file.report
+        for line, student_data in parsed_file.rows:
+            email = student_data["email"]
+            matriculation_number = student_data["matriculation_number"]
+            if email in emails:
+                where = "file" if emails[email] is report else "upload"
+                report.skip(line, f"Duplicate email in {where}")
+            elif matriculation_number in matriculation_numbers:
+                where = "file" if matriculation_numbers[matriculation_number] is report else "upload"
+                report.skip(line, f"Duplicate matriculation number in {where}")
+            else:
+                emails[email] = report
+                matriculation_numbers[matriculation_number] = report
+                merged_rows.append((report, line, student_data))
+        # The rows are no longer needed once merged
+        parsed_file.rows.clear()
+
+    reports = [(parsed_file.name, parsed_file.report) for parsed_file in parsed_files]
+    with transaction.atomic():
+        # Skip students whose email or matriculation number already exists
+        existing_emails = _find_existing("email", emails)
+        existing_matriculation_numbers = _find_existing(
+            "matriculation_number", matriculation_numbers
+        )
+
+        new_students = []
+        student_rows = []
+        for report, line, student_data in merged_rows:
+            if student_data["email"] in existing_emails:
+                report.skip(line, "Email already exists")
+            elif student_data["matriculation_number"] in existing_matriculation_numbers:
+                report.skip(line, "Matriculation number already exists")
+            else:
+                new_students.append(Student(**student_data))
+                student_rows.append((report, line))
+
+        try:
+            with transaction.atomic():
+                Student.objects.bulk_create(new_students, batch_size=998)
+        except IntegrityError as exc:
+            # Students with the same details were created concurrently
+            for report, line in student_rows:
+                report.fail(line, f"Could not be saved: {exc}")
+        else:
+            for report, _ in student_rows:
+                report.created += 1
 
-    return Student.objects.bulk_create(new_students, batch_size=998)
+        if progress:
+            progress(reports)
+    return reports
@@ -0,0 +1,36 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from apps.students.models import Student
+from apps.students.students_upload import import_students_from_file
+
+
+class StudentImportTests(TestCase):
+    """Student details files are imported row by row, skipping invalid rows."""
+
+    def import_csv(self, content: str):
+        return import_students_from_file(
+            SimpleUploadedFile("students.csv", content.encode())
+        )
+
+    def test_value_with_nul_character(self):
+        report = self.import_csv(
+            "Name,Email,Matriculation Number,Level\n"
+            "ada lovelace,ADA@example.com,cos/1234567/2019,100 Level\n"
+            "grace\0hopper,grace@example.com,COS/7654321/2019,200\n"
+            "alan turing,alan@example.com,COS/1111111/2019,300\n"
+        )
+
+        self.assertEqual(report.error, None)
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.skipped_reasons(), {"Invalid value": 1})
+        self.assertEqual([skipped.line for skipped in report.skipped], [3])
+        self.assertQuerySetEqual(
+            Student.objects.order_by("name").values_list(
+                "name", "email", "matriculation_number", "level"
+            ),
+            [
+                ("Ada Lovelace", "ada@example.com", "COS/1234567/2019", "100"),
+                ("Alan Turing", "alan@example.com", "COS/1111111/2019", "300"),
+            ],
+        )
@@ -7,7 +7,23 @@ app_name = "students"
 
 urlpatterns = [
     path("", views.students_list_view, name="student_list"),
+    path("data/", views.student_list_data_view, name="student_list_data"),
     path("new/", views.student_add_view, name="new_student"),
     path("import/", views.student_import_view, name="import_students"),
+    path(
+        "import/jobs/<uuid:job_id>/",
+        views.student_import_job_status_view,
+        name="import_job_status",
+    ),
+    path(
+        "import/jobs/<uuid:job_id>/cancel/",
+        views.student_import_job_cancel_view,
+        name="cancel_import_job",
+    ),
+    path(
+        "import/jobs/<uuid:job_id>/resume/",
+        views.student_import_job_resume_view,
+        name="resume_import_job",
+    ),
     path("delete/<uuid:student_id>/", views.student_delete_view, name="delete_student"),
 ]
@@ -1,6 +1,7 @@
 import typing
 import json
 import os
+from django.core import signing
 from django.db import transaction
 from django.views import generic
 from django.http import JsonResponse
@@ -9,30 +10,137 @@ from django.shortcuts import redirect, get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin
 
 from helpers.exceptions import capture
-from .models import Student, AcademicLevel
+from .models import Student, AcademicLevel, StudentImportJob
 from .forms import StudentForm
-from .students_upload import import_students_from_file
+from .students_upload import ImportReport
+from .import_jobs import (
+    can_resume,
+    cancel_import_job,
+    create_import_job,
+    resume_import_job,
+)
 from apps.accounts.access_mixins import AdminOnlyMixin
 from apps.elections.access_mixins import ElectionNotOngoingMixin
 
 students_qs = Student.objects.all()
 
+STUDENTS_PAGE_SIZE = 100
+MAX_STUDENTS_PAGE_SIZE = 500
+STUDENTS_CURSOR_SALT = "students.list.cursor"
 
-class StudentListView(AdminOnlyMixin, LoginRequiredMixin, generic.ListView):
-    """View for displaying a list of students."""
 
-    queryset = students_qs
+def get_students_page(
+    params: typing.Mapping[str, str],
+) -> typing.Tuple[typing.List[Student], typing.Optional[str]]:
+    """
+    Return a page of students, filtered by the given query parameters,
+    and the cursor of the next page, if any.
+
+    Supported parameters are `q`, a prefix of the students' name, email or
+    matriculation number, `level`, `department`, `cursor` and `page_size`.
+
+    :raises ValueError: If the cursor or page size is invalid.
+    """
+    try:
+        page_size = min(
+            int(params.get("page_size") or STUDENTS_PAGE_SIZE), MAX_STUDENTS_PAGE_SIZE
+        )
+    except ValueError:
+        raise ValueError("Invalid page size")
+    if page_size < 1:
+        raise ValueError("Invalid page size")
+
+    after = None
+    if params.get("cursor"):
+        try:
+            name, student_id = signing.loads(params["cursor"], salt=STUDENTS_CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        after = (name, student_id)
+
+    queryset = students_qs.search(params.get("q", ""))
+    if params.get("level"):
+        queryset = queryset.filter(level=params["level"])
+    if params.get("department"):
+        queryset = queryset.filter(department=params["department"])
+
+    # Fetch one more student than the page size, to know if there is a next page
+    students = list(queryset.seek(after)[: page_size + 1])
+    next_cursor = None
+    if len(students) > page_size:
+        students = students[:page_size]
+        last_student = students[-1]
+        next_cursor = signing.dumps(
+            [last_student.name, str(last_student.id)], salt=STUDENTS_CURSOR_SALT
+        )
+    return students, next_cursor
+
+
+class StudentListView(AdminOnlyMixin, LoginRequiredMixin, generic.TemplateView):
+    """View for displaying a list of students, a page at a time."""
+
     template_name = "students/student_list.html"
-    context_object_name = "students"
 
     def get_context_data(self, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
         context_data = super().get_context_data(**kwargs)
+        try:
+            students, next_cursor = get_students_page(self.request.GET)
+        except ValueError:
+            students, next_cursor = get_students_page({})
+
+        context_data["students"] = students
+        context_data["next_cursor"] = next_cursor
         context_data["academic_levels"] = {
             level.name.replace("_", " ").strip(): level.value for level in AcademicLevel
         }
+        context_data["departments"] = (
+            students_qs.order_by("department")
+            .values_list("department", flat=True)
+            .distinct()
+        )
         return context_data
 
 
+class StudentListDataView(AdminOnlyMixin, LoginRequiredMixin, generic.View):
+    """View for fetching pages of the list of students, as JSON."""
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            students, next_cursor = get_students_page(request.GET)
+        except ValueError as exc:
+            return JsonResponse(
+                data={
+                    "status": "error",
+                    "detail": str(exc),
+                },
+                status=400,
+            )
+
+        return JsonResponse(
+            data={
+                "status": "success",
+                "students": [
+                    {
+                        "id": str(student.id),
+                        "name": student.name.title(),
+                        "email": student.email.lower(),
+                        "matriculation_number": student.matriculation_number,
+                        "department": student.department.title(),
+                        "level": student.level,
+                        "delete_url": reverse(
+                            "students:delete_student", kwargs={"student_id": student.id}
+                        ),
+                    }
+                    for student in students
+                ],
+                "next_cursor": next_cursor,
+            },
+            status=200,
+        )
+
+
 @capture.enable
 @capture.capture(content="Oops! An error occurred while record the given details.")
 class StudentAddView(
@@ -77,10 +185,12 @@ class StudentImportView(
 
     http_method_names = ["post"]
 
+    allowed_extensions = (".csv", ".xlsx", ".zip")
+
     def post(self, request, *args, **kwargs):
-        students_file = request.FILES.get("students_file")
+        students_files = request.FILES.getlist("students_file")
 
-        if not students_file:
+        if not students_files:
             return JsonResponse(
                 data={
                     "status": "error",
@@ -89,29 +199,158 @@ class StudentImportView(
                 status=400,
             )
 
-        _, ext = os.path.splitext(students_file.name)
-        if ext.lower() != ".csv":
+        for students_file in students_files:
+            _, ext = os.path.splitext(students_file.name)
+            if ext.lower() not in self.allowed_extensions:
+                return JsonResponse(
+                    data={
+                        "status": "error",
+                        "detail": "Only CSV, Excel (.xlsx) and zip files are allowed",
+                    },
+                    status=400,
+                )
+
+        job = create_import_job(students_files, created_by=request.user)
+        uploaded = "Your file was" if len(students_files) == 1 else "Your files were"
+        return JsonResponse(
+            data={
+                "status": "success",
+                "detail": f"{uploaded} uploaded. Importing student details...",
+                "job": get_import_job_status(job),
+            },
+            status=202,
+        )
+
+
+def _get_report_summary(
+    report: ImportReport, *, max_skipped_rows: int
+) -> typing.Dict[str, typing.Any]:
+    return {
+        "rows": report.rows,
+        "created": report.created,
+        "skipped": report.skipped_count,
+        "failed": report.failed,
+        "skipped_reasons": report.skipped_reasons(),
+        "skipped_rows": [
+            skipped_row._asdict() for skipped_row in report.skipped[:max_skipped_rows]
+        ],
+    }
+
+
+def get_import_job_status(
+    job: StudentImportJob, *, max_skipped_rows: int = 100
+) -> typing.Dict[str, typing.Any]:
+    """Return a JSON serializable summary of the import job's progress, and of each of its files."""
+    report = ImportReport.from_dict(job.report)
+    if "files" in job.report:
+        files = [
+            {
+                "name": file_report["name"],
+                "error": file_report.get("error"),
+                **_get_report_summary(
+                    ImportReport.from_dict(file_report), max_skipped_rows=max_skipped_rows
+                ),
+            }
+            for file_report in job.report["files"]
+        ]
+    else:
+        files = [
+            {
+                "name": job.file_name,
+                "error": None,
+                **_get_report_summary(report, max_skipped_rows=max_skipped_rows),
+            }
+        ]
+
+    return {
+        "id": str(job.id),
+        "file_name": job.file_name,
+        "status": job.status,
+        "is_finished": job.is_finished,
+        "can_resume": can_resume(job),
+        "error": job.error,
+        **_get_report_summary(report, max_skipped_rows=max_skipped_rows),
+        "files": files,
+        "status_url": reverse("students:import_job_status", kwargs={"job_id": job.id}),
+        "cancel_url": reverse("students:cancel_import_job", kwargs={"job_id": job.id}),
+        "resume_url": reverse("students:resume_import_job", kwargs={"job_id": job.id}),
+        "redirect_url": reverse("students:student_list"),
+    }
+
+
+class StudentImportJobStatusView(AdminOnlyMixin, LoginRequiredMixin, generic.View):
+    """View for checking the progress of a student import job"""
+
+    queryset = StudentImportJob.objects.all()
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(self.queryset, id=self.kwargs["job_id"])
+        return JsonResponse(
+            data={"status": "success", "job": get_import_job_status(job)},
+            status=200,
+        )
+
+
+class StudentImportJobCancelView(AdminOnlyMixin, LoginRequiredMixin, generic.View):
+    """View for cancelling a student import job"""
+
+    queryset = StudentImportJob.objects.all()
+    http_method_names = ["post"]
+
+    def post(self, request, *args, **kwargs):
+        job = get_object_or_404(self.queryset, id=self.kwargs["job_id"])
+        if job.is_finished:
             return JsonResponse(
                 data={
                     "status": "error",
-                    "detail": "Only CSV files are allowed",
+                    "detail": f"This import has already {job.status}.",
+                    "job": get_import_job_status(job),
                 },
                 status=400,
             )
 
-        with capture.capture(ValueError, code=400):
-            students = import_students_from_file(students_file)
-
+        cancel_import_job(job)
         return JsonResponse(
             data={
                 "status": "success",
-                "detail": f"{len(students)} new students were found and imported!",
-                "redirect_url": reverse("students:student_list"),
+                "detail": "The import will stop shortly.",
+                "job": get_import_job_status(job),
             },
             status=200,
         )
 
 
+class StudentImportJobResumeView(
+    ElectionNotOngoingMixin, AdminOnlyMixin, LoginRequiredMixin, generic.View
+):
+    """View for resuming a cancelled or interrupted student import job"""
+
+    queryset = StudentImportJob.objects.all()
+    http_method_names = ["post"]
+
+    def post(self, request, *args, **kwargs):
+        job = get_object_or_404(self.queryset, id=self.kwargs["job_id"])
+        if not resume_import_job(job):
+            return JsonResponse(
+                data={
+                    "status": "error",
+                    "detail": "Only cancelled or interrupted imports can be resumed.",
+                    "job": get_import_job_status(job),
+                },
+                status=400,
+            )
+
+        return JsonResponse(
+            data={
+                "status": "success",
+                "detail": "Resuming import...",
+                "job": get_import_job_status(job),
+            },
+            status=202,
+        )
+
+
 class StudentDeleteView(
     ElectionNotOngoingMixin, AdminOnlyMixin, LoginRequiredMixin, generic.View
 ):
@@ -137,6 +376,10 @@ class StudentDeleteView(
 
 
 students_list_view = StudentListView.as_view()
+student_list_data_view = StudentListDataView.as_view()
 student_add_view = StudentAddView.as_view()
 student_import_view = StudentImportView.as_view()
+student_import_job_status_view = StudentImportJobStatusView.as_view()
+student_import_job_cancel_view = StudentImportJobCancelView.as_view()
+student_import_job_resume_view = StudentImportJobResumeView.as_view()
 student_delete_view = StudentDeleteView.as_view()
@@ -0,0 +1,94 @@
+import threading
+import typing
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.tokens.totp import (
+    InvalidToken,
+    exchange_data_for_token,
+    exchange_token_for_data,
+)
+from core.benchmarks import Stopwatch, summarize_latencies
+
+
+ACCESS_TOKEN_MODES = ("totp", "signed")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark exchanging data for password set/reset tokens and back, with each "
+        "access token mode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modes",
+            default=",".join(ACCESS_TOKEN_MODES),
+            help="Comma separated access token modes to benchmark.",
+        )
+        parser.add_argument(
+            "--exchanges", type=int, default=500, help="Exchanges per mode."
+        )
+        parser.add_argument("--threads", type=int, default=4)
+
+    def handle(self, *args, **options):
+        modes = options["modes"].split(",")
+        unknown = set(modes) - set(ACCESS_TOKEN_MODES)
+        if unknown:
+            raise CommandError(f"Unknown access token modes: {', '.join(sorted(unknown))}")
+
+        for mode in modes:
+            with override_settings(ACCESS_TOKEN_MODE=mode):
+                self.benchmark_mode(mode, options)
+
+    def benchmark_mode(self, mode: str, options: typing.Dict) -> None:
+        # Queries made by one exchange, and whether used tokens are rejected
+        with CaptureQueriesContext(connection) as issue_queries:
+            token = exchange_data_for_token({"account_id": str(uuid.uuid4())})
+        with CaptureQueriesContext(connection) as redeem_queries:
+            exchange_token_for_data(token)
+        try:
+            exchange_token_for_data(token)
+        except InvalidToken:
+            pass
+        else:
+            raise CommandError(f"A used token was accepted with the {mode} mode")
+
+        issue_latencies: typing.List[float] = []
+        redeem_latencies: typing.List[float] = []
+        lock = threading.Lock()
+
+        def exchange(_) -> None:
+            try:
+                data = {"account_id": str(uuid.uuid4())}
+                with Stopwatch() as issue:
+                    token = exchange_data_for_token(data, expires_after=60 * 15)
+                with Stopwatch() as redeem:
+                    exchanged_data = exchange_token_for_data(token)
+                if exchanged_data != data:
+                    raise CommandError(f"Exchanged data mismatch with the {mode} mode")
+                with lock:
+                    issue_latencies.append(issue.elapsed)
+                    redeem_latencies.append(redeem.elapsed)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            with Stopwatch() as stopwatch:
+                list(executor.map(exchange, range(options["exchanges"])))
+
+        self.stdout.write(f"\n{mode}")
+        self.stdout.write(
+            f"  Queries: {len(issue_queries)} to issue a token, "
+            f"{len(redeem_queries)} to exchange it back"
+        )
+        self.stdout.write(
+            f"  Throughput ({options['threads']} threads): "
+            f"{options['exchanges'] / stopwatch.elapsed:.1f} round trips/sec"
+        )
+        self.stdout.write(f"  Issue: {summarize_latencies(issue_latencies)}")
+        self.stdout.write(f"  Exchange: {summarize_latencies(redeem_latencies)}")
+        return None
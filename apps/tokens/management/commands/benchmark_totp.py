@@ -0,0 +1,130 @@
+import random
+import time
+import typing
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tokens.models import IdentifierRelatedTOTP
+from apps.tokens.oath import get_compiled_totp
+from core.benchmarks import Stopwatch
+
+
+def django_otp_token(otp: IdentifierRelatedTOTP) -> str:
+    return str(otp.totp().token()).zfill(otp.length)
+
+
+def django_otp_verify(otp: IdentifierRelatedTOTP, token: int, tolerance: int) -> bool:
+    return otp.totp().verify(token, tolerance=tolerance)
+
+
+def compiled_token(otp: IdentifierRelatedTOTP) -> str:
+    return otp.token()
+
+
+def compiled_verify(otp: IdentifierRelatedTOTP, token: int, tolerance: int) -> bool:
+    return otp.compiled_totp().verify(token, tolerance=tolerance)
+
+
+def uncached_token(otp: IdentifierRelatedTOTP) -> str:
+    totp = get_compiled_totp.__wrapped__(
+        otp.key, otp.validity_period, otp.length
+    )
+    return str(totp.token()).zfill(otp.length)
+
+
+def uncached_verify(otp: IdentifierRelatedTOTP, token: int, tolerance: int) -> bool:
+    totp = get_compiled_totp.__wrapped__(
+        otp.key, otp.validity_period, otp.length
+    )
+    return totp.verify(token, tolerance=tolerance)
+
+
+IMPLEMENTATIONS = {
+    "django_otp": (django_otp_token, django_otp_verify),
+    "compiled": (compiled_token, compiled_verify),
+    "compiled_uncached": (uncached_token, uncached_verify),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark TOTP token generation and verification, with django_otp's TOTP, "
+        "as OTPs used before, and with the cached compiled TOTPs they use now. "
+        "OTPs are not saved, so the database is not used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--otps", type=int, default=1000, help="Distinct OTPs used in turn."
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=100000, help="Operations per measurement."
+        )
+        parser.add_argument(
+            "--tolerance", type=int, default=0, help="Time steps of drift accepted."
+        )
+
+    def handle(self, *args, **options):
+        otps = [
+            # Like access tokens, that have 6 to 12 digits
+            IdentifierRelatedTOTP(
+                identifier=str(index),
+                length=random.randint(6, 12),
+                validity_period=15 * 60,
+            )
+            for index in range(options["otps"])
+        ]
+        self.check_tokens(otps)
+        self.stdout.write(
+            f"{options['otps']} OTPs, {options['iterations']} operations per measurement, "
+            f"tolerance {options['tolerance']}"
+        )
+
+        tokens = [int(otp.token()) for otp in otps]
+        for name, (generate, verify) in IMPLEMENTATIONS.items():
+            get_compiled_totp.cache_clear()
+            self.stdout.write(f"\n{name}")
+            self.report(
+                "Generate",
+                lambda index: generate(otps[index % len(otps)]),
+                options["iterations"],
+            )
+            self.report(
+                "Verify correct",
+                lambda index: verify(
+                    otps[index % len(otps)], tokens[index % len(otps)], options["tolerance"]
+                ),
+                options["iterations"],
+            )
+            self.report(
+                "Verify wrong",
+                lambda index: verify(
+                    otps[index % len(otps)], tokens[index % len(otps)] + 1, options["tolerance"]
+                ),
+                options["iterations"],
+            )
+
+    def check_tokens(self, otps: typing.List[IdentifierRelatedTOTP]) -> None:
+        """Check that compiled TOTPs give the same tokens as django_otp's."""
+        now = time.time()
+        for otp in otps:
+            django_otp_totp = otp.totp()
+            compiled_totp = otp.compiled_totp()
+            for offset in (-1, 0, 1):
+                django_otp_totp.time = now + offset * otp.validity_period
+                if django_otp_totp.token() != compiled_totp.token(
+                    now + offset * otp.validity_period
+                ):
+                    raise CommandError(f"Compiled TOTP token mismatch for key {otp.key}")
+        return None
+
+    def report(
+        self, label: str, operation: typing.Callable[[int], typing.Any], iterations: int
+    ) -> None:
+        with Stopwatch() as stopwatch:
+            for index in range(iterations):
+                operation(index)
+        self.stdout.write(
+            f"  {label}: {iterations / stopwatch.elapsed:,.0f} ops/sec, "
+            f"{stopwatch.elapsed / iterations * 1_000_000:.2f}us each"
+        )
+        return None
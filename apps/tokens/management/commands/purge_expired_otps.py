@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.tokens.purge import PurgeWorker, purge_expired_totps, purge_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired OTPs, in batches. Runs once, or every --interval seconds with --loop. "
+        "Use with OTP_PURGE_IN_PROCESS=false, so web processes do not purge OTPs themselves."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.OTP_PURGE_BATCH_SIZE,
+            help="Maximum number of OTPs deleted per query.",
+        )
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep purging every --interval seconds."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.OTP_PURGE_INTERVAL,
+            help="Seconds between purges, with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            purged = purge_expired_totps(batch_size=options["batch_size"])
+            self.stdout.write(
+                "Purged " + ", ".join(f"{table}={count}" for table, count in purged.items())
+            )
+            self.report_metrics()
+            return
+
+        worker = PurgeWorker(options["interval"], batch_size=options["batch_size"])
+        worker.start()
+        self.stdout.write(f"Purging expired OTPs every {options['interval']:g}s")
+        try:
+            while worker.is_alive():
+                worker.join(options["interval"])
+                self.report_metrics()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping OTP purges...")
+        finally:
+            worker.stop(timeout=30)
+            self.report_metrics()
+
+    def report_metrics(self) -> None:
+        metrics = purge_metrics.snapshot()
+        self.stdout.write(
+            ", ".join(
+                f"{name}={value:.1f}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in metrics.items()
+            )
+        )
+        return None
@@ -1,6 +1,8 @@
-from typing import Any
+import datetime
+from typing import Any, Dict
 from django.db import models
 from django.http import HttpRequest
+from django.utils import timezone
 
 from helpers.requests import get_ip_address
 
@@ -8,10 +10,49 @@ from helpers.requests import get_ip_address
 class TimeBasedOTPManager(models.Manager):
     use_in_migrations = True
 
+    def _set_expiry(self, kwargs: Dict[str, Any]) -> None:
+        validity_period = kwargs.get(
+            "validity_period",
+            self.model._meta.get_field("validity_period").get_default(),
+        )
+        kwargs.setdefault(
+            "expires_at", timezone.now() + datetime.timedelta(seconds=validity_period)
+        )
+        return None
+
     def create(self, **kwargs: Any) -> Any:
         """Create time based OTP. Passing the request object auto-captures the requestor's IP address"""
         request: HttpRequest | None = kwargs.pop("request", None)
         if request:
             ip = get_ip_address(request).exploded
             kwargs["requestor_ip_address"] = ip
+        self._set_expiry(kwargs)
         return super().create(**kwargs)
+
+    def rotate(self, unique_field: str, **kwargs: Any) -> Any:
+        """
+        Create a time based OTP, or replace the key, counter and settings of the
+        one with the same `unique_field` value, in a single upsert statement.
+        Passing the request object auto-captures the requestor's IP address.
+
+        :param unique_field: The uniquely constrained field identifying the OTP.
+        :return: The created or replaced OTP.
+        """
+        request: HttpRequest | None = kwargs.pop("request", None)
+        kwargs["requestor_ip_address"] = (
+            get_ip_address(request).exploded if request else None
+        )
+        self._set_expiry(kwargs)
+        totp = self.model(**kwargs)
+        update_fields = [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if not field.primary_key and field.name != unique_field
+        ]
+        self.bulk_create(
+            [totp],
+            update_conflicts=True,
+            unique_fields=[unique_field],
+            update_fields=update_fields,
+        )
+        return totp
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tokens', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='identifierrelatedtotp',
+            name='identifier',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
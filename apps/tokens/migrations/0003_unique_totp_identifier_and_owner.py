@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def delete_superseded_totps(apps, schema_editor):
+    """Keep only the latest OTP of each identifier and owner, the only one that was used."""
+    for model_name, field in (
+        ("IdentifierRelatedTOTP", "identifier"),
+        ("UserRelatedTOTP", "owner"),
+    ):
+        TOTP = apps.get_model("tokens", model_name)
+        latest = TOTP.objects.filter(**{field: OuterRef(field)}).order_by("-created_at", "-pk")
+        TOTP.objects.exclude(pk=Subquery(latest.values("pk")[:1])).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tokens', '0002_alter_identifierrelatedtotp_identifier'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_superseded_totps, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='identifierrelatedtotp',
+            name='identifier',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='userrelatedtotp',
+            name='owner',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='totp', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:35
+
+import datetime
+from django.db import migrations, models
+
+
+def set_expiry(apps, schema_editor):
+    for model_name in ("IdentifierRelatedTOTP", "UserRelatedTOTP"):
+        TOTP = apps.get_model("tokens", model_name)
+        totps = list(TOTP.objects.only("pk", "created_at", "validity_period"))
+        for totp in totps:
+            totp.expires_at = totp.created_at + datetime.timedelta(
+                seconds=totp.validity_period
+            )
+        TOTP.objects.bulk_update(totps, ["expires_at"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tokens', '0003_unique_totp_identifier_and_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='identifierrelatedtotp',
+            name='expires_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='userrelatedtotp',
+            name='expires_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(set_expiry, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='identifierrelatedtotp',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, help_text='When the OTP expires, and can be purged.'),
+        ),
+        migrations.AlterField(
+            model_name='userrelatedtotp',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, help_text='When the OTP expires, and can be purged.'),
+        ),
+    ]
@@ -8,6 +8,7 @@ import time
 import base64
 
 from . import managers
+from .oath import CompiledTOTP, get_compiled_totp
 from helpers.requests import get_ip_address
 
 
@@ -21,6 +22,9 @@ class TimeBasedOTP(models.Model):
     requestor_ip_address = models.GenericIPAddressField(null=True, blank=True)
     metadata = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(
+        db_index=True, help_text=_("When the OTP expires, and can be purged.")
+    )
 
     objects = managers.TimeBasedOTPManager()
 
@@ -41,19 +45,26 @@ class TimeBasedOTP(models.Model):
         totp.time = time.time()
         return totp
 
+    def compiled_totp(self) -> CompiledTOTP:
+        """Returns the cached `CompiledTOTP` of the instance's key and settings"""
+        return get_compiled_totp(
+            self.key, self.validity_period, self.length
+        )
+
     def token(self) -> str:
         """The OTP token"""
-        totp = self.totp()
+        totp = self.compiled_totp()
         token = str(totp.token()).zfill(self.length)
         return token
 
-    def verify_token(
+    def _get_token_counter(
         self, token: str, *, request: HttpRequest = None, tolerance: int = 0
-    ) -> bool:
+    ) -> int | None:
+        """Return the current counter value if the token is correct, else None."""
         try:
             token = int(token)
         except ValueError:
-            return False
+            return None
 
         ip_address = get_ip_address(request).exploded if request else None
         # Ensure that the same device/machine that
@@ -61,26 +72,69 @@ class TimeBasedOTP(models.Model):
         if (ip_address and self.requestor_ip_address) and (
             ip_address != self.requestor_ip_address
         ):
-            return False
+            return None
 
-        totp = self.totp()
+        totp = self.compiled_totp()
+        now = time.time()
+        counter = totp.t(now)
         # check if the current counter value is higher than the value of
         # last verified counter and check if entered token is correct by
-        # calling totp.verify_token()
-        if (totp.t() > self.last_verified_counter) and totp.verify(
-            token, tolerance=tolerance
+        # calling totp.verify()
+        if (counter > self.last_verified_counter) and totp.verify(
+            token, tolerance=tolerance, now=now
         ):
-            # if the condition is true, set the last verified counter value
-            # to current counter value, and return True
-            self.last_verified_counter = totp.t()
-            return True
+            return counter
         # if the token entered was invalid or if the counter value
-        # was less than last verified counter, then return False
-        return False
+        # was less than last verified counter, then return None
+        return None
+
+    def is_valid_token(
+        self, token: str, *, request: HttpRequest = None, tolerance: int = 0
+    ) -> bool:
+        """Check the token, without marking it verified."""
+        counter = self._get_token_counter(token, request=request, tolerance=tolerance)
+        return counter is not None
+
+    def verify_token(
+        self,
+        token: str,
+        *,
+        request: HttpRequest = None,
+        tolerance: int = 0,
+        delete_on_verification: bool = False,
+    ) -> bool:
+        """
+        Verify the token, so that it cannot be verified again.
+
+        The verified counter is saved, or the OTP deleted, in one conditional
+        statement, so only one of concurrent verifications of a token succeeds.
+
+        :param token: The token to verify.
+        :param request: The request verifying the token.
+        :param tolerance: Number of steps of clock drift to accept.
+        :param delete_on_verification: Whether to delete the OTP once verified.
+        :return: True if the token is verified, False otherwise.
+        """
+        counter = self._get_token_counter(token, request=request, tolerance=tolerance)
+        if counter is None:
+            return False
+
+        # Only matches if the token was not verified since it was read
+        unverified = type(self).objects.filter(
+            pk=self.pk, last_verified_counter__lt=counter
+        )
+        if delete_on_verification:
+            updated, _ = unverified.delete()
+        else:
+            updated = unverified.update(last_verified_counter=counter)
+        if not updated:
+            return False
+        self.last_verified_counter = counter
+        return True
 
 
 class UserRelatedTOTP(TimeBasedOTP):
-    owner = models.ForeignKey(
+    owner = models.OneToOneField(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="totp"
     )
 
@@ -91,7 +145,7 @@ class UserRelatedTOTP(TimeBasedOTP):
 
 
 class IdentifierRelatedTOTP(TimeBasedOTP):
-    identifier = models.CharField(max_length=255)
+    identifier = models.CharField(max_length=255, unique=True)
 
     class Meta:
         verbose_name = _("Identifier Related Time Based OTP")
@@ -0,0 +1,83 @@
+"""
+Precomputed TOTPs.
+
+`django_otp.oath.TOTP` is built from the OTP's settings on every use, and its
+HMAC is keyed again for every token it computes. `CompiledTOTP` keys its HMAC
+once, and copies the keyed HMAC for each token. Compiled TOTPs are cached by
+key and settings, so that OTPs verified or generated repeatedly, like those
+of a registration in progress, are compiled once.
+
+Tokens are the same as those of `django_otp.oath.TOTP`, with `t0` and `drift`
+of 0, that the OTP models use.
+"""
+
+import base64
+import functools
+import hmac
+import time
+import typing
+from hashlib import sha1
+from struct import Struct
+
+
+_counter_struct = Struct(">Q")
+
+
+class CompiledTOTP:
+    """A TOTP, with its HMAC-SHA1 keyed once."""
+
+    __slots__ = ("step", "digits", "_modulus", "_hmac")
+
+    def __init__(self, key: bytes, *, step: int, digits: int) -> None:
+        """
+        :param key: The shared secret.
+        :param step: The time step in seconds.
+        :param digits: The number of decimal digits of tokens.
+        """
+        self.step = step
+        self.digits = digits
+        self._modulus = 10**digits
+        self._hmac = hmac.new(key, digestmod=sha1)
+
+    def t(self, now: typing.Optional[float] = None) -> int:
+        """The time step at `now`, or at the current time."""
+        return int(time.time() if now is None else now) // self.step
+
+    def token_at(self, counter: int) -> int:
+        """The HOTP token at the time step `counter`."""
+        mac = self._hmac.copy()
+        mac.update(_counter_struct.pack(counter))
+        digest = mac.digest()
+        offset = digest[19] & 0x0F
+        bin_code = int.from_bytes(digest[offset : offset + 4], "big") & 0x7FFFFFFF
+        return bin_code % self._modulus
+
+    def token(self, now: typing.Optional[float] = None) -> int:
+        """The token at `now`, or at the current time."""
+        return self.token_at(self.t(now))
+
+    def verify(
+        self, token: int, *, tolerance: int = 0, now: typing.Optional[float] = None
+    ) -> bool:
+        """
+        Check the token against the tokens of the time steps
+        within `tolerance` steps of that of `now`.
+        """
+        counter = self.t(now)
+        if not tolerance:
+            return self.token_at(counter) == token
+        return any(
+            self.token_at(counter + offset) == token
+            for offset in range(-tolerance, tolerance + 1)
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def get_compiled_totp(key: str, step: int, digits: int) -> CompiledTOTP:
+    """
+    Return the compiled TOTP of an OTP model's key and settings.
+
+    The key is base64 encoded, as `TimeBasedOTP.totp` does, so tokens stay
+    the same as those of OTPs created before TOTPs were compiled.
+    """
+    return CompiledTOTP(base64.b64encode(key.encode()), step=step, digits=digits)
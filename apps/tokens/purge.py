@@ -0,0 +1,180 @@
+"""
+Purging of expired time based OTPs.
+
+OTPs of abandoned registrations and password resets, and unexchanged
+access tokens, are never verified, so never deleted. They are instead
+purged once expired, in small batches, so that each delete only holds
+its locks briefly, either by a background thread of the process, or by
+the `purge_expired_otps` command.
+"""
+
+import logging
+import threading
+import time
+import typing
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from .models import IdentifierRelatedTOTP, UserRelatedTOTP
+
+
+logger = logging.getLogger(__name__)
+
+OTP_MODELS = (IdentifierRelatedTOTP, UserRelatedTOTP)
+
+
+def _get_setting(name: str, default: typing.Any) -> typing.Any:
+    return getattr(settings, name, default)
+
+
+class PurgeMetrics:
+    """Thread-safe counters describing the purges of expired OTPs."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.runs = 0
+            self.batches = 0
+            self.purged = 0
+            self.purge_seconds = 0.0
+            self.table_sizes: typing.Dict[str, int] = {}
+
+    def record_run(
+        self,
+        *,
+        batches: int,
+        purged: int,
+        seconds: float,
+        table_sizes: typing.Dict[str, int],
+    ) -> None:
+        with self._lock:
+            self.runs += 1
+            self.batches += batches
+            self.purged += purged
+            self.purge_seconds += seconds
+            self.table_sizes = table_sizes
+
+    def snapshot(self) -> typing.Dict[str, typing.Union[int, float]]:
+        """Return a consistent copy of the metrics, with the table sizes after the last run."""
+        with self._lock:
+            snapshot = {
+                "runs": self.runs,
+                "batches": self.batches,
+                "purged": self.purged,
+                "avg_run_ms": (
+                    self.purge_seconds / self.runs * 1000 if self.runs else 0.0
+                ),
+            }
+            snapshot.update(
+                (f"{table}_rows", size) for table, size in self.table_sizes.items()
+            )
+        return snapshot
+
+
+purge_metrics = PurgeMetrics()
+
+
+def get_table_sizes() -> typing.Dict[str, int]:
+    """Return the number of OTPs in each OTP table."""
+    return {model._meta.db_table: model.objects.count() for model in OTP_MODELS}
+
+
+def purge_expired_totps(
+    *, batch_size: typing.Optional[int] = None
+) -> typing.Dict[str, int]:
+    """
+    Delete the OTPs that expired, `batch_size` at a time.
+
+    Each batch is deleted in its own query and transaction,
+    so other writes are only held back for one batch at a time.
+
+    :param batch_size: Maximum number of OTPs deleted per query.
+    :return: The number of OTPs deleted, per table.
+    """
+    batch_size = batch_size or _get_setting("OTP_PURGE_BATCH_SIZE", 500)
+    now = timezone.now()
+    purged = {}
+    batches = 0
+
+    started_at = time.perf_counter()
+    for model in OTP_MODELS:
+        expired = model.objects.filter(expires_at__lte=now).order_by()
+        purged[model._meta.db_table] = 0
+        while True:
+            totp_ids = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not totp_ids:
+                break
+            deleted, _ = expired.filter(pk__in=totp_ids).delete()
+            purged[model._meta.db_table] += deleted
+            batches += 1
+            if len(totp_ids) < batch_size:
+                break
+    seconds = time.perf_counter() - started_at
+
+    table_sizes = get_table_sizes()
+    purge_metrics.record_run(
+        batches=batches,
+        purged=sum(purged.values()),
+        seconds=seconds,
+        table_sizes=table_sizes,
+    )
+    logger.info(
+        "Purged %s expired OTPs in %s batches (%.1fms). Remaining: %s",
+        sum(purged.values()),
+        batches,
+        seconds * 1000,
+        ", ".join(f"{table}={size}" for table, size in table_sizes.items()),
+    )
+    return purged
+
+
+class PurgeWorker(threading.Thread):
+    """Purges expired OTPs every `interval` seconds, until stopped."""
+
+    def __init__(self, interval: float, *, batch_size: typing.Optional[int] = None) -> None:
+        super().__init__(name="otp-purge-worker", daemon=True)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stopping = threading.Event()
+
+    def run(self) -> None:
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    purge_expired_totps(batch_size=self.batch_size)
+                except Exception:
+                    logger.exception("Purge of expired OTPs failed")
+                self.stopping.wait(self.interval)
+        finally:
+            connections.close_all()
+
+    def stop(self, timeout: typing.Optional[float] = None) -> None:
+        self.stopping.set()
+        self.join(timeout)
+        return None
+
+
+_purge_worker: typing.Optional[PurgeWorker] = None
+_purge_worker_lock = threading.Lock()
+
+
+def start_purge_worker() -> None:
+    """
+    Start this process' purge worker, if not started yet, unless expired
+    OTPs are purged by a separate process (see the `purge_expired_otps` command).
+    """
+    global _purge_worker
+
+    if not _get_setting("OTP_PURGE_IN_PROCESS", True):
+        return None
+
+    with _purge_worker_lock:
+        if _purge_worker is None or not _purge_worker.is_alive():
+            _purge_worker = PurgeWorker(_get_setting("OTP_PURGE_INTERVAL", 600))
+            _purge_worker.start()
+    return None
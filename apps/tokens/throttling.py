@@ -0,0 +1,116 @@
+"""
+Throttling of failed OTP verifications.
+
+Failed verifications are counted per identifier, in the "otp_throttle" cache,
+over a sliding window. Once an identifier has too many recent failures, further
+attempts are rejected from the cache, without looking up the OTP or verifying
+the token, until enough of the failures fall out of the window.
+
+The window is approximated by two fixed windows, the current and previous
+one, with the previous window's failures weighted by how much of it still
+overlaps the sliding window. Counts are only ever added to or incremented,
+so concurrent failures are all counted, even with a shared cache.
+"""
+
+import hashlib
+import math
+import time
+import typing
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _get_setting(name: str, default: typing.Any) -> typing.Any:
+    return getattr(settings, name, default)
+
+
+class SlidingWindowThrottle:
+    """Limits the number of failures per key over a sliding window."""
+
+    def __init__(
+        self,
+        scope: str,
+        *,
+        limit: int,
+        window: int,
+        cache_alias: str = "otp_throttle",
+    ) -> None:
+        """
+        :param scope: Namespace of the throttle's keys in the cache.
+        :param limit: Number of failures in the window after which the key is throttled.
+        :param window: Length of the sliding window, in seconds.
+        :param cache_alias: Alias of the cache the failures are counted in.
+        """
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def _get_cache_key(self, key: str, window_index: int) -> str:
+        # Hashed, as keys may be too long, or contain characters, some caches reject
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        return f"tokens:throttle:{self.scope}:{key_hash}:{window_index}"
+
+    def _get_failures(self, key: str, now: float) -> typing.Tuple[int, int, float]:
+        """Return the failures in the current and previous windows, and how far into the current one `now` is."""
+        window_index = int(now // self.window)
+        current_key = self._get_cache_key(key, window_index)
+        previous_key = self._get_cache_key(key, window_index - 1)
+        counts = self.cache.get_many([current_key, previous_key])
+        elapsed = (now % self.window) / self.window
+        return counts.get(current_key, 0), counts.get(previous_key, 0), elapsed
+
+    def get_retry_after(self, key: str) -> int:
+        """
+        Return the number of seconds until the key can be attempted again,
+        or 0 if it is not throttled.
+        """
+        now = time.time()
+        current, previous, elapsed = self._get_failures(key, now)
+        if current + previous * (1 - elapsed) < self.limit:
+            return 0
+        window_end = (int(now // self.window) + 1) * self.window
+        if current >= self.limit:
+            # Throttled until enough of this window's failures stop
+            # counting, once they are the previous window's
+            retry_at = window_end + (1 - self.limit / current) * self.window
+        else:
+            # Throttled until enough of the previous window's failures stop counting
+            retry_at = window_end - (self.limit - current) / previous * self.window
+        return max(math.ceil(retry_at - now), 1)
+
+    def is_throttled(self, key: str) -> bool:
+        return self.get_retry_after(key) > 0
+
+    def record_failure(self, key: str) -> None:
+        cache_key = self._get_cache_key(key, int(time.time() // self.window))
+        # Kept until it no longer overlaps the sliding window
+        self.cache.add(cache_key, 0, self.window * 2)
+        try:
+            self.cache.incr(cache_key)
+        except ValueError:
+            # Evicted, or expired, since it was added
+            self.cache.set(cache_key, 1, self.window * 2)
+        return None
+
+    def reset(self, key: str) -> None:
+        """Forget the key's failures."""
+        window_index = int(time.time() // self.window)
+        self.cache.delete_many(
+            [
+                self._get_cache_key(key, window_index),
+                self._get_cache_key(key, window_index - 1),
+            ]
+        )
+        return None
+
+
+otp_verification_throttle = SlidingWindowThrottle(
+    "otp-verification",
+    limit=_get_setting("OTP_VERIFICATION_MAX_FAILURES", 5),
+    window=_get_setting("OTP_VERIFICATION_FAILURE_WINDOW", 15 * 60),
+)
@@ -1,16 +1,22 @@
 from typing import Any, Hashable, Mapping, Union, Optional
 from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
 from django.http import HttpRequest
 import random
+import secrets
+import time
 from django.contrib.auth.models import AbstractBaseUser
 
 from .models import IdentifierRelatedTOTP, UserRelatedTOTP
+from .purge import start_purge_worker
 from helpers.identifiers import random_hex
+from helpers.requests import get_ip_address
 
 
 def get_totp_by_identifier(identifier: str) -> IdentifierRelatedTOTP | None:
     try:
-        totp = IdentifierRelatedTOTP.objects.filter(identifier=identifier).first()
+        totp = IdentifierRelatedTOTP.objects.get(identifier=identifier)
     except IdentifierRelatedTOTP.DoesNotExist:
         return None
     return totp
@@ -18,7 +24,7 @@ def get_totp_by_identifier(identifier: str) -> IdentifierRelatedTOTP | None:
 
 def get_totp_by_owner(owner: AbstractBaseUser) -> UserRelatedTOTP | None:
     try:
-        totp = UserRelatedTOTP.objects.filter(owner=owner).first()
+        totp = UserRelatedTOTP.objects.get(owner=owner)
     except UserRelatedTOTP.DoesNotExist:
         return None
     return totp
@@ -31,16 +37,20 @@ def generate_totp_for_identifier(
     validity_period: int = settings.OTP_VALIDITY_PERIOD,
     request: Optional[HttpRequest] = None,
 ) -> IdentifierRelatedTOTP:
-    existing_totp = get_totp_by_identifier(identifier)
-    if existing_totp:
-        existing_totp.delete()
-    
-    totp = IdentifierRelatedTOTP.objects.create(
+    """
+    Generate a Time based OTP for the identifier, replacing its existing OTP, if any.
+
+    :param identifier: The identifier for which the OTP is to be generated.
+    :return: The OTP generated
+    """
+    totp = IdentifierRelatedTOTP.objects.rotate(
+        "identifier",
         identifier=identifier,
         length=length,
         validity_period=validity_period,
         request=request,
     )
+    start_purge_worker()
     return totp
 
 
@@ -63,11 +73,9 @@ def verify_identifier_totp_token(
     if not totp:
         return False
 
-    if totp.verify_token(token, request=request):
-        if delete_on_verification:
-            totp.delete()
-        return True
-    return False
+    return totp.verify_token(
+        token, request=request, delete_on_verification=delete_on_verification
+    )
 
 
 def generate_totp_for_user(
@@ -83,12 +91,10 @@ def generate_totp_for_user(
     :param user: The user for which the OTP is to be generated.
     :return: The OTP token generated
     """
-    existing_totp = get_totp_by_owner(user)
-    if existing_totp:
-        existing_totp.delete()
-    totp = UserRelatedTOTP.objects.create(
-        owner=user, length=length, validity_period=validity_period, request=request
+    totp = UserRelatedTOTP.objects.rotate(
+        "owner", owner=user, length=length, validity_period=validity_period, request=request
     )
+    start_purge_worker()
     return totp
 
 
@@ -111,11 +117,9 @@ def verify_user_totp_token(
     if not totp:
         return False
 
-    if totp.verify_token(token, request=request):
-        if delete_on_verification:
-            totp.delete()
-        return True
-    return False
+    return totp.verify_token(
+        token, request=request, delete_on_verification=delete_on_verification
+    )
 
 
 def verify_totp_token(
@@ -146,27 +150,38 @@ def dummy_verify_totp_token(**kwargs) -> bool:
     return token == ("0" * settings.OTP_LENGTH)
 
 
-def exchange_data_for_token(
+ACCESS_TOKEN_SALT = "tokens.access_token"
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def _get_used_token_key(nonce: str) -> str:
+    return f"tokens:used:{nonce}"
+
+
+def _exchange_data_for_totp_token(
     data: Mapping[Hashable, Any],
     *,
-    expires_after: int = 5 * 60,
+    expires_after: int,
     request: Optional[HttpRequest] = None,
 ) -> str:
     identifier = random_hex(length=16)
     totp_length = random.randint(6, 12)
-    totp = generate_totp_for_identifier(
-        identifier, length=totp_length, validity_period=expires_after, request=request
+    totp = IdentifierRelatedTOTP.objects.rotate(
+        "identifier",
+        identifier=identifier,
+        length=totp_length,
+        validity_period=expires_after,
+        metadata=data,
+        request=request,
     )
-    totp.metadata = data
-    totp.save()
+    start_purge_worker()
     return ".".join((identifier, totp.token(), totp.key))
 
 
-class InvalidToken(ValueError):
-    pass
-
-
-def exchange_token_for_data(
+def _exchange_totp_token_for_data(
     access_token: str,
     *,
     request: Optional[HttpRequest] = None,
@@ -177,13 +192,118 @@ def exchange_token_for_data(
     except ValueError:
         raise InvalidToken("Invalid access token")
 
-    valid = verify_identifier_totp_token(
-        token, identifier, request=request, delete_on_verification=False
-    )
+    totp = get_totp_by_identifier(identifier)
+    if delete_on_success:
+        valid = totp and totp.verify_token(
+            token, request=request, delete_on_verification=True
+        )
+    else:
+        valid = totp and totp.is_valid_token(token, request=request)
     if not valid:
         raise InvalidToken("Invalid access token")
-    totp = IdentifierRelatedTOTP.objects.get(identifier=identifier)
-    data = totp.metadata
+    return totp.metadata
+
+
+def _exchange_data_for_signed_token(
+    data: Mapping[Hashable, Any],
+    *,
+    expires_after: int,
+    request: Optional[HttpRequest] = None,
+) -> str:
+    payload = {
+        "d": data,
+        # Identifies the token in the used tokens cache
+        "n": secrets.token_urlsafe(12),
+        "x": int(time.time()) + expires_after,
+    }
+    if request:
+        payload["ip"] = get_ip_address(request).exploded
+    return signing.dumps(payload, salt=ACCESS_TOKEN_SALT, compress=True)
+
+
+def _exchange_signed_token_for_data(
+    access_token: str,
+    *,
+    request: Optional[HttpRequest] = None,
+    delete_on_success: bool = True,
+) -> Mapping[Hashable, Any] | None:
+    try:
+        payload = signing.loads(access_token, salt=ACCESS_TOKEN_SALT)
+    except signing.BadSignature:
+        raise InvalidToken("Invalid access token")
+
+    expires_in = payload["x"] - int(time.time())
+    if expires_in <= 0:
+        raise InvalidToken("Invalid access token")
+    # Ensure that the same device/machine that
+    # requested the token's creation is the one exchanging it
+    if (request and payload.get("ip")) and (
+        get_ip_address(request).exploded != payload["ip"]
+    ):
+        raise InvalidToken("Invalid access token")
+
+    used_tokens = caches["tokens"]
+    used_token_key = _get_used_token_key(payload["n"])
     if delete_on_success:
-        totp.delete()
-    return data
+        # Atomically marks the token used, until it would have expired anyway
+        is_unused = used_tokens.add(used_token_key, True, expires_in)
+    else:
+        is_unused = used_token_key not in used_tokens
+    if not is_unused:
+        raise InvalidToken("Invalid access token")
+    return payload["d"]
+
+
+def exchange_data_for_token(
+    data: Mapping[Hashable, Any],
+    *,
+    expires_after: int = 5 * 60,
+    request: Optional[HttpRequest] = None,
+) -> str:
+    """
+    Exchange JSON serializable data for a single use access token, that can
+    be exchanged back for the data with `exchange_token_for_data`.
+
+    Tokens are signed tokens that hold the data, or TOTPs stored with the data
+    in the database, depending on `settings.ACCESS_TOKEN_MODE`.
+
+    :param data: The data to exchange.
+    :param expires_after: Seconds after which the token expires.
+    :param request: If given, the token can only be exchanged from the request's IP address.
+    :return: The access token.
+    """
+    if settings.ACCESS_TOKEN_MODE == "signed":
+        return _exchange_data_for_signed_token(
+            data, expires_after=expires_after, request=request
+        )
+    return _exchange_data_for_totp_token(
+        data, expires_after=expires_after, request=request
+    )
+
+
+def exchange_token_for_data(
+    access_token: str,
+    *,
+    request: Optional[HttpRequest] = None,
+    delete_on_success: bool = True,
+) -> Mapping[Hashable, Any] | None:
+    """
+    Exchange an access token from `exchange_data_for_token` for its data.
+
+    Both kinds of tokens are accepted whatever the access token mode,
+    so tokens issued before the mode was changed still work.
+
+    :param access_token: The access token.
+    :param request: The request exchanging the token.
+    :param delete_on_success: Whether the token can no longer be used once exchanged.
+    :return: The data the token was exchanged for.
+    :raises InvalidToken: If the token is invalid, expired or already used.
+    """
+    # Signed tokens are separated by colons, TOTP tokens by dots only
+    if ":" in access_token:
+        return _exchange_signed_token_for_data(
+            access_token, request=request, delete_on_success=delete_on_success
+        )
+    return _exchange_totp_token_for_data(
+        access_token, request=request, delete_on_success=delete_on_success
+    )
@@ -0,0 +1,40 @@
+"""Helpers shared by the project's benchmark management commands."""
+
+import math
+import time
+import typing
+
+
+def percentile(values: typing.Sequence[float], pct: float) -> float:
+    """Return the nearest-rank `pct`-th percentile of `values`."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize_latencies(latencies: typing.Sequence[float]) -> str:
+    """Summarize latencies (in seconds) as mean/p50/p99 milliseconds."""
+    if not latencies:
+        return "no samples"
+    mean = sum(latencies) / len(latencies)
+    return (
+        f"mean {mean * 1000:.2f}ms, "
+        f"p50 {percentile(latencies, 50) * 1000:.2f}ms, "
+        f"p99 {percentile(latencies, 99) * 1000:.2f}ms"
+    )
+
+
+class Stopwatch:
+    """Context manager that records the elapsed wall time of its block."""
+
+    def __init__(self) -> None:
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "Stopwatch":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.elapsed = time.perf_counter() - self._start
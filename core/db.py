@@ -0,0 +1,55 @@
+"""Database helpers shared across apps."""
+
+import functools
+import random
+import time
+import typing
+from django.db import OperationalError, connection
+
+
+BUSY_ERROR_MESSAGES = ("database is locked", "database table is locked")
+
+
+def is_database_busy_error(exc: OperationalError) -> bool:
+    """Check if the error was raised because the database is locked by another connection."""
+    message = str(exc).lower()
+    return any(busy_message in message for busy_message in BUSY_ERROR_MESSAGES)
+
+
+def retry_on_database_busy(
+    func: typing.Optional[typing.Callable] = None,
+    *,
+    attempts: int = 5,
+    backoff: float = 0.05,
+):
+    """
+    Retry the decorated function, with jittered exponential backoff,
+    when it fails because the database is locked by another connection.
+
+    Calls made inside an atomic block are not retried, as the failed
+    statement may have broken the enclosing transaction.
+
+    :param attempts: Maximum number of calls to make.
+    :param backoff: Seconds to wait before the first retry. Doubles on each retry.
+    """
+
+    def decorator(func: typing.Callable) -> typing.Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if (
+                        attempt == attempts
+                        or connection.in_atomic_block
+                        or not is_database_busy_error(exc)
+                    ):
+                        raise
+                time.sleep(backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+        return wrapper
+
+    if func is None:
+        return decorator
+    return decorator(func)
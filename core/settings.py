@@ -39,7 +39,7 @@ MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.accounts.middleware.CachedAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -66,12 +66,130 @@ TEMPLATES = [
 WSGI_APPLICATION = "core.wsgi.application"
 
 
-DATABASES = {
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite").lower()
+
+if DB_ENGINE == "postgresql":
+    DB_POOL = os.getenv("DB_POOL", "false").lower() == "true"
+
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME"),
+            "USER": os.getenv("DB_USER"),
+            "PASSWORD": os.getenv("DB_PASSWORD"),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            # Persistent connections cannot be combined with a connection pool
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+                # Milliseconds after which any statement is aborted
+                "options": f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT', '10000'))}",
+            },
+        }
+    }
+
+    if DB_POOL:
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+
+else:
+    # "tuned" suits small single node deployments with concurrent voters,
+    # "default" keeps SQLite's rollback journal and default locking.
+    SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "tuned").lower()
+
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            # The journal mode is persisted in the database file,
+            # so it is set explicitly for both profiles
+            "OPTIONS": {"init_command": "PRAGMA journal_mode=DELETE;"},
+        }
+    }
+
+    if SQLITE_PROFILE == "tuned":
+        DATABASES["default"]["OPTIONS"] = {
+            # Seconds a connection waits for another connection's lock before failing
+            "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "20")),
+            # Take the write lock when transactions begin, so transactions that read
+            # before writing wait for it instead of failing to upgrade their lock
+            "transaction_mode": "IMMEDIATE",
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024)))};"
+                "PRAGMA temp_store=MEMORY;"
+            ),
+        }
+
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3"
+        # Use a shared cache (e.g. Redis or Memcached) when running multiple
+        # processes, so that cache invalidations are seen by all of them.
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "nsche-elections"),
+    }
+}
+
+# "db" stores sessions in the database. "cached_db" reads them from the cache,
+# falling back to the database, and writes them to both. "cache" stores them in
+# the cache only, and "signed_cookies" in the client, signed with SECRET_KEY.
+# "cache" loses sessions evicted from the cache, and, like "cached_db", needs a
+# shared cache when running multiple processes.
+SESSION_STORE = os.getenv("SESSION_STORE", "db").lower()
+SESSION_ENGINE = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}[SESSION_STORE]
+
+# Sessions get their own cache, so they are not evicted by other cached data
+SESSION_CACHE_ALIAS = "sessions"
+CACHES[SESSION_CACHE_ALIAS] = {
+    "BACKEND": CACHES["default"]["BACKEND"],
+    "LOCATION": os.getenv("SESSION_CACHE_LOCATION", "nsche-elections-sessions"),
+}
+if CACHES[SESSION_CACHE_ALIAS]["BACKEND"].endswith("LocMemCache"):
+    CACHES[SESSION_CACHE_ALIAS]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "20000"))
     }
+
+# "totp" stores the data exchanged for password set and reset tokens in the
+# database. "signed" puts it in the tokens themselves, signed with SECRET_KEY,
+# and only remembers used tokens, in the "tokens" cache, until they expire.
+# Like "cache" sessions, "signed" needs a shared cache when running multiple
+# processes, else a token can be used once in each process.
+ACCESS_TOKEN_MODE = os.getenv("ACCESS_TOKEN_MODE", "totp").lower()
+
+# Used tokens get their own cache, as evicting them early would let them be reused
+CACHES["tokens"] = {
+    "BACKEND": CACHES["default"]["BACKEND"],
+    "LOCATION": os.getenv("ACCESS_TOKEN_CACHE_LOCATION", "nsche-elections-tokens"),
 }
+if CACHES["tokens"]["BACKEND"].endswith("LocMemCache"):
+    CACHES["tokens"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("ACCESS_TOKEN_CACHE_MAX_ENTRIES", "100000"))
+    }
+
+# Failed OTP verifications are counted in their own cache, so that guesses
+# of many identifiers do not evict used tokens, and the other way round
+CACHES["otp_throttle"] = {
+    "BACKEND": CACHES["default"]["BACKEND"],
+    "LOCATION": os.getenv("OTP_THROTTLE_CACHE_LOCATION", "nsche-elections-otp-throttle"),
+}
+if CACHES["otp_throttle"]["BACKEND"].endswith("LocMemCache"):
+    CACHES["otp_throttle"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("OTP_THROTTLE_CACHE_MAX_ENTRIES", "100000"))
+    }
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -89,6 +207,46 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# "pbkdf2" is Django's default. "scrypt" and "argon2" are memory-hard, and sign in
+# faster for the same resistance to brute forcing. "argon2" requires `argon2-cffi`.
+# Passwords hashed by the other profiles are still accepted, and are rehashed
+# with the selected profile when their owners sign in.
+PASSWORD_HASHING_PROFILE = os.getenv("PASSWORD_HASHING_PROFILE", "pbkdf2").lower()
+
+PASSWORD_HASHING_PBKDF2_ITERATIONS = int(
+    os.getenv("PASSWORD_HASHING_PBKDF2_ITERATIONS", "870000")
+)
+PASSWORD_HASHING_SCRYPT_WORK_FACTOR = int(
+    os.getenv("PASSWORD_HASHING_SCRYPT_WORK_FACTOR", str(2**14))
+)
+PASSWORD_HASHING_SCRYPT_BLOCK_SIZE = int(os.getenv("PASSWORD_HASHING_SCRYPT_BLOCK_SIZE", "8"))
+PASSWORD_HASHING_SCRYPT_PARALLELISM = int(os.getenv("PASSWORD_HASHING_SCRYPT_PARALLELISM", "1"))
+PASSWORD_HASHING_ARGON2_TIME_COST = int(os.getenv("PASSWORD_HASHING_ARGON2_TIME_COST", "2"))
+# In KiB
+PASSWORD_HASHING_ARGON2_MEMORY_COST = int(
+    os.getenv("PASSWORD_HASHING_ARGON2_MEMORY_COST", "19456")
+)
+PASSWORD_HASHING_ARGON2_PARALLELISM = int(os.getenv("PASSWORD_HASHING_ARGON2_PARALLELISM", "1"))
+
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": "apps.accounts.hashers.PBKDF2PasswordHasher",
+    "scrypt": "apps.accounts.hashers.ScryptPasswordHasher",
+    "argon2": "apps.accounts.hashers.Argon2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHING_PROFILE],
+    *(
+        hasher
+        for profile, hasher in PASSWORD_HASHER_PROFILES.items()
+        if profile != PASSWORD_HASHING_PROFILE
+    ),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# Number of threads checking passwords on sign in. Bounds the cores a burst
+# of sign ins can take from other requests.
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", "2"))
+
 AUTHENTICATION_BACKENDS = [
     "apps.accounts.auth_backends.StudentUserAuthenticationBackend",
     "django.contrib.auth.backends.ModelBackend",
@@ -96,6 +254,10 @@ AUTHENTICATION_BACKENDS = [
 
 AUTH_USER_MODEL = "accounts.UserAccount"
 
+# Seconds the signed in user of a session is cached for, sparing requests
+# a query of the accounts table. Set to 0 to load the user on every request.
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+
 LANGUAGE_CODE = "en-us"
 
 TIME_ZONE = "UTC"
@@ -115,6 +277,10 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, r"core/static"),
 ]
 
+MEDIA_URL = "media/"
+
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", os.path.join(BASE_DIR, "media/"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 #################
@@ -137,6 +303,29 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Mails are queued in the outbox and delivered by background workers.
+# Set MAIL_OUTBOX_IN_PROCESS to false when the workers are run in a
+# separate process with the `run_mail_outbox` command.
+MAIL_OUTBOX_IN_PROCESS = os.getenv("MAIL_OUTBOX_IN_PROCESS", "true").lower() == "true"
+
+MAIL_OUTBOX_WORKERS = int(os.getenv("MAIL_OUTBOX_WORKERS", "2"))
+
+MAIL_OUTBOX_BATCH_SIZE = int(os.getenv("MAIL_OUTBOX_BATCH_SIZE", "20"))
+
+MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("MAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+
+MAIL_OUTBOX_RETRY_BACKOFF = int(os.getenv("MAIL_OUTBOX_RETRY_BACKOFF", "30"))  # seconds
+
+MAIL_OUTBOX_RATE_LIMIT = float(os.getenv("MAIL_OUTBOX_RATE_LIMIT", "0"))  # mails per second, 0 for unlimited
+
+MAIL_OUTBOX_POLL_INTERVAL = int(os.getenv("MAIL_OUTBOX_POLL_INTERVAL", "5"))  # seconds
+
+MAIL_OUTBOX_LEASE = int(os.getenv("MAIL_OUTBOX_LEASE", "300"))  # seconds
+
+MAIL_OUTBOX_CONNECTION_IDLE_TIMEOUT = int(
+    os.getenv("MAIL_OUTBOX_CONNECTION_IDLE_TIMEOUT", "30")
+)  # seconds
+
 
 LOGIN_URL = "accounts:signin"
 
@@ -155,6 +344,35 @@ OTP_LENGTH = 6
 
 OTP_VALIDITY_PERIOD = 60 * 30
 
+# Number of failed OTP verifications of an identifier, within the sliding window,
+# after which further attempts are rejected, without being checked, until enough
+# of the failures are older than the window.
+OTP_VERIFICATION_MAX_FAILURES = int(os.getenv("OTP_VERIFICATION_MAX_FAILURES", "5"))
+
+OTP_VERIFICATION_FAILURE_WINDOW = int(
+    os.getenv("OTP_VERIFICATION_FAILURE_WINDOW", "900")
+)  # seconds
+
+# Expired OTPs are purged periodically by a background thread, started by the
+# first OTP generated. Set OTP_PURGE_IN_PROCESS to false when they are purged
+# in a separate process with the `purge_expired_otps` command.
+OTP_PURGE_IN_PROCESS = os.getenv("OTP_PURGE_IN_PROCESS", "true").lower() == "true"
+
+OTP_PURGE_INTERVAL = int(os.getenv("OTP_PURGE_INTERVAL", "600"))  # seconds
+
+# Number of OTPs deleted per query, so each purge query only holds its locks briefly
+OTP_PURGE_BATCH_SIZE = int(os.getenv("OTP_PURGE_BATCH_SIZE", "500"))
+
+# Number of threads importing uploaded student details files in the background
+STUDENT_IMPORT_WORKERS = int(os.getenv("STUDENT_IMPORT_WORKERS", "2"))
+
+# Seconds without progress after which a running import job is assumed lost, and can be resumed
+STUDENT_IMPORT_JOB_STALE_AFTER = int(os.getenv("STUDENT_IMPORT_JOB_STALE_AFTER", "120"))
+
+# Maximum number of processes parsing the files of an import of several files.
+# Defaults to the number of CPUs.
+STUDENT_IMPORT_PARSE_PROCESSES = int(os.getenv("STUDENT_IMPORT_PARSE_PROCESSES", "0")) or None
+
 ####################
 # HELPERS SETTINGS #
 ####################